@@ -2,15 +2,30 @@
 Module for AI model integration to generate slide content using a free alternative API.
 """
 
-import requests
-import torch
+import logging
+import os
+import threading
+from typing import List, Optional
 
-FREE_AI_API_URL = "https://api-inference.huggingface.co/models/gpt2"  # Example free model on Hugging Face
-FREE_AI_API_TOKEN = ""  # If needed, user can add token here
+from inference_client import InferenceClient, InferenceError
+from summarization import summarize_long
 
-headers = {"Authorization": f"Bearer {FREE_AI_API_TOKEN}"} if FREE_AI_API_TOKEN else {}
+# Text-generation endpoint; point AUTODECK_INFERENCE_URL at a local stand-in server for tests and benchmarks
+FREE_AI_API_URL = os.environ.get("AUTODECK_INFERENCE_URL", "https://api-inference.huggingface.co/models/gpt2")
+FREE_AI_API_TOKEN = os.environ.get("AUTODECK_INFERENCE_TOKEN", "")  # If needed, user can add token here
+# Concurrent requests per batch; identical prompts in flight share one request
+INFERENCE_CONCURRENCY = int(os.environ.get("AUTODECK_INFERENCE_CONCURRENCY", "8"))
+
+PROMPT_TEMPLATE = "Generate a concise and clear slide content summary based on this data summary:\n{}"
+GENERATION_PARAMETERS = {"max_length": 150, "temperature": 0.7}
+
+logger = logging.getLogger(__name__)
+
+_client: Optional[InferenceClient] = None
+_client_lock = threading.Lock()
 
 def get_device():
+    import torch
     if torch.backends.mps.is_available() and torch.backends.mps.is_built():
         return "mps"
     elif torch.cuda.is_available():
@@ -18,43 +33,57 @@ def get_device():
     else:
         return "cpu"
 
-def generate_slide_content_summary(data_summary):
-    """Generate slide content summary using a free AI API or fallback to local summarization."""
-    import logging
-    logging.basicConfig(level=logging.DEBUG)
+def _local_summary(data_summary) -> str:
+    return summarize_long(str(data_summary), max_length=150, min_length=40)["summary"]
+
+def _fallback(prompt: str) -> str:
+    # The circuit is open: summarize the data summary embedded in the prompt locally
+    return _local_summary(prompt[len(PROMPT_TEMPLATE.format("")):])
+
+def get_inference_client() -> InferenceClient:
+    """Return the shared client for the text-generation endpoint, creating it on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = InferenceClient(
+                FREE_AI_API_URL, token=FREE_AI_API_TOKEN, max_concurrency=INFERENCE_CONCURRENCY, fallback=_fallback
+            )
+        return _client
+
+def _use_remote() -> bool:
+    # An explicitly configured endpoint is always used; the default public one only on mps/cuda to avoid hangs
+    if "AUTODECK_INFERENCE_URL" in os.environ:
+        return True
     device = get_device()
-    logging.debug(f"Device detected for AI generation: {device}")
-    # If device is mps or cuda, fallback to API to avoid hangs
-    if device in ["mps", "cuda"]:
-        prompt = f"Generate a concise and clear slide content summary based on this data summary:\n{data_summary}"
-        payload = {
-            "inputs": prompt,
-            "parameters": {"max_length": 150, "temperature": 0.7},
-        }
-        try:
-            response = requests.post(FREE_AI_API_URL, headers=headers, json=payload, timeout=30)
-            response.raise_for_status()
-            result = response.json()
-            logging.debug(f"AI API response: {result}")
-            if isinstance(result, list) and "generated_text" in result[0]:
-                generated_text = result[0]["generated_text"].strip()
-                logging.debug(f"Generated text from AI API: {generated_text}")
-                return generated_text
-            else:
-                logging.error("Unexpected response format from AI API.")
-                return "Error: Unexpected response format from AI API."
-        except Exception as e:
-            logging.error(f"AI API call failed: {e}")
-            # Fallback to local summarization on error
-            from transformers import pipeline
-            summarizer = pipeline("summarization", model="facebook/bart-large-cnn", device=-1)
-            summary = summarizer(data_summary, max_length=150, min_length=40, do_sample=False)[0]['summary_text']
-            logging.debug(f"Generated summary from local summarizer (fallback): {summary}")
-            return summary
-    else:
+    logger.debug(f"Device detected for AI generation: {device}")
+    return device in ["mps", "cuda"]
+
+def generate_slide_content_summaries(data_summaries: List) -> List[str]:
+    """
+    Generate slide content for several data summaries, sending the prompts to the AI API concurrently.
+    Prompts go to the local summarizer instead when no remote endpoint is in use, or while the
+    endpoint's circuit breaker is open after a sustained run of failures. A request that fails
+    while the circuit is closed gives an "Error: ..." text for its slide.
+    """
+    if not _use_remote():
         # Local summarization fallback (if CPU)
-        from transformers import pipeline
-        summarizer = pipeline("summarization", model="facebook/bart-large-cnn", device=-1)
-        summary = summarizer(data_summary, max_length=150, min_length=40, do_sample=False)[0]['summary_text']
-        logging.debug(f"Generated summary from local summarizer: {summary}")
-        return summary
+        summaries = [_local_summary(data_summary) for data_summary in data_summaries]
+        logger.debug(f"Generated summaries from local summarizer: {summaries}")
+        return summaries
+
+    client = get_inference_client()
+    futures = [client.submit(PROMPT_TEMPLATE.format(data_summary), GENERATION_PARAMETERS) for data_summary in data_summaries]
+    results = []
+    for future in futures:
+        try:
+            results.append(future.result())
+        except InferenceError as e:
+            # Sustained failures open the circuit and route to the local fallback; a one-off failure stays on its slide
+            logger.error(f"AI API call failed: {e}")
+            results.append(f"Error: {e}")
+    logger.debug(f"Generated text from AI API: {results}")
+    return results
+
+def generate_slide_content_summary(data_summary):
+    """Generate slide content summary using a free AI API or fallback to local summarization."""
+    return generate_slide_content_summaries([data_summary])[0]
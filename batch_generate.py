@@ -0,0 +1,172 @@
+"""
+Command-line batch generation of client decks from a directory of transcripts.
+The parent process loads the models once and then forks the worker pool, so
+every worker shares the same model weights copy-on-write instead of loading
+its own copy.
+
+Usage: python batch_generate.py transcripts/ decks/ --workers 4 --torch-threads 1
+"""
+
+import argparse
+import gc
+import glob
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from typing import Dict, Iterable, List, Optional
+
+from model_registry import get_registry, warm_up
+from nlu_processing import TranscriptNLU
+from deck_pipeline import generate_deck, regenerate_deck
+from stage_scheduler import set_thread_budget
+import tracing
+
+TRANSCRIPT_PATTERNS = ("*.txt", "*.docx")
+DEFAULT_WORKERS = max(1, (os.cpu_count() or 1) // 2)
+DEFAULT_TORCH_THREADS = 1
+MANIFEST_NAME = "manifest.json"
+
+logger = logging.getLogger(__name__)
+
+# Built in the parent before forking and inherited by every worker
+_nlu: Optional[TranscriptNLU] = None
+
+def _init_worker(torch_threads: Optional[int]):
+    if torch_threads:
+        import torch
+        torch.set_num_threads(torch_threads)
+        # Each worker owns torch_threads cores, so its model stages take turns within them
+        set_thread_budget(torch_threads)
+        # Inter-op threads can only be set before the first parallel op in a process
+        try:
+            torch.set_num_interop_threads(1)
+        except RuntimeError:
+            pass
+
+def _generate_one(job) -> Dict[str, object]:
+    # Failures are returned rather than raised so one bad transcript doesn't stop the batch
+    transcript_path, output_path, trace, incremental = job
+    start = time.perf_counter()
+    result = {"input": transcript_path, "output": output_path, "pid": os.getpid()}
+    if trace:
+        tracing.start_tracing()
+    try:
+        deck = (regenerate_deck if incremental else generate_deck)(transcript_path, output_path, nlu=_nlu)
+        result["timings"] = deck["timings"]
+        result["critical_path"] = deck["schedule"]["critical_path"]
+        if incremental:
+            result["reuse"] = deck["reuse"]
+        result["status"] = "ok"
+    except Exception as e:
+        logger.warning(f"Failed to generate deck for {transcript_path}: {type(e).__name__}: {e}")
+        result["status"] = "failed"
+        result["error"] = f"{type(e).__name__}: {e}"
+    finally:
+        if trace:
+            tracer = tracing.stop_tracing()
+            result["trace"] = os.path.splitext(output_path)[0] + ".trace.json"
+            result["profile"] = tracer.summary()
+            tracer.to_chrome_trace(result["trace"])
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+def find_transcripts(input_dir: str, patterns: Iterable[str] = TRANSCRIPT_PATTERNS) -> List[str]:
+    """Return every transcript in input_dir matching one of the glob patterns, sorted."""
+    return sorted({path for pattern in patterns for path in glob.glob(os.path.join(input_dir, pattern))})
+
+def output_path_for(transcript_path: str, output_dir: str) -> str:
+    """Return the .pptx path for a transcript inside output_dir."""
+    name = os.path.splitext(os.path.basename(transcript_path))[0]
+    return os.path.join(output_dir, name + ".pptx")
+
+def _pool_context():
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    logger.warning("fork is not available on this platform; workers will load their own copy of the models")
+    return multiprocessing.get_context("spawn")
+
+def run_batch(
+    transcript_paths: List[str],
+    output_dir: str,
+    workers: int = DEFAULT_WORKERS,
+    torch_threads: Optional[int] = DEFAULT_TORCH_THREADS,
+    nlu: Optional[TranscriptNLU] = None,
+    trace: bool = False,
+    incremental: bool = False,
+) -> Dict[str, object]:
+    """
+    Generate one deck per transcript into output_dir and return the manifest:
+    per-file results with stage timings, model load time and total wall time.
+    With trace, each deck also gets a Chrome trace file and a per-stage profile in its result.
+    With incremental, decks are regenerated from their previous run (see deck_pipeline.regenerate_deck).
+    torch_threads only applies to worker processes.
+    """
+    global _nlu
+    start = time.perf_counter()
+    os.makedirs(output_dir, exist_ok=True)
+    jobs = [(path, output_path_for(path, output_dir), trace, incremental) for path in transcript_paths]
+
+    # Load everything the workers need before forking
+    warm_up()
+    _nlu = nlu or TranscriptNLU()
+    load_seconds = time.perf_counter() - start
+
+    if workers <= 1 or len(jobs) <= 1:
+        # In process, the caller's torch threads and thread budget are left as they are
+        results = [_generate_one(job) for job in jobs]
+    else:
+        # Move everything allocated so far out of the collector's reach, so collections
+        # in the workers don't write to (and so copy) the pages shared with the parent
+        gc.freeze()
+        try:
+            with _pool_context().Pool(min(workers, len(jobs)), initializer=_init_worker, initargs=(torch_threads,)) as pool:
+                results = pool.map(_generate_one, jobs, chunksize=1)
+        finally:
+            gc.unfreeze()
+
+    return {
+        "workers": workers,
+        "torch_threads": torch_threads,
+        "model_load_seconds": load_seconds,
+        "total_seconds": time.perf_counter() - start,
+        "succeeded": sum(r["status"] == "ok" for r in results),
+        "failed": sum(r["status"] != "ok" for r in results),
+        "models": get_registry().stats()["models"],
+        "results": results,
+    }
+
+def write_manifest(manifest: Dict[str, object], path: str):
+    """Write the batch manifest as JSON."""
+    with open(path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate a client deck for every transcript in a directory.")
+    parser.add_argument("input_dir", help="Directory containing .txt or .docx transcripts")
+    parser.add_argument("output_dir", help="Directory to write the .pptx decks to")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Number of worker processes")
+    parser.add_argument("--torch-threads", type=int, default=DEFAULT_TORCH_THREADS, help="Torch intra-op threads per worker")
+    parser.add_argument("--pattern", action="append", help="Glob pattern for transcripts (repeatable)")
+    parser.add_argument("--trace", action="store_true", help="Write a Chrome trace next to every deck")
+    parser.add_argument("--incremental", action="store_true", help="Only redo work for transcripts changed since their last run")
+    parser.add_argument("--manifest", help=f"Manifest path (default: OUTPUT_DIR/{MANIFEST_NAME})")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    transcript_paths = find_transcripts(args.input_dir, args.pattern or TRANSCRIPT_PATTERNS)
+    if not transcript_paths:
+        print(f"No transcripts found in {args.input_dir}")
+        return 1
+
+    manifest = run_batch(transcript_paths, args.output_dir, workers=args.workers, torch_threads=args.torch_threads,
+                         trace=args.trace, incremental=args.incremental)
+    manifest_path = args.manifest or os.path.join(args.output_dir, MANIFEST_NAME)
+    write_manifest(manifest, manifest_path)
+    print(f"Generated {manifest['succeeded']} of {len(transcript_paths)} decks in {manifest['total_seconds']:.1f}s; manifest at {manifest_path}")
+    return 1 if manifest["failed"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
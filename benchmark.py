@@ -0,0 +1,285 @@
+"""
+Reproducible offline benchmark suite for the deck pipeline.
+Synthetic transcripts and DataFrames are generated from fixed seeds at several
+sizes and every stage, plus the end-to-end pipeline, runs against the tiny
+stand-in models from tiny_models, so no network access or checkpoints are needed.
+Each stage reports latency percentiles, throughput and peak RSS growth; results
+can be stored as a JSON baseline and later runs fail when a stage's median
+latency regresses beyond a threshold.
+
+Usage:
+  python benchmark.py --preset smoke --save-baseline bench_baseline.json
+  python benchmark.py --preset smoke --baseline bench_baseline.json --threshold 0.25
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+PRESETS = {
+    "smoke": {"transcripts": ["10KB"], "rows": ["1K"]},
+    "default": {"transcripts": ["10KB", "1MB"], "rows": ["1K", "100K", "1M"]},
+    "full": {"transcripts": ["10KB", "1MB", "10MB", "50MB"], "rows": ["1K", "100K", "1M", "10M"]},
+}
+DEFAULT_REPEAT = 3
+DEFAULT_THRESHOLD = 0.25
+# Regressions smaller than this are timer noise, whatever the ratio
+MIN_REGRESSION_SECONDS = 0.005
+RSS_SAMPLE_SECONDS = 0.005
+
+SPEAKERS = ["Dana", "Alex", "Sam"]
+SENTENCES = [
+    "Hi my name is Dana.",
+    "We want to grow revenue.",
+    "Our reports are slow.",
+    "The database cannot scale.",
+    "The legacy system must stay on premise.",
+    "Next steps: plan a pilot, then roll out and train staff.",
+]
+CATEGORY_LABELS = [f"label_{i}" for i in range(20)]
+
+_SIZE_PATTERN = re.compile(r"^\s*([\d.]+)\s*([KMG]?)B?\s*$", re.I)
+_SIZE_UNITS = {"": 1, "K": 10**3, "M": 10**6, "G": 10**9}
+
+def parse_size(text: str) -> int:
+    """Parse "10KB", "50MB" or "10M" (rows) into a count."""
+    match = _SIZE_PATTERN.match(text)
+    if not match:
+        raise ValueError(f"Invalid size: {text}")
+    return int(float(match.group(1)) * _SIZE_UNITS[match.group(2).upper()])
+
+def synthetic_transcript(size_bytes: int, seed: int = 0) -> str:
+    """Generate a speaker-labelled transcript of about size_bytes from the tiny models' vocabulary."""
+    rng = random.Random(seed)
+    turns = []
+    total = 0
+    while total < size_bytes:
+        turn = f"{rng.choice(SPEAKERS)}: " + " ".join(rng.choices(SENTENCES, k=rng.randint(1, 3)))
+        turns.append(turn)
+        total += len(turn) + 2
+    return "\n\n".join(turns)
+
+def synthetic_frame(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Generate a DataFrame with integer, float (with missing values), categorical and datetime columns."""
+    rng = np.random.default_rng(seed)
+    amount = rng.normal(100, 25, rows)
+    amount[rng.random(rows) < 0.01] = np.nan
+    return pd.DataFrame({
+        "id": np.arange(rows),
+        "amount": amount,
+        "quantity": rng.integers(0, 1000, rows),
+        "category": rng.choice(CATEGORY_LABELS, rows),
+        "created": pd.Timestamp("2020-01-01") + pd.to_timedelta(rng.integers(0, 86400 * 365, rows), unit="s"),
+    })
+
+def _rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+class _RssSampler:
+    """Sample RSS in a background thread to find the peak growth during a block."""
+
+    def __enter__(self):
+        self.start = self.peak = _rss_bytes()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(RSS_SAMPLE_SECONDS):
+            self.peak = max(self.peak, _rss_bytes())
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, _rss_bytes())
+        return False
+
+def measure(fn: Callable[[], object], repeat: int) -> Tuple[object, Dict[str, object]]:
+    """Run fn repeat times and return its last result with latency percentiles and peak RSS growth."""
+    latencies = []
+    result = None
+    with _RssSampler() as rss:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = fn()
+            latencies.append(time.perf_counter() - start)
+    latency = np.asarray(latencies)
+    return result, {
+        "latency_s": {
+            "p50": float(np.percentile(latency, 50)),
+            "p90": float(np.percentile(latency, 90)),
+            "p99": float(np.percentile(latency, 99)),
+            "mean": float(latency.mean()),
+            "min": float(latency.min()),
+        },
+        "runs": repeat,
+        "peak_rss_mb": (rss.peak - rss.start) / 2**20,
+    }
+
+def _record(results: Dict[str, Dict[str, object]], stage: str, size: str, unit: str, units: int, stats: Dict[str, object]):
+    stats.update({"stage": stage, "size": size, "unit": unit, "units": units})
+    stats["throughput"] = units / stats["latency_s"]["p50"] if stats["latency_s"]["p50"] else float("inf")
+    results[f"{stage}@{size}"] = stats
+    print(f"{stage:>12} @ {size:<6} p50 {stats['latency_s']['p50'] * 1000:9.1f} ms  "
+          f"p99 {stats['latency_s']['p99'] * 1000:9.1f} ms  {stats['throughput']:12.0f} {unit}/s  "
+          f"peak +{stats['peak_rss_mb']:.1f} MB", file=sys.stderr)
+
+def bench_transcript(size: str, repeat: int, results: Dict[str, Dict[str, object]], seed: int = 0):
+    """Benchmark every transcript stage and the end-to-end pipeline on one synthetic transcript."""
+    from deck_pipeline import PHASE_RANGE, build_slide_specs, generate_deck_bytes, render_presentation
+    from info_extraction import extract_structured_insights
+    from nlu_processing import TranscriptNLU
+    from phase_planning import plan_phases
+    from slide_generation import presentation_bytes
+    from transcript_ingestion import ingest_transcript
+
+    text = synthetic_transcript(parse_size(size), seed)
+    data = text.encode("utf-8")
+    nlu = TranscriptNLU()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "transcript.txt")
+        with open(path, 'wb') as f:
+            f.write(data)
+        text, stats = measure(lambda: ingest_transcript(path), repeat)
+    _record(results, "ingest", size, "bytes", len(data), stats)
+
+    segmented, stats = measure(lambda: nlu.segment_transcript(text), repeat)
+    _record(results, "segment", size, "bytes", len(data), stats)
+
+    insights, stats = measure(lambda: extract_structured_insights(segmented), repeat)
+    _record(results, "extract", size, "segments", sum(len(v) for v in segmented.values()), stats)
+
+    phase_texts = [phase["title"] + ". " + phase.get("description", "") for phase in insights["phases"]]
+    phases, stats = measure(lambda: plan_phases(phase_texts, k_range=PHASE_RANGE), repeat)
+    _record(results, "plan", size, "phases", len(phase_texts), stats)
+
+    specs = build_slide_specs(insights, phases)
+    _, stats = measure(lambda: presentation_bytes(render_presentation(specs)), repeat)
+    _record(results, "render", size, "slides", len(specs), stats)
+
+    _, stats = measure(lambda: generate_deck_bytes(data, "transcript.txt", nlu=nlu), repeat)
+    _record(results, "end_to_end", size, "bytes", len(data), stats)
+
+def bench_frame(size: str, repeat: int, results: Dict[str, Dict[str, object]], seed: int = 0):
+    """Benchmark profiling and summary rendering on one synthetic DataFrame."""
+    from data_processing import render_summary
+    from data_profiling import profile_dataframe
+
+    rows = parse_size(size)
+    df = synthetic_frame(rows, seed)
+    profile, stats = measure(lambda: profile_dataframe(df), repeat)
+    _record(results, "profile", size, "rows", rows, stats)
+    _, stats = measure(lambda: render_summary(profile), repeat)
+    _record(results, "render_summary", size, "rows", rows, stats)
+
+def run_benchmarks(
+    transcript_sizes: List[str], row_counts: List[str], repeat: int = DEFAULT_REPEAT, seed: int = 0
+) -> Dict[str, object]:
+    """Run every benchmark offline against the tiny stand-in models and return the report."""
+    import torch
+    import inference_cache
+    from tiny_models import register_tiny_models, unregister_tiny_models
+
+    torch.manual_seed(seed)
+    # Repeats must redo the work, not read it back from the inference cache
+    cache_enabled = inference_cache.CACHE_ENABLED
+    inference_cache.CACHE_ENABLED = False
+    register_tiny_models()
+    results = {}
+    try:
+        for size in transcript_sizes:
+            bench_transcript(size, repeat, results, seed)
+        for size in row_counts:
+            bench_frame(size, repeat, results, seed)
+    finally:
+        unregister_tiny_models()
+        inference_cache.CACHE_ENABLED = cache_enabled
+    return {
+        "meta": {
+            "created": time.time(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "torch": torch.__version__,
+            "pandas": pd.__version__,
+            "repeat": repeat,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+def compare(
+    report: Dict[str, object], baseline: Dict[str, object], threshold: float = DEFAULT_THRESHOLD
+) -> List[Dict[str, object]]:
+    """
+    Return the stages whose median latency exceeds the baseline's by more than threshold
+    (a fraction, 0.25 = 25% slower). Stages missing from either side are ignored.
+    """
+    regressions = []
+    for key, result in report["results"].items():
+        base = baseline["results"].get(key)
+        if base is None:
+            continue
+        current, previous = result["latency_s"]["p50"], base["latency_s"]["p50"]
+        if current > previous * (1 + threshold) and current - previous > MIN_REGRESSION_SECONDS:
+            regressions.append({"benchmark": key, "baseline_p50": previous, "p50": current, "ratio": current / previous})
+    return regressions
+
+def load_report(path: str) -> Dict[str, object]:
+    with open(path) as f:
+        return json.load(f)
+
+def save_report(report: Dict[str, object], path: str):
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the offline pipeline benchmarks.")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="smoke")
+    parser.add_argument("--transcript-sizes", nargs="*", help="Override the preset, e.g. 10KB 1MB")
+    parser.add_argument("--row-counts", nargs="*", help="Override the preset, e.g. 1K 1M")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write this run's report as JSON")
+    parser.add_argument("--baseline", help="Compare against a stored report")
+    parser.add_argument("--save-baseline", help="Store this run's report as the new baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Allowed median slowdown, e.g. 0.25")
+    args = parser.parse_args(argv)
+
+    preset = PRESETS[args.preset]
+    transcript_sizes = preset["transcripts"] if args.transcript_sizes is None else args.transcript_sizes
+    row_counts = preset["rows"] if args.row_counts is None else args.row_counts
+    report = run_benchmarks(transcript_sizes, row_counts, repeat=args.repeat, seed=args.seed)
+    if args.output:
+        save_report(report, args.output)
+    if args.save_baseline:
+        save_report(report, args.save_baseline)
+
+    if args.baseline:
+        regressions = compare(report, load_report(args.baseline), args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression['benchmark']}: p50 {regression['p50'] * 1000:.1f} ms vs "
+                  f"{regression['baseline_p50'] * 1000:.1f} ms ({regression['ratio']:.2f}x)")
+        if regressions:
+            return 1
+        print(f"No stage regressed by more than {args.threshold:.0%}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
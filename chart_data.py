@@ -0,0 +1,97 @@
+"""
+Reduces DataFrame columns to chart series of bounded size for slide_generation:
+Largest-Triangle-Three-Buckets downsampling for line series, vectorized
+histogram binning, and top-N category counts. However many rows a frame has,
+the chart XML written into the deck stays a few hundred points.
+"""
+
+import os
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+
+MAX_CHART_POINTS = int(os.environ.get("AUTODECK_CHART_MAX_POINTS", "500"))
+DEFAULT_BINS = 20
+MAX_BINS = 100
+DEFAULT_TOP_N = 10
+OTHER_LABEL = "Other"
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int = MAX_CHART_POINTS) -> np.ndarray:
+    """
+    Return the indices of at most threshold points that preserve the visual shape of y over x,
+    using Largest-Triangle-Three-Buckets. The first and last points are always kept.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if threshold >= n:
+        return np.arange(n)
+    if threshold < 3:
+        return np.array([0, n - 1])
+
+    # threshold - 2 buckets between the fixed first and last points
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    selected = np.empty(threshold, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        # The next bucket is represented by its mean point; the last bucket looks at the final point
+        next_start, next_end = (edges[i + 1], edges[i + 2]) if i + 2 < len(edges) else (n - 1, n)
+        avg_x, avg_y = x[next_start:next_end].mean(), y[next_start:next_end].mean()
+        areas = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(areas))
+        selected[i + 1] = a
+    return selected
+
+def downsample_series(x: pd.Series, y: pd.Series, threshold: int = MAX_CHART_POINTS) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Drop missing values, sort by x and downsample to at most threshold points.
+    x must already be numeric (see numeric_axis).
+    """
+    frame = pd.DataFrame({"x": np.asarray(x, dtype=float), "y": pd.to_numeric(y, errors="coerce").to_numpy(dtype=float)})
+    frame = frame[np.isfinite(frame["x"]) & np.isfinite(frame["y"])].sort_values("x", kind="stable")
+    xs, ys = frame["x"].to_numpy(), frame["y"].to_numpy()
+    keep = lttb(xs, ys, threshold)
+    return xs[keep], ys[keep]
+
+def numeric_axis(values: pd.Series) -> Tuple[np.ndarray, bool]:
+    """
+    Convert an x column to floats: numbers as they are, datetimes as Excel serial dates,
+    anything else as row positions. Also returns whether the axis holds dates.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        days = (values.dt.tz_localize(None) if values.dt.tz is not None else values) - pd.Timestamp("1899-12-30")
+        return (days / pd.Timedelta(days=1)).to_numpy(dtype=float, na_value=np.nan), True
+    if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+        return values.to_numpy(dtype=float, na_value=np.nan), False
+    return np.arange(len(values), dtype=float), False
+
+def histogram(values: pd.Series, bins: int = DEFAULT_BINS) -> Tuple[List[str], List[int]]:
+    """Bin the finite values of a numeric column into at most MAX_BINS labelled bins."""
+    data = pd.to_numeric(values, errors="coerce").to_numpy(dtype=float)
+    data = data[np.isfinite(data)]
+    if not len(data):
+        return [], []
+    counts, edges = np.histogram(data, bins=max(1, min(bins, MAX_BINS)))
+    labels = [f"{lo:.3g} to {hi:.3g}" for lo, hi in zip(edges[:-1], edges[1:])]
+    return labels, counts.tolist()
+
+def top_categories(values: pd.Series, n: int = DEFAULT_TOP_N) -> Tuple[List[str], List[int]]:
+    """Counts of the n most frequent values, with the rest summed into an "Other" bar."""
+    counts = values.dropna().astype(str).value_counts()
+    labels, totals = counts.index[:n].tolist(), counts.iloc[:n].tolist()
+    if len(counts) > n:
+        labels.append(OTHER_LABEL)
+        totals.append(int(counts.iloc[n:].sum()))
+    return labels, [int(total) for total in totals]
+
+def top_values(df: pd.DataFrame, category: str, value: str, n: int = DEFAULT_TOP_N) -> Tuple[List[str], List[float]]:
+    """Sum value per category and return the n largest, with the rest summed into "Other"."""
+    sums = pd.to_numeric(df[value], errors="coerce").groupby(df[category].astype(str)).sum().sort_values(ascending=False)
+    labels, totals = sums.index[:n].tolist(), sums.iloc[:n].tolist()
+    if len(sums) > n:
+        labels.append(OTHER_LABEL)
+        totals.append(float(sums.iloc[n:].sum()))
+    return labels, [float(total) for total in totals]
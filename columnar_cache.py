@@ -0,0 +1,258 @@
+"""
+Module for a local columnar cache of spreadsheet and CSV sources.
+On first read every sheet of a source is converted to an uncompressed Arrow IPC
+file keyed by the source path, modification time and size. Later reads
+memory-map the cached file, so column projection is zero-copy and filters only
+materialize the matching rows.
+"""
+
+import datetime
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "AUTODECK_COLUMNAR_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "autodeck", "columnar"),
+)
+DEFAULT_MAX_MB = float(os.environ.get("AUTODECK_COLUMNAR_CACHE_MAX_MB", "2048"))
+MANIFEST = "manifest.json"
+
+# Filters use the same (column, op, value) tuples as pandas.read_parquet
+Filters = Optional[Sequence[Tuple[str, str, object]]]
+
+logger = logging.getLogger(__name__)
+
+def _hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+# Schema metadata key listing mixed-type columns, which are stored as text plus a type-tag column
+MIXED_COLUMNS_KEY = b"autodeck.mixed_columns"
+TYPE_TAG_PREFIX = "__autodeck_type__:"
+
+# Value types restored from a mixed column's text; anything else is kept as its text
+_DECODERS = {
+    "null": lambda text: None,
+    "nat": lambda text: pd.NaT,
+    "str": str,
+    "bool": lambda text: text == "True",
+    "int": int,
+    "float": float,
+    "datetime": pd.Timestamp,
+}
+
+def _type_tag(value) -> str:
+    if value is None:
+        return "null"
+    if value is pd.NaT:
+        return "nat"
+    if isinstance(value, (bool, np.bool_)):
+        return "bool"
+    if isinstance(value, (int, np.integer)):
+        return "int"
+    if isinstance(value, (float, np.floating)):
+        return "float"
+    if isinstance(value, datetime.datetime):
+        return "datetime"
+    return "str"
+
+def _encode_mixed(values: pd.Series) -> Tuple[pd.Series, pd.Categorical]:
+    tags = [_type_tag(value) for value in values]
+    text = [None if tag in ("null", "nat") else value.isoformat() if tag == "datetime" else str(value)
+            for value, tag in zip(values, tags)]
+    return pd.Series(text, index=values.index, dtype=object), pd.Categorical(tags, categories=list(_DECODERS))
+
+def _decode_mixed(text: pd.Series, tags: pd.Series) -> pd.Series:
+    return pd.Series([_DECODERS[tag](value) for value, tag in zip(text, tags)], index=text.index, dtype=object)
+
+def _to_arrow(df: pd.DataFrame) -> pa.Table:
+    """
+    Convert a DataFrame to Arrow. Mixed-type object columns (common in .xls) that Arrow can't
+    type are stored as text with a type tag per value, so reads return the original values.
+    """
+    df = df.rename(columns=str)
+    try:
+        return pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        pass
+    df = df.copy()
+    mixed = []
+    for col in list(df.columns):
+        try:
+            pa.Array.from_pandas(df[col])
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            df[col], df[TYPE_TAG_PREFIX + col] = _encode_mixed(df[col])
+            mixed.append(col)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[MIXED_COLUMNS_KEY] = json.dumps(mixed).encode("utf-8")
+    return table.replace_schema_metadata(metadata)
+
+def read_arrow_file(path: str, columns: Optional[List[str]] = None, filters: Filters = None) -> pd.DataFrame:
+    """Memory-map an Arrow IPC (Feather v2) file and return the projected, filtered rows."""
+    with pa.memory_map(path, 'r') as source:
+        table = ipc.open_file(source).read_all()
+        mixed = json.loads((table.schema.metadata or {}).get(MIXED_COLUMNS_KEY, b"[]"))
+        if filters:
+            unfilterable = sorted({column for column, _, _ in filters} & set(mixed))
+            if unfilterable:
+                raise ValueError(f"Cannot filter on mixed-type columns {unfilterable}")
+            table = table.filter(pq.filters_to_expression(filters))
+        if columns is None:
+            columns = [name for name in table.column_names if not name.startswith(TYPE_TAG_PREFIX)]
+        mixed = [col for col in mixed if col in columns]
+        table = table.select(list(columns) + [TYPE_TAG_PREFIX + col for col in mixed])
+        df = table.to_pandas()
+    for col in mixed:
+        df[col] = _decode_mixed(df[col], df.pop(TYPE_TAG_PREFIX + col))
+    return df
+
+class ColumnarCache:
+    """
+    Directory of converted sources, one subdirectory per (path, mtime, size) version,
+    bounded in total size with least-recently-read eviction.
+    """
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, max_mb: float = DEFAULT_MAX_MB):
+        self.directory = directory
+        self.max_bytes = int(max_mb * 2**20)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _entry_name(self, path: str) -> Tuple[str, str]:
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        prefix = _hash(path)
+        return prefix, f"{prefix}-{_hash(f'{stat.st_mtime_ns}:{stat.st_size}')}"
+
+    def ensure(self, path: str) -> Dict[str, object]:
+        """Return the manifest of the cached copy of path, converting the source if needed."""
+        prefix, name = self._entry_name(path)
+        entry = os.path.join(self.directory, name)
+        manifest_path = os.path.join(entry, MANIFEST)
+        if os.path.exists(manifest_path):
+            with self._lock:
+                self.hits += 1
+            os.utime(manifest_path)
+            with open(manifest_path) as f:
+                return json.load(f)
+
+        with self._lock:
+            self.misses += 1
+        start = time.perf_counter()
+        # Convert into a private directory and rename it into place, so concurrent
+        # readers never see a partial entry and concurrent converters don't collide
+        from data_ingestion import read_workbook
+        staging = tempfile.mkdtemp(prefix=".staging-", dir=self.directory)
+        sheets = []
+        for index, (sheet, df) in enumerate(read_workbook(path).items()):
+            filename = f"sheet{index}.arrow"
+            table = _to_arrow(df)
+            with pa.OSFile(os.path.join(staging, filename), 'wb') as sink:
+                with ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            sheets.append({"name": str(sheet), "file": filename, "rows": table.num_rows})
+        manifest = {"source": os.path.abspath(path), "sheets": sheets, "created": time.time()}
+        with open(os.path.join(staging, MANIFEST), 'w') as f:
+            json.dump(manifest, f)
+        try:
+            os.rename(staging, entry)
+        except OSError:
+            shutil.rmtree(staging, ignore_errors=True)
+        logger.debug(f"Cached {path} as Arrow in {time.perf_counter() - start:.2f}s")
+
+        self._remove_stale(prefix, keep=name)
+        self._enforce_limit(keep=name)
+        return manifest
+
+    def read(
+        self,
+        path: str,
+        sheet: Union[int, str] = 0,
+        columns: Optional[List[str]] = None,
+        filters: Filters = None,
+    ) -> pd.DataFrame:
+        """Read one sheet of path through the cache with optional column projection and filters."""
+        manifest = self.ensure(path)
+        sheets = manifest["sheets"]
+        if isinstance(sheet, int):
+            info = sheets[sheet]
+        else:
+            info = next((s for s in sheets if s["name"] == sheet), None)
+            if info is None:
+                raise ValueError(f"Worksheet {sheet} not found in {path}")
+        _, name = self._entry_name(path)
+        return read_arrow_file(os.path.join(self.directory, name, info["file"]), columns, filters)
+
+    def read_all(self, path: str, columns: Optional[List[str]] = None) -> Dict[str, pd.DataFrame]:
+        """Read every sheet of path through the cache."""
+        manifest = self.ensure(path)
+        return {s["name"]: self.read(path, s["name"], columns) for s in manifest["sheets"]}
+
+    def _entries(self) -> List[str]:
+        return [name for name in os.listdir(self.directory) if not name.startswith(".")]
+
+    def _remove_stale(self, prefix: str, keep: str):
+        for name in self._entries():
+            if name.startswith(prefix + "-") and name != keep:
+                shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+
+    def _entry_size(self, name: str) -> int:
+        entry = os.path.join(self.directory, name)
+        return sum(os.path.getsize(os.path.join(entry, f)) for f in os.listdir(entry))
+
+    def _enforce_limit(self, keep: str):
+        entries = []
+        for name in self._entries():
+            try:
+                last_read = os.path.getmtime(os.path.join(self.directory, name, MANIFEST))
+                entries.append((last_read, name, self._entry_size(name)))
+            except OSError:
+                continue
+        total = sum(size for _, _, size in entries)
+        for _, name, size in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if name == keep:
+                continue
+            shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+            total -= size
+
+    def invalidate(self, path: Optional[str] = None):
+        """Drop the cached copies of path, or of every source when path is None."""
+        prefix = _hash(os.path.abspath(path)) + "-" if path else ""
+        for name in self._entries():
+            if name.startswith(prefix):
+                shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+
+    def stats(self) -> Dict[str, object]:
+        entries = self._entries()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(entries),
+            "size_mb": sum(self._entry_size(name) for name in entries) / 2**20,
+        }
+
+_default_cache: Optional[ColumnarCache] = None
+
+def get_default_cache() -> ColumnarCache:
+    """Return the shared columnar cache in AUTODECK_COLUMNAR_CACHE_DIR."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ColumnarCache()
+    return _default_cache
@@ -1,30 +1,216 @@
 """
 Module for data ingestion from spreadsheets, SQL files, and databases.
+Each reader has an iter_* variant that yields bounded-size DataFrame chunks,
+e.g. for data_profiling.profile_chunks, and accepts a column projection.
+Spreadsheets can be read through a local Arrow cache (see columnar_cache).
 """
 
-import pandas as pd
-from sqlalchemy import create_engine
+from __future__ import annotations
 
-def read_excel(file_path):
-    """Read data from an Excel file."""
-    return pd.read_excel(file_path)
+import atexit
+import glob
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Tuple
 
-def read_csv(file_path):
+# pandas and sqlalchemy are imported by the readers that need them, keeping imports cheap
+if TYPE_CHECKING:
+    import pandas as pd
+
+DEFAULT_CHUNK_ROWS = 100_000
+
+SPREADSHEET_PATTERNS = ("*.xls", "*.xlsx", "*.csv")
+DEFAULT_MAX_WORKERS = 4
+
+logger = logging.getLogger(__name__)
+
+_engines: Dict[str, object] = {}
+_engines_lock = threading.Lock()
+
+def get_engine(db_url):
+    """Return a pooled engine for the database URL, created once per process."""
+    with _engines_lock:
+        engine = _engines.get(db_url)
+        if engine is None:
+            from sqlalchemy import create_engine
+            engine = create_engine(db_url, pool_pre_ping=True)
+            _engines[db_url] = engine
+        return engine
+
+def dispose_engines():
+    """Close every pooled connection and forget the cached engines."""
+    with _engines_lock:
+        for engine in _engines.values():
+            engine.dispose()
+        _engines.clear()
+
+atexit.register(dispose_engines)
+
+def read_excel(file_path, columns: Optional[List[str]] = None, use_cache: bool = False):
+    """Read data from an Excel file, optionally through the columnar cache."""
+    import pandas as pd
+    if use_cache:
+        try:
+            return read_cached(file_path, columns=columns)
+        except ImportError:
+            logger.warning("pyarrow is not installed; reading Excel file without the columnar cache")
+    return pd.read_excel(file_path, usecols=columns)
+
+def read_cached(file_path, sheet=0, columns: Optional[List[str]] = None, filters=None):
+    """
+    Read a sheet of an Excel or CSV file from the local columnar cache, converting it on first use.
+    filters are (column, op, value) tuples as accepted by pandas.read_parquet.
+    """
+    from columnar_cache import get_default_cache
+    return get_default_cache().read(file_path, sheet=sheet, columns=columns, filters=filters)
+
+def read_parquet(file_path, columns: Optional[List[str]] = None, filters=None):
+    """Read a Parquet file, pushing the projection and filters down to the row-group reader."""
+    import pandas as pd
+    return pd.read_parquet(file_path, columns=columns, filters=filters)
+
+def read_feather(file_path, columns: Optional[List[str]] = None, filters=None):
+    """Read a Feather (Arrow IPC) file through a memory map."""
+    from columnar_cache import read_arrow_file
+    return read_arrow_file(file_path, columns=columns, filters=filters)
+
+def read_csv(file_path, columns: Optional[List[str]] = None):
     """Read data from a CSV file."""
-    return pd.read_csv(file_path)
+    import pandas as pd
+    return pd.read_csv(file_path, usecols=columns)
 
-def read_sql_file(sql_file_path, db_url='sqlite:///:memory:'):
-    """Execute SQL queries from a file on a database and return the result as a DataFrame."""
-    engine = create_engine(db_url)
+def iter_csv(file_path, chunksize: int = DEFAULT_CHUNK_ROWS, columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+    """Read a CSV file in chunks of at most chunksize rows."""
+    import pandas as pd
+    with pd.read_csv(file_path, usecols=columns, chunksize=chunksize) as reader:
+        yield from reader
+
+def iter_excel(file_path, chunksize: int = DEFAULT_CHUNK_ROWS, columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+    """
+    Yield an Excel sheet in chunks of at most chunksize rows.
+    Excel files cannot be parsed incrementally, so the sheet is read once and then sliced.
+    """
+    df = read_excel(file_path, columns=columns)
+    for start in range(0, len(df), chunksize):
+        yield df.iloc[start:start + chunksize]
+
+def read_workbook(file_path, columns: Optional[List[str]] = None) -> Dict[str, pd.DataFrame]:
+    """Read every sheet of an Excel workbook, or a CSV file as a single sheet named "0"."""
+    import pandas as pd
+    if os.path.splitext(file_path)[1].lower() == '.csv':
+        return {"0": read_csv(file_path, columns=columns)}
+    return pd.read_excel(file_path, sheet_name=None, usecols=columns)
+
+def _read_workbook_timed(file_path, columns: Optional[List[str]]) -> Tuple[Optional[Dict[str, pd.DataFrame]], float, Optional[str]]:
+    # Runs in a worker process; failures are returned rather than raised so the batch keeps going
+    start = time.perf_counter()
+    try:
+        return read_workbook(file_path, columns=columns), time.perf_counter() - start, None
+    except Exception as e:
+        return None, time.perf_counter() - start, f"{type(e).__name__}: {e}"
+
+def read_files(
+    file_paths: Iterable[str], max_workers: Optional[int] = None, columns: Optional[List[str]] = None
+) -> Dict[str, object]:
+    """
+    Read every sheet of many spreadsheet files concurrently in a bounded process pool,
+    since Excel parsing is CPU-bound and holds the GIL.
+    Returns frames keyed by (file, sheet), per-file timings in seconds and per-file failures.
+    """
+    file_paths = list(file_paths)
+    report = {"frames": {}, "timings": {}, "failures": {}}
+    if not file_paths:
+        return report
+    workers = min(max_workers or DEFAULT_MAX_WORKERS, len(file_paths))
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(_read_workbook_timed, path, columns): path for path in file_paths}
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                results[path] = future.result()
+            except Exception as e:  # e.g. the worker process died
+                results[path] = (None, 0.0, f"{type(e).__name__}: {e}")
+
+    # Files finish in any order; report them in input order so output is stable
+    for path in file_paths:
+        sheets, seconds, error = results[path]
+        report["timings"][path] = seconds
+        if error:
+            logger.warning(f"Failed to read {path}: {error}")
+            report["failures"][path] = error
+            continue
+        for sheet, df in sheets.items():
+            report["frames"][(path, sheet)] = df
+    return report
+
+def read_directory(
+    directory,
+    patterns: Iterable[str] = SPREADSHEET_PATTERNS,
+    recursive: bool = False,
+    max_workers: Optional[int] = None,
+    columns: Optional[List[str]] = None,
+) -> Dict[str, object]:
+    """Read every sheet of every matching file in a directory concurrently; see read_files."""
+    prefix = os.path.join(directory, "**") if recursive else directory
+    file_paths = sorted({path for pattern in patterns for path in glob.glob(os.path.join(prefix, pattern), recursive=recursive)})
+    return read_files(file_paths, max_workers=max_workers, columns=columns)
+
+def combine_frames(frames: Dict[Tuple[str, str], pd.DataFrame]) -> pd.DataFrame:
+    """Concatenate keyed frames into one, recording each row's source file and sheet."""
+    import pandas as pd
+    if not frames:
+        return pd.DataFrame()
+    parts = [df.assign(source_file=os.path.basename(path), sheet=sheet) for (path, sheet), df in frames.items()]
+    return pd.concat(parts, ignore_index=True)
+
+def _read_sql_text(sql_file_path) -> str:
     with open(sql_file_path, 'r') as file:
-        sql_query = file.read()
+        return file.read()
+
+def _project_query(sql_query: str, columns: Optional[List[str]], engine) -> str:
+    """Wrap a SELECT so only the requested columns are returned by the database."""
+    if not columns:
+        return sql_query
+    quote = engine.dialect.identifier_preparer.quote
+    projection = ", ".join(quote(col) for col in columns)
+    return f"SELECT {projection} FROM ({sql_query.strip().rstrip(';')}) AS projected"
+
+def read_sql_file(sql_file_path, db_url='sqlite:///:memory:', columns: Optional[List[str]] = None):
+    """Execute SQL queries from a file on a database and return the result as a DataFrame."""
+    import pandas as pd
+    engine = get_engine(db_url)
+    sql_query = _project_query(_read_sql_text(sql_file_path), columns, engine)
     with engine.connect() as connection:
         result = pd.read_sql_query(sql_query, connection)
     return result
 
-def read_database_table(table_name, db_url):
+def iter_sql_file(
+    sql_file_path, db_url='sqlite:///:memory:', chunksize: int = DEFAULT_CHUNK_ROWS, columns: Optional[List[str]] = None
+) -> Iterator[pd.DataFrame]:
+    """Execute SQL from a file and stream the result in chunks using a server-side cursor where supported."""
+    import pandas as pd
+    engine = get_engine(db_url)
+    sql_query = _project_query(_read_sql_text(sql_file_path), columns, engine)
+    with engine.connect().execution_options(stream_results=True) as connection:
+        yield from pd.read_sql_query(sql_query, connection, chunksize=chunksize)
+
+def read_database_table(table_name, db_url, columns: Optional[List[str]] = None):
     """Read a table from a database and return as a DataFrame."""
-    engine = create_engine(db_url)
+    import pandas as pd
+    engine = get_engine(db_url)
     with engine.connect() as connection:
-        result = pd.read_sql_table(table_name, connection)
+        result = pd.read_sql_table(table_name, connection, columns=columns)
     return result
+
+def iter_database_table(
+    table_name, db_url, chunksize: int = DEFAULT_CHUNK_ROWS, columns: Optional[List[str]] = None
+) -> Iterator[pd.DataFrame]:
+    """Stream a database table in chunks using a server-side cursor where supported."""
+    import pandas as pd
+    engine = get_engine(db_url)
+    with engine.connect().execution_options(stream_results=True) as connection:
+        yield from pd.read_sql_table(table_name, connection, columns=columns, chunksize=chunksize)
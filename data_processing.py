@@ -2,33 +2,51 @@
 Module for data processing and summarization.
 """
 
-def summarize_data(df):
+import os
+from typing import Dict, Optional, Tuple
+
+def render_summary(profile: Dict[str, object]) -> str:
     """
-    Summarize the DataFrame into a human-readable string.
+    Render a profile from data_profiling into a human-readable string.
     """
-    try:
-        columns = df.columns.tolist()
-        num_rows = len(df)
-        data_types = df.dtypes.apply(lambda x: x.name).to_dict()
-        head = df.head(5).to_dict(orient='records')
-        description = df.describe(include='all').to_dict()
+    summary_lines = []
+    summary_lines.append(f"Columns: {profile['columns']}")
+    summary_lines.append(f"Number of rows: {profile['num_rows']}")
+    if profile.get("sampled"):
+        summary_lines.append(f"Statistics sampled from {profile['sampled_rows']} rows")
+    summary_lines.append("Data types:")
+    for col, dtype in profile["dtypes"].items():
+        summary_lines.append(f"  - {col}: {dtype}")
+    summary_lines.append("First 5 rows:")
+    for i, row in enumerate(profile["head"], 1):
+        row_str = ", ".join(f"{k}: {v}" for k, v in row.items())
+        summary_lines.append(f"  {i}. {row_str}")
+    summary_lines.append("Summary statistics:")
+    for col, stats in profile["stats"].items():
+        summary_lines.append(f"  {col}:")
+        for stat_name, stat_value in stats.items():
+            summary_lines.append(f"    {stat_name}: {stat_value}")
 
-        summary_lines = []
-        summary_lines.append(f"Columns: {columns}")
-        summary_lines.append(f"Number of rows: {num_rows}")
-        summary_lines.append("Data types:")
-        for col, dtype in data_types.items():
-            summary_lines.append(f"  - {col}: {dtype}")
-        summary_lines.append("First 5 rows:")
-        for i, row in enumerate(head, 1):
-            row_str = ", ".join(f"{k}: {v}" for k, v in row.items())
-            summary_lines.append(f"  {i}. {row_str}")
-        summary_lines.append("Summary statistics:")
-        for col, stats in description.items():
-            summary_lines.append(f"  {col}:")
-            for stat_name, stat_value in stats.items():
-                summary_lines.append(f"    {stat_name}: {stat_value}")
+    return "\\n".join(summary_lines)
 
-        return "\\n".join(summary_lines)
+def summarize_data(df, sample_fraction: Optional[float] = None):
+    """
+    Summarize the DataFrame into a human-readable string.
+    Statistics come from a single-pass profile with approximate quantiles and distinct
+    counts on large inputs; sample_fraction profiles a random sample of the rows.
+    """
+    try:
+        from data_profiling import profile_dataframe
+        return render_summary(profile_dataframe(df, sample_fraction=sample_fraction))
     except Exception as e:
         return f"Error summarizing data: {str(e)}"
+
+def summarize_frames(frames: Dict[Tuple[str, str], object], sample_fraction: Optional[float] = None) -> str:
+    """
+    Summarize frames keyed by (file, sheet), e.g. from data_ingestion.read_directory, one section per frame.
+    """
+    sections = []
+    for (path, sheet), df in frames.items():
+        sections.append(f"Source: {os.path.basename(path)} / sheet {sheet}")
+        sections.append(summarize_data(df, sample_fraction=sample_fraction))
+    return "\\n".join(sections)
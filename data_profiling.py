@@ -0,0 +1,272 @@
+"""
+Module for single-pass, mergeable DataFrame profiling.
+Column statistics are accumulated chunk by chunk with vectorized NumPy updates:
+moments for numeric columns, KLL-style sketches for quantiles, HyperLogLog for
+distinct counts and bounded counters for the most frequent values, so large
+frames can be profiled in bounded memory.
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_CHUNK_ROWS = 1_000_000
+QUANTILES = (0.25, 0.5, 0.75)
+
+class HyperLogLog:
+    """
+    Approximate distinct counter over 64-bit hashes with 2**p registers.
+    """
+
+    def __init__(self, p: int = 14):
+        self.p = p
+        self.registers = np.zeros(1 << p, dtype=np.uint8)
+
+    def update(self, hashes: np.ndarray):
+        if not len(hashes):
+            return
+        hashes = hashes.astype(np.uint64, copy=False)
+        index = (hashes >> np.uint64(64 - self.p)).astype(np.int64)
+        remainder = hashes & np.uint64((1 << (64 - self.p)) - 1)
+        # Rank is the position of the leftmost set bit in the remaining 64 - p bits
+        with np.errstate(divide='ignore'):
+            bit_length = np.floor(np.log2(remainder.astype(np.float64))) + 1
+        rank = np.where(remainder == 0, 64 - self.p + 1, (64 - self.p) - bit_length + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other: "HyperLogLog"):
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def estimate(self) -> float:
+        m = float(len(self.registers))
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.exp2(-self.registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            # Linear counting is far more accurate for small cardinalities
+            return m * np.log(m / zeros)
+        return float(raw)
+
+class KLLSketch:
+    """
+    Approximate quantile sketch with geometrically shrinking compactors.
+    Exact while fewer than k items have been seen.
+    """
+
+    def __init__(self, k: int = 400, seed: int = 0):
+        self.k = k
+        self.levels: List[np.ndarray] = [np.empty(0)]
+        self.count = 0
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def update(self, values: np.ndarray):
+        values = np.asarray(values, dtype=np.float64)
+        if not len(values):
+            return
+        self.count += len(values)
+        level = 0
+        if len(values) > self.k:
+            # Compact a large batch on its own: sort it once and halve it until it fits,
+            # which is what repeated compactions would do without re-sorting at every level
+            values = np.sort(values)
+            while len(values) > self.k:
+                values = values[self._rng.integers(2)::2]
+                level += 1
+        while len(self.levels) <= level:
+            self.levels.append(np.empty(0))
+        self.levels[level] = np.concatenate([self.levels[level], values])
+        self._compress()
+
+    def merge(self, other: "KLLSketch"):
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.count += other.count
+        self._compress()
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(items)
+                # Keep a random half; an odd item out stays at this level so weights are preserved
+                keep_odd = len(items) % 2
+                leftover, items = items[:keep_odd], items[keep_odd:]
+                promoted = items[self._rng.integers(2)::2]
+                self.levels[level] = leftover
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            level += 1
+
+    def quantiles(self, qs: Iterable[float]) -> List[float]:
+        qs = list(qs)
+        if not self.count:
+            return [float('nan')] * len(qs)
+        if len(self.levels) == 1:
+            # Nothing was compacted, so interpolate exactly like pandas describe
+            return [float(v) for v in np.quantile(self.levels[0], qs)]
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level), 2.0 ** h) for h, level in enumerate(self.levels)])
+        order = np.argsort(items)
+        items, cumulative = items[order], np.cumsum(weights[order])
+        cumulative /= cumulative[-1]
+        return [float(items[min(np.searchsorted(cumulative, q), len(items) - 1)]) for q in qs]
+
+class ColumnProfile:
+    """
+    Mergeable statistics for a single column.
+    """
+
+    def __init__(self, name: str, dtype: str, top_capacity: int = 1000):
+        self.name = name
+        self.dtype = dtype
+        self.count = 0
+        self.nulls = 0
+        self.numeric = False
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+        self.distinct = HyperLogLog()
+        self.quantiles = KLLSketch()
+        self.top_capacity = top_capacity
+        self.top_counts: Optional[pd.Series] = None
+
+    def update(self, series: pd.Series):
+        if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            values = series.dropna()
+            n = len(values)
+            self.nulls += len(series) - n
+            if not n:
+                return
+            self.numeric = True
+            self.distinct.update(pd.util.hash_pandas_object(values, index=False).to_numpy())
+            array = values.to_numpy(dtype=np.float64)
+            chunk_mean = float(array.mean())
+            chunk_m2 = float(((array - chunk_mean) ** 2).sum())
+            # Chan et al. parallel update of the running mean and sum of squared deviations
+            delta = chunk_mean - self.mean
+            total = self.count + n
+            self.mean += delta * n / total
+            self.m2 += chunk_m2 + delta * delta * self.count * n / total
+            self.quantiles.update(array)
+            chunk_min, chunk_max = float(array.min()), float(array.max())
+        elif pd.api.types.is_datetime64_any_dtype(series):
+            values = series.dropna()
+            n = len(values)
+            self.nulls += len(series) - n
+            if not n:
+                return
+            self.distinct.update(pd.util.hash_pandas_object(values, index=False).to_numpy())
+            chunk_min, chunk_max = values.min(), values.max()
+        else:
+            # One hash-based count per chunk gives the null count, frequencies and the distinct values
+            counts = series.value_counts(dropna=True, sort=False)
+            n = int(counts.sum())
+            self.nulls += len(series) - n
+            if not n:
+                return
+            self.distinct.update(pd.util.hash_pandas_object(counts.index.to_series(), index=False).to_numpy())
+            # Bounded heavy-hitter counters: only the most frequent values of each chunk are merged
+            if len(counts) > self.top_capacity:
+                counts = counts.nlargest(self.top_capacity)
+            merged = counts if self.top_counts is None else self.top_counts.add(counts, fill_value=0)
+            self.top_counts = merged.nlargest(self.top_capacity) if len(merged) > 2 * self.top_capacity else merged
+            chunk_min = chunk_max = None
+        self.count += n
+
+        if chunk_min is not None:
+            self.min = chunk_min if self.min is None else min(self.min, chunk_min)
+            self.max = chunk_max if self.max is None else max(self.max, chunk_max)
+
+    def result(self) -> Dict[str, object]:
+        stats: Dict[str, object] = {"count": self.count, "nulls": self.nulls,
+                                    "unique": int(round(self.distinct.estimate()))}
+        if self.numeric:
+            q25, q50, q75 = self.quantiles.quantiles(QUANTILES)
+            stats.update({
+                "mean": self.mean if self.count else float('nan'),
+                "std": float(np.sqrt(self.m2 / (self.count - 1))) if self.count > 1 else float('nan'),
+                "min": self.min,
+                "25%": q25,
+                "50%": q50,
+                "75%": q75,
+                "max": self.max,
+            })
+        else:
+            if self.top_counts is not None and len(self.top_counts):
+                stats.update({"top": self.top_counts.idxmax(), "freq": int(self.top_counts.max())})
+            if self.min is not None:
+                stats.update({"min": self.min, "max": self.max})
+        return stats
+
+class DataProfiler:
+    """
+    Incremental DataFrame profiler. Call update() for each chunk and result() at the end.
+    With sample_fraction set, statistics are computed on a random sample of each chunk
+    while row counts still cover every row.
+    """
+
+    def __init__(self, sample_fraction: Optional[float] = None, seed: int = 0, head_rows: int = 5):
+        self.sample_fraction = sample_fraction
+        self.seed = seed
+        self.head_rows = head_rows
+        self.num_rows = 0
+        self.sampled_rows = 0
+        self.columns: Dict[str, ColumnProfile] = {}
+        self.head: List[Dict[str, object]] = []
+
+    def update(self, df: pd.DataFrame):
+        if len(self.head) < self.head_rows:
+            self.head.extend(df.head(self.head_rows - len(self.head)).to_dict(orient='records'))
+        self.num_rows += len(df)
+        if self.sample_fraction and self.sample_fraction < 1:
+            df = df.sample(frac=self.sample_fraction, random_state=self.seed + self.num_rows)
+        self.sampled_rows += len(df)
+        for col in df.columns:
+            if col not in self.columns:
+                self.columns[col] = ColumnProfile(col, df[col].dtype.name)
+            self.columns[col].update(df[col])
+
+    def result(self) -> Dict[str, object]:
+        return {
+            "columns": list(self.columns),
+            "num_rows": self.num_rows,
+            "sampled_rows": self.sampled_rows,
+            "sampled": self.sampled_rows < self.num_rows,
+            "dtypes": {col: profile.dtype for col, profile in self.columns.items()},
+            "head": self.head,
+            "stats": {col: profile.result() for col, profile in self.columns.items()},
+        }
+
+def profile_chunks(chunks: Iterable[pd.DataFrame], sample_fraction: Optional[float] = None) -> Dict[str, object]:
+    """
+    Profile a stream of DataFrame chunks, e.g. from a chunked reader.
+    """
+    profiler = DataProfiler(sample_fraction=sample_fraction)
+    for chunk in chunks:
+        profiler.update(chunk)
+    return profiler.result()
+
+def profile_dataframe(
+    df: pd.DataFrame, sample_fraction: Optional[float] = None, chunk_rows: int = DEFAULT_CHUNK_ROWS
+) -> Dict[str, object]:
+    """
+    Profile an in-memory DataFrame in row chunks to bound temporary memory.
+    """
+    profiler = DataProfiler(sample_fraction=sample_fraction)
+    if not len(df):
+        # No rows still leaves the columns to describe
+        profiler.update(df)
+        return profiler.result()
+    for start in range(0, len(df), chunk_rows):
+        profiler.update(df.iloc[start:start + chunk_rows])
+    return profiler.result()
@@ -0,0 +1,239 @@
+"""
+Module for running the full transcript-to-deck pipeline:
+ingest_transcript -> TranscriptNLU -> insight extraction -> plan_phases -> slide_generation.
+Extraction and planning run as a stage graph, so the summarization stages and
+phase planning overlap. Slides are described as plain dict specs before
+rendering so they can be built, compared and rendered independently;
+regenerate_deck uses that to patch only the changed slides of an existing deck.
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+
+from transcript_ingestion import ingest_transcript, ingest_transcript_bytes
+from nlu_processing import TranscriptNLU
+from info_extraction import add_insight_stages
+from phase_planning import plan_phases
+from slide_text_generation import (
+    generate_cover_slide,
+    generate_objectives_slide,
+    generate_pain_points_slide,
+    generate_phases_overview_slide,
+    generate_expected_outcomes_slide,
+    generate_next_steps_slide,
+)
+from slide_generation import (
+    create_presentation,
+    open_presentation,
+    add_cover_slide,
+    add_content_slide,
+    add_horizontal_roadmap_slide,
+    save_presentation,
+    presentation_bytes,
+)
+from incremental import DeckState, file_fingerprint, memoize_stages, patch_presentation, state_path_for
+from inference_cache import model_id
+from model_registry import DEFAULT_BACKEND, SUMMARIZATION_MODEL, ZERO_SHOT_MODEL
+from stage_scheduler import StageGraph
+import tracing
+
+PHASE_RANGE = (2, 6)
+DEFAULT_NEXT_STEPS = ["Contact sales team", "Schedule follow-up meeting"]
+STAGES = ["ingest", "segment", "extract", "plan", "render", "save"]
+
+# Called with (stage, "started" or "finished", seconds so far in the stage)
+ProgressCallback = Callable[[str, str, float], None]
+
+@contextmanager
+def _stage(name: str, timings: Dict[str, float], progress: Optional[ProgressCallback]):
+    if progress:
+        progress(name, "started", 0.0)
+    start = time.perf_counter()
+    with tracing.span(name, "pipeline"):
+        yield
+    timings[name] = time.perf_counter() - start
+    if progress:
+        progress(name, "finished", timings[name])
+
+def analysis_graph(summaries: Optional[Dict[str, str]] = None) -> StageGraph:
+    """
+    Stages from the segmented transcript to "insights" (group "extract") and "planned_phases" (group "plan").
+    Planning only needs the extracted phase list, so it runs alongside the summarization stages.
+    """
+    graph = add_insight_stages(StageGraph(), source="segmented", group="extract", summaries=summaries)
+    graph.add("planned_phases", lambda phases: plan_phases(
+        [phase["title"] + ". " + phase.get("description", "") for phase in phases], k_range=PHASE_RANGE
+    ), ["phases"], group="plan")
+    return graph
+
+def analyze_transcript(
+    transcript_text: str,
+    nlu: Optional[TranscriptNLU] = None,
+    progress: Optional[ProgressCallback] = None,
+    state: Optional[DeckState] = None,
+    reused_stages: Optional[List[str]] = None,
+) -> Tuple[Dict[str, object], List[Dict[str, object]], Dict[str, float], Dict[str, object]]:
+    """
+    Run NLU, insight extraction and phase planning on transcript text.
+    Returns the insights, the planned phases, per-stage timings in seconds and the
+    stage graph's schedule report (see StageGraph.report). With state, results of an
+    earlier run are reused and updated, and skipped stages are added to reused_stages.
+    """
+    timings = {}
+    with _stage("segment", timings, progress):
+        nlu = nlu or TranscriptNLU()
+        segmented = nlu.segment_transcript(transcript_text, labels=state.labels if state else None)
+
+    graph = analysis_graph(state.summaries if state else None)
+    if state is not None:
+        memoize_stages(graph, state.stages, reused_stages if reused_stages is not None else [])
+    results = graph.run({"segmented": segmented}, progress=progress)
+    schedule = graph.report()
+    timings.update(schedule["groups"])
+    return results["insights"], results["planned_phases"], timings, schedule
+
+def build_slide_specs(insights: Dict[str, object], phases: List[Dict[str, object]]) -> List[Dict[str, object]]:
+    """
+    Describe every slide of the deck, in order, as a dict with a "kind" of cover, content or roadmap.
+    """
+    cover_slide = generate_cover_slide(insights["client_name"])
+    objectives_slide = generate_objectives_slide(insights["objectives"])
+    pain_points_slide = generate_pain_points_slide(insights["pain_points"])
+    phases_overview_slide = generate_phases_overview_slide(phases)
+    expected_outcomes_slide = generate_expected_outcomes_slide(insights["expected_outcomes"])
+    next_steps_slide = generate_next_steps_slide(DEFAULT_NEXT_STEPS)
+
+    specs = [
+        {"kind": "cover", "title": cover_slide["title"], "subtitle": cover_slide["subtitle"]},
+        {"kind": "content", "title": objectives_slide["title"], "bullets": objectives_slide["bullets"]},
+        {"kind": "content", "title": pain_points_slide["title"], "bullets": pain_points_slide["bullets"]},
+        {"kind": "roadmap", "title": phases_overview_slide["title"], "phases": [
+            {"title": phase["title"], "description": phase.get("description", "")} for phase in phases
+        ]},
+    ]
+    # One slide per phase
+    for phase in phases:
+        specs.append({"kind": "content", "title": phase["title"], "bullets": [phase["description"]]})
+    specs.append({"kind": "content", "title": expected_outcomes_slide["title"], "bullets": expected_outcomes_slide["bullets"]})
+    specs.append({"kind": "content", "title": next_steps_slide["title"], "bullets": next_steps_slide["bullets"]})
+    return specs
+
+def render_slide(prs, spec: Dict[str, object]):
+    """Add one slide described by a spec to the presentation."""
+    if spec["kind"] == "cover":
+        add_cover_slide(prs, spec["title"], spec["subtitle"])
+    elif spec["kind"] == "roadmap":
+        add_horizontal_roadmap_slide(prs, spec["title"], spec["phases"])
+    else:
+        add_content_slide(prs, spec["title"], spec["bullets"])
+
+def render_presentation(specs: List[Dict[str, object]]):
+    """Create a presentation containing every slide spec."""
+    prs = create_presentation()
+    for spec in specs:
+        render_slide(prs, spec)
+    return prs
+
+def _build_deck(
+    ingest: Callable[[], str],
+    save: Callable[[object], object],
+    nlu: Optional[TranscriptNLU] = None,
+    progress: Optional[ProgressCallback] = None,
+    state: Optional[DeckState] = None,
+    previous: Optional[Callable[[], object]] = None,
+) -> Dict[str, object]:
+    """
+    The ingest, analyze, render and save flow behind every entry point. ingest returns the
+    transcript text and save(prs) stores the presentation. With state, analysis reuses its
+    results; previous, if given, opens the deck rendered from state.slides to patch in place.
+    """
+    timings = {}
+    with _stage("ingest", timings, progress):
+        transcript_text = ingest()
+
+    reused_stages: List[str] = []
+    insights, phases, analysis_timings, schedule = analyze_transcript(transcript_text, nlu, progress, state, reused_stages)
+    timings.update(analysis_timings)
+
+    with _stage("render", timings, progress):
+        specs = build_slide_specs(insights, phases)
+        if previous is not None:
+            prs = previous()
+            rendered = patch_presentation(prs, state.slides, specs, render_slide)
+        else:
+            prs = render_presentation(specs)
+            rendered = len(specs)
+
+    with _stage("save", timings, progress):
+        saved = save(prs)
+    return {
+        "saved": saved, "timings": timings, "schedule": schedule,
+        "specs": specs, "slides_rendered": rendered, "stages_reused": reused_stages,
+    }
+
+def generate_deck(
+    transcript_path: str, output_path: str, nlu: Optional[TranscriptNLU] = None, progress: Optional[ProgressCallback] = None
+) -> Dict[str, object]:
+    """
+    Generate a .pptx deck from a transcript file and return per-stage timings and the schedule report.
+    progress, if given, is called as each of STAGES starts and finishes.
+    """
+    build = _build_deck(lambda: ingest_transcript(transcript_path), lambda prs: save_presentation(prs, output_path), nlu, progress)
+    return {"output": output_path, "timings": build["timings"], "schedule": build["schedule"]}
+
+def generate_deck_bytes(
+    data: bytes, filename: str, nlu: Optional[TranscriptNLU] = None, progress: Optional[ProgressCallback] = None
+) -> Dict[str, object]:
+    """
+    Generate a deck from transcript bytes entirely in memory and return the .pptx bytes and per-stage timings.
+    """
+    build = _build_deck(lambda: ingest_transcript_bytes(data, filename), presentation_bytes, nlu, progress)
+    return {"deck": build["saved"], "timings": build["timings"], "schedule": build["schedule"]}
+
+def regenerate_deck(
+    transcript_path: str,
+    output_path: str,
+    state_path: Optional[str] = None,
+    nlu: Optional[TranscriptNLU] = None,
+    progress: Optional[ProgressCallback] = None,
+) -> Dict[str, object]:
+    """
+    Generate a deck like generate_deck, reusing the previous run's work for output_path.
+    Segment labels, pain-point summaries and analysis stages are only recomputed for changed
+    inputs, and only slides whose content changed are re-rendered into the existing deck.
+    Falls back to a full build when there is no usable state (default: next to the deck) or
+    the deck was changed since. The result adds a "reuse" report of the work skipped.
+    """
+    state_path = state_path or state_path_for(output_path)
+    nlu = nlu or TranscriptNLU()
+    models = {
+        "classifier": model_id(nlu.classifier, ZERO_SHOT_MODEL),
+        "summarizer": f"{SUMMARIZATION_MODEL}@{DEFAULT_BACKEND or 'fp32'}",
+    }
+    state = DeckState.load(state_path, models)
+    previous_summaries = set(state.summaries)
+    patchable = state.slides is not None and state.deck is not None and state.deck == file_fingerprint(output_path)
+
+    def save(prs):
+        save_presentation(prs, output_path)
+        state.deck = file_fingerprint(output_path)
+
+    build = _build_deck(
+        lambda: ingest_transcript(transcript_path), save, nlu, progress, state,
+        previous=(lambda: open_presentation(output_path)) if patchable else None,
+    )
+    state.slides = build["specs"]
+    state.save(state_path)
+
+    reuse = {
+        "segments": nlu.segmentation_stats["segments"],
+        "segments_reused": nlu.segmentation_stats["labels_reused"],
+        "pain_points": len(state.summaries),
+        "pain_points_reused": len(previous_summaries & set(state.summaries)),
+        "stages": len(state.stages),
+        "stages_reused": sorted(build["stages_reused"]),
+        "slides": len(build["specs"]),
+        "slides_rendered": build["slides_rendered"],
+    }
+    return {"output": output_path, "timings": build["timings"], "schedule": build["schedule"], "reuse": reuse}
@@ -0,0 +1,60 @@
+"""
+Module for a fast local text classifier used to triage transcript segments.
+Hashed word n-grams feed a linear model, so segments can be labelled in
+microseconds and only uncertain ones need the zero-shot NLI model.
+"""
+
+import pickle
+from typing import List, Tuple
+
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import LogisticRegression
+
+class FastSegmentClassifier:
+    """
+    Hashed n-gram logistic regression over the transcript categories.
+    """
+
+    def __init__(self, n_features: int = 2**18, ngram_range: Tuple[int, int] = (1, 2)):
+        self.vectorizer = HashingVectorizer(
+            n_features=n_features, ngram_range=ngram_range, alternate_sign=False, stop_words='english'
+        )
+        self.model = LogisticRegression(C=10.0, max_iter=1000)
+
+    def fit(self, texts: List[str], labels: List[str]) -> "FastSegmentClassifier":
+        """
+        Train on labelled segments, e.g. the NLI labels of previous transcripts.
+        """
+        if len(set(labels)) < 2:
+            raise ValueError("Fast classifier needs examples of at least two categories")
+        self.model.fit(self.vectorizer.transform(texts), labels)
+        return self
+
+    def predict(self, texts: List[str]) -> Tuple[List[str], List[float]]:
+        """
+        Return the most likely label and its probability for each text.
+        """
+        if not texts:
+            return [], []
+        probabilities = self.model.predict_proba(self.vectorizer.transform(texts))
+        best = probabilities.argmax(axis=1)
+        labels = [str(self.model.classes_[i]) for i in best]
+        confidences = [float(probabilities[row, i]) for row, i in enumerate(best)]
+        return labels, confidences
+
+    def save(self, path: str):
+        with open(path, 'wb') as f:
+            pickle.dump(self, f)
+
+    @staticmethod
+    def load(path: str) -> "FastSegmentClassifier":
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+
+def train_from_nli(nlu, segments: List[str], **kwargs) -> FastSegmentClassifier:
+    """
+    Fit a fast classifier on the NLI labels of the given segments.
+    Labels come through the inference cache, so segments from earlier runs cost no model calls.
+    """
+    labels = nlu.classify_nli(segments)
+    return FastSegmentClassifier(**kwargs).fit(segments, labels)
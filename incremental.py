@@ -0,0 +1,144 @@
+"""
+State for incremental deck regeneration (see deck_pipeline.regenerate_deck).
+A deck's state file keeps the previous run's segment labels and pain-point
+summaries keyed by text fingerprint, the inputs and result of every analysis
+stage, and the slide specs the deck was rendered from. On a rerun only changed
+segments, the stages whose inputs changed and the slides whose specs changed
+are recomputed; the rest of the presentation is patched in place.
+"""
+
+import difflib
+import hashlib
+import json
+import logging
+import os
+from typing import Callable, Dict, List, Optional
+
+STATE_VERSION = 1
+STATE_SUFFIX = ".state.json"
+
+logger = logging.getLogger(__name__)
+
+def fingerprint(text: str) -> str:
+    """Content fingerprint of a text, used as the key for reusable per-segment results."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def file_fingerprint(path: str) -> Optional[str]:
+    if not os.path.exists(path):
+        return None
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def state_path_for(deck_path: str) -> str:
+    """Return the state file kept next to a deck."""
+    return os.path.splitext(deck_path)[0] + STATE_SUFFIX
+
+class DeckState:
+    """
+    Reusable results of the previous run for one deck.
+    models identifies the models that produced them; state from other models is discarded.
+    """
+
+    def __init__(self, models: Dict[str, str]):
+        self.models = models
+        self.labels: Dict[str, str] = {}
+        self.summaries: Dict[str, str] = {}
+        self.stages: Dict[str, Dict[str, object]] = {}
+        self.slides: Optional[List[Dict[str, object]]] = None
+        self.deck: Optional[str] = None
+
+    @classmethod
+    def load(cls, path: str, models: Dict[str, str]) -> "DeckState":
+        """Load the state at path, or start empty when it is missing, unreadable or from other models."""
+        state = cls(models)
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return state
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable deck state {path}: {e}")
+            return state
+        if data.get("version") != STATE_VERSION or data.get("models") != models:
+            logger.info(f"Deck state {path} was produced by other models; regenerating from scratch")
+            return state
+        state.labels = data.get("labels", {})
+        state.summaries = data.get("summaries", {})
+        state.stages = data.get("stages", {})
+        state.slides = data.get("slides")
+        state.deck = data.get("deck")
+        return state
+
+    def save(self, path: str):
+        data = {
+            "version": STATE_VERSION,
+            "models": self.models,
+            "labels": self.labels,
+            "summaries": self.summaries,
+            "stages": self.stages,
+            "slides": self.slides,
+            "deck": self.deck,
+        }
+        with open(path, 'w') as f:
+            json.dump(data, f, default=str)
+
+def memoize_stages(graph, memo: Dict[str, Dict[str, object]], reused: List[str]):
+    """
+    Wrap every stage of a StageGraph so it returns its previous result when its inputs are unchanged.
+    memo maps stage name to {"inputs": fingerprint, "value": result} and is updated as stages run;
+    the names of stages that were skipped are appended to reused.
+    """
+    for name, stage in graph.stages.items():
+        def run(*args, _name=name, _fn=stage["fn"]):
+            key = fingerprint(json.dumps(args, sort_keys=True, default=str))
+            entry = memo.get(_name)
+            if entry is not None and entry["inputs"] == key:
+                reused.append(_name)
+                return entry["value"]
+            value = _fn(*args)
+            # Round-trip through JSON so a fresh result looks exactly like one loaded from the state file
+            memo[_name] = {"inputs": key, "value": json.loads(json.dumps(value, default=str))}
+            return memo[_name]["value"]
+        stage["fn"] = run
+    return graph
+
+def _spec_key(spec: Dict[str, object]) -> str:
+    return json.dumps(spec, sort_keys=True, default=str)
+
+def patch_presentation(prs, old_specs: List[Dict[str, object]], new_specs: List[Dict[str, object]], render: Callable) -> int:
+    """
+    Turn a presentation rendered from old_specs into one matching new_specs, rendering only
+    slides whose spec changed or is new and deleting slides that are gone. render(prs, spec)
+    must append a slide. Returns the number of slides rendered.
+    """
+    from slide_generation import delete_slide, move_slide, renumber_slides
+
+    if len(prs.slides) != len(old_specs):
+        raise ValueError(f"Presentation has {len(prs.slides)} slides but its state describes {len(old_specs)}")
+    matcher = difflib.SequenceMatcher(None, [_spec_key(s) for s in old_specs], [_spec_key(s) for s in new_specs], autojunk=False)
+    rendered = 0
+    # Apply changes back to front so earlier slide positions stay valid
+    for tag, i1, i2, j1, j2 in reversed(matcher.get_opcodes()):
+        if tag == "equal":
+            continue
+        for index in reversed(range(i1, i2)):
+            delete_slide(prs, index)
+        for offset, spec in enumerate(new_specs[j1:j2]):
+            render(prs, spec)
+            move_slide(prs, len(prs.slides) - 1, i1 + offset)
+            rendered += 1
+    renumber_slides(prs)
+    return rendered
+
+def slide_contents(prs) -> List[Dict[str, object]]:
+    """Layout and shape text of every slide, for comparing presentations built in different ways."""
+    return [
+        {
+            "layout": slide.slide_layout.name,
+            "shapes": [
+                (shape.shape_type, shape.name, shape.text_frame.text if shape.has_text_frame else None)
+                for shape in slide.shapes
+            ],
+        }
+        for slide in prs.slides
+    ]
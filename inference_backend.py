@@ -0,0 +1,244 @@
+"""
+CPU inference backends for the BART pipelines.
+  fp32  the stock transformers pipeline
+  int8  dynamic int8 quantization of every nn.Linear (weights int8, activations quantized per batch)
+  onnx  ONNX Runtime through optimum, exported once and cached on disk
+Backends are selected through the registry's dtype slot, e.g.
+get_summarizer(dtype="int8"), or for every model with AUTODECK_INFERENCE_BACKEND.
+configure_threads sets explicit intra- and inter-op thread counts, and
+accuracy_report compares labels and summaries of each backend against fp32 on
+a fixed corpus.
+"""
+
+import argparse
+import copy
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+import warnings
+from typing import Dict, Iterable, List, Optional, Tuple
+
+BACKENDS = ("fp32", "int8", "onnx")
+
+DEFAULT_ONNX_DIR = os.environ.get(
+    "AUTODECK_ONNX_DIR", os.path.join(os.path.expanduser("~"), ".cache", "autodeck", "onnx")
+)
+
+# Fixed evaluation corpus: one segment per line, covering every NLU category
+FIXED_CORPUS = [
+    "Hi everyone, my name is Dana and I lead the analytics team at Northwind.",
+    "This is Alex from the infrastructure group, I joined the call a bit late.",
+    "Our main goal this year is to grow recurring revenue by twenty percent.",
+    "We want a single dashboard that shows sales and inventory for every region.",
+    "The monthly reports take three days to build and are often out of date.",
+    "Every quarter the finance team spends a week reconciling spreadsheets by hand.",
+    "The legacy ERP system must stay on premise for compliance reasons.",
+    "Our database cannot scale beyond a few hundred concurrent users.",
+    "Next steps: run a four week pilot with the sales team, then roll out to finance.",
+    "We should schedule a follow-up meeting to review the data model and train staff.",
+]
+
+_threads_configured: Dict[str, int] = {}
+
+logger = logging.getLogger(__name__)
+
+def configure_threads(intra_op: Optional[int] = None, inter_op: Optional[int] = None) -> Dict[str, int]:
+    """
+    Set torch's intra-op (per operator) and inter-op (between operators) thread counts.
+    Defaults come from AUTODECK_INTRA_OP_THREADS and AUTODECK_INTER_OP_THREADS. The inter-op
+    count can only be set before torch runs its first parallel op; later calls keep the old value.
+    """
+    import torch
+    intra_op = intra_op or int(os.environ.get("AUTODECK_INTRA_OP_THREADS", "0")) or None
+    inter_op = inter_op or int(os.environ.get("AUTODECK_INTER_OP_THREADS", "0")) or None
+    if intra_op:
+        torch.set_num_threads(intra_op)
+    if inter_op:
+        try:
+            torch.set_num_interop_threads(inter_op)
+        except RuntimeError:
+            logger.warning("torch inter-op threads were already fixed by an earlier parallel op")
+    _threads_configured.update({"intra_op": torch.get_num_threads(), "inter_op": torch.get_num_interop_threads()})
+    return dict(_threads_configured)
+
+def quantize_int8(pipe, inplace: bool = False):
+    """
+    Return a pipeline whose linear layers are dynamically quantized to int8.
+    The fp32 pipeline is left untouched unless inplace, which saves a copy of the weights.
+    """
+    import torch
+    from transformers import pipeline
+    with warnings.catch_warnings():
+        # torch.ao.quantization is deprecated in favour of torchao, which is not a dependency here
+        warnings.simplefilter("ignore", (DeprecationWarning, UserWarning))
+        model = pipe.model if inplace else copy.deepcopy(pipe.model)
+        model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=inplace) or model
+    quantized = pipeline(pipe.task, model=model, tokenizer=pipe.tokenizer, device=-1)
+    if getattr(pipe, "generation_config", None) is not None:
+        quantized.generation_config = copy.deepcopy(pipe.generation_config)
+    # Keeps inference cache entries apart from the fp32 model's
+    quantized.inference_backend = "int8"
+    return quantized
+
+def onnx_cache_dir(task: str, model: str, directory: str = DEFAULT_ONNX_DIR) -> str:
+    """Directory holding the exported ONNX graph for a (task, model) pair."""
+    safe = re.sub(r"[^\w.-]+", "_", model)
+    return os.path.join(directory, f"{safe}-{task}-{hashlib.sha256(model.encode('utf-8')).hexdigest()[:8]}")
+
+def load_onnx(task: str, model: str, directory: str = DEFAULT_ONNX_DIR):
+    """
+    Load an ONNX Runtime pipeline, exporting the model on first use and reusing the cached graph after.
+    Requires optimum[onnxruntime].
+    """
+    try:
+        import onnxruntime
+        from optimum.onnxruntime import ORTModelForSeq2SeqLM, ORTModelForSequenceClassification
+        from optimum.pipelines import pipeline as ort_pipeline
+        from transformers import AutoTokenizer
+    except ImportError as e:
+        raise ImportError("The onnx backend requires optimum[onnxruntime]: pip install 'optimum[onnxruntime]'") from e
+
+    model_class = ORTModelForSeq2SeqLM if task == "summarization" else ORTModelForSequenceClassification
+    session_options = onnxruntime.SessionOptions()
+    if _threads_configured:
+        session_options.intra_op_num_threads = _threads_configured["intra_op"]
+        session_options.inter_op_num_threads = _threads_configured["inter_op"]
+
+    path = onnx_cache_dir(task, model, directory)
+    if os.path.exists(os.path.join(path, "config.json")):
+        ort_model = model_class.from_pretrained(path, session_options=session_options)
+        tokenizer = AutoTokenizer.from_pretrained(path)
+    else:
+        start = time.perf_counter()
+        ort_model = model_class.from_pretrained(model, export=True, session_options=session_options)
+        tokenizer = AutoTokenizer.from_pretrained(model)
+        ort_model.save_pretrained(path)
+        tokenizer.save_pretrained(path)
+        logger.info(f"Exported {model} to ONNX in {time.perf_counter() - start:.1f}s ({path})")
+    pipe = ort_pipeline(task, model=ort_model, tokenizer=tokenizer, accelerator="ort")
+    pipe.inference_backend = "onnx"
+    return pipe
+
+def load_pipeline(task: str, model: str, backend: str):
+    """Build a pipeline for model with the given backend; used by the model registry's loader."""
+    from transformers import pipeline
+    if backend == "onnx":
+        return load_onnx(task, model)
+    pipe = pipeline(task, model=model, device=-1)
+    return quantize_int8(pipe, inplace=True) if backend == "int8" else pipe
+
+def make_backend(pipe, backend: str, model: Optional[str] = None):
+    """Derive a pipeline for backend from an already loaded fp32 pipeline."""
+    if backend == "fp32":
+        return pipe
+    if backend == "int8":
+        return quantize_int8(pipe)
+    if backend == "onnx":
+        return load_onnx(pipe.task, model or pipe.model.name_or_path)
+    raise ValueError(f"Unknown inference backend: {backend}")
+
+def _rouge1_f1(candidate: str, reference: str) -> float:
+    candidate_tokens, reference_tokens = candidate.lower().split(), reference.lower().split()
+    if not candidate_tokens or not reference_tokens:
+        return float(candidate_tokens == reference_tokens)
+    remaining = list(reference_tokens)
+    overlap = 0
+    for token in candidate_tokens:
+        if token in remaining:
+            remaining.remove(token)
+            overlap += 1
+    precision, recall = overlap / len(candidate_tokens), overlap / len(reference_tokens)
+    return 2 * precision * recall / (precision + recall) if overlap else 0.0
+
+def _time(fn, repeat: int) -> Tuple[object, float]:
+    # Best of repeat runs, so one-off warm-up costs don't dominate small corpora
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+def accuracy_report(
+    classifier,
+    summarizer,
+    backends: Iterable[str] = ("fp32", "int8"),
+    corpus: Optional[List[str]] = None,
+    repeat: int = 3,
+    max_length: int = 50,
+    min_length: int = 10,
+) -> Dict[str, Dict[str, object]]:
+    """
+    Run the fixed corpus through each backend and compare with fp32:
+    label agreement for classification, exact-match rate and ROUGE-1 F1 for summaries,
+    plus best-of-repeat latency and the speedup over fp32.
+    """
+    import inference_cache
+
+    corpus = corpus or FIXED_CORPUS
+    report = {}
+    reference = None
+    # Every repeat must run the model rather than read results back from the inference cache
+    cache_enabled = inference_cache.CACHE_ENABLED
+    inference_cache.CACHE_ENABLED = False
+    try:
+        for backend in ["fp32"] + [b for b in backends if b != "fp32"]:
+            report[backend], reference = _evaluate_backend(
+                classifier, summarizer, backend, corpus, repeat, max_length, min_length, reference
+            )
+    finally:
+        inference_cache.CACHE_ENABLED = cache_enabled
+    return report
+
+def _evaluate_backend(classifier, summarizer, backend, corpus, repeat, max_length, min_length, reference):
+    from nlu_processing import TranscriptNLU
+    from summarization import summarize_batch
+
+    backend_classifier = make_backend(classifier, backend)
+    backend_summarizer = make_backend(summarizer, backend)
+    nlu = TranscriptNLU(classifier=backend_classifier)
+    labels, classify_s = _time(lambda: nlu.classify_segments(corpus), repeat)
+    summaries, summarize_s = _time(
+        lambda: summarize_batch(corpus, max_length, min_length, summarizer=backend_summarizer), repeat
+    )
+    if reference is None:
+        reference = {"labels": labels, "summaries": summaries, "classify_s": classify_s, "summarize_s": summarize_s}
+    return {
+        "classify_s": classify_s,
+        "summarize_s": summarize_s,
+        "classify_speedup": reference["classify_s"] / classify_s if classify_s else None,
+        "summarize_speedup": reference["summarize_s"] / summarize_s if summarize_s else None,
+        "label_agreement": sum(a == b for a, b in zip(labels, reference["labels"])) / len(corpus),
+        "summary_exact_match": sum(a == b for a, b in zip(summaries, reference["summaries"])) / len(corpus),
+        "summary_rouge1_f1": sum(_rouge1_f1(a, b) for a, b in zip(summaries, reference["summaries"])) / len(corpus),
+    }, reference
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Compare inference backends against fp32 on a fixed corpus.")
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=["fp32", "int8"])
+    parser.add_argument("--intra-op", type=int, help="torch intra-op threads")
+    parser.add_argument("--inter-op", type=int, help="torch inter-op threads")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--tiny", action="store_true", help="Use the tiny offline stand-in models")
+    parser.add_argument("--output", help="Write the report as JSON")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    configure_threads(args.intra_op, args.inter_op)
+    if args.tiny:
+        from tiny_models import build_tiny_pipeline
+        classifier, summarizer = build_tiny_pipeline("zero-shot-classification"), build_tiny_pipeline("summarization", 256)
+    else:
+        from model_registry import get_summarizer, get_zero_shot_classifier
+        classifier, summarizer = get_zero_shot_classifier(dtype="fp32"), get_summarizer(dtype="fp32")
+    report = accuracy_report(classifier, summarizer, args.backends, repeat=args.repeat)
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+"""
+Module for a persistent, content-addressed cache of model inference results.
+Entries live in a local SQLite database keyed by a hash of the model id, the
+pipeline parameters and the input text, so repeated runs over the same
+transcript skip classification and summarization entirely.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_CACHE_PATH = os.environ.get(
+    "AUTODECK_CACHE_PATH",
+    os.path.join(os.path.expanduser("~"), ".cache", "autodeck", "inference.sqlite"),
+)
+DEFAULT_MAX_MB = float(os.environ.get("AUTODECK_CACHE_MAX_MB", "256"))
+CACHE_ENABLED = os.environ.get("AUTODECK_INFERENCE_CACHE", "1").lower() not in ("0", "false", "off")
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+def cache_key(model: str, params: Dict[str, object], text: str) -> str:
+    """Return the content address for one inference call."""
+    payload = json.dumps({"model": model, "params": params, "text": text}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def model_id(pipe, default: str) -> str:
+    """
+    Return the model name a pipeline was loaded from, or default for in-memory models,
+    suffixed with its inference backend (see inference_backend) when it isn't fp32.
+    """
+    model = getattr(pipe, "model", None)
+    name = getattr(model, "name_or_path", None) or default
+    backend = getattr(pipe, "inference_backend", None)
+    return f"{name}@{backend}" if backend else name
+
+
+class InferenceCache:
+    """
+    Size-bounded SQLite store of JSON inference results with LRU eviction.
+    WAL journaling and immediate write transactions make it safe to share
+    between threads and worker processes.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_mb: float = DEFAULT_MAX_MB, timeout: float = 30.0):
+        self.path = path
+        self.max_bytes = int(max_mb * 2**20)
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._connection().executescript(SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        # SQLite connections must not cross threads or forks, so keep one per thread and process
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get_many(self, model: str, params: Dict[str, object], texts: List[str]) -> Dict[int, object]:
+        """Return cached values by input index for every text that hits."""
+        keys = [cache_key(model, params, text) for text in texts]
+        conn = self._connection()
+        found: Dict[str, object] = {}
+        unique = list(dict.fromkeys(keys))
+        for start in range(0, len(unique), 500):
+            chunk = unique[start:start + 500]
+            rows = conn.execute(
+                f"SELECT key, value FROM entries WHERE key IN ({','.join('?' * len(chunk))})", chunk
+            ).fetchall()
+            found.update((key, json.loads(value)) for key, value in rows)
+
+        hits = {i: found[key] for i, key in enumerate(keys) if key in found}
+        with self._stats_lock:
+            self.hits += len(hits)
+            self.misses += len(keys) - len(hits)
+        self._record_access(list(found), len(hits), len(keys) - len(hits))
+        return hits
+
+    def _record_access(self, keys: List[str], hits: int, misses: int):
+        # Access times and counters are bookkeeping; skip them rather than block on a busy writer
+        conn = self._connection()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            now = time.time()
+            conn.executemany("UPDATE entries SET accessed = ? WHERE key = ?", [(now, key) for key in keys])
+            conn.executemany(
+                "INSERT INTO counters (name, value) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+                [("hits", hits), ("misses", misses)],
+            )
+            conn.execute("COMMIT")
+        except sqlite3.OperationalError as e:
+            logger.debug(f"Skipped inference cache bookkeeping: {e}")
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+
+    def put_many(self, model: str, params: Dict[str, object], items: Iterable[Tuple[str, object]]):
+        """Store (text, value) results and evict least recently used entries over the size limit."""
+        now = time.time()
+        rows = []
+        for text, value in items:
+            encoded = json.dumps(value)
+            rows.append((cache_key(model, params, text), encoded, len(encoded), now))
+        if not rows:
+            return
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "INSERT OR REPLACE INTO entries (key, value, size, accessed) VALUES (?, ?, ?, ?)", rows
+            )
+            self._evict(conn)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _evict(self, conn: sqlite3.Connection):
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Evict down to 90% of the limit so every insert near the limit doesn't evict again
+        target = total - int(self.max_bytes * 0.9)
+        victims = []
+        freed = 0
+        for key, size in conn.execute("SELECT key, size FROM entries ORDER BY accessed"):
+            victims.append((key,))
+            freed += size
+            if freed >= target:
+                break
+        conn.executemany("DELETE FROM entries WHERE key = ?", victims)
+        conn.execute(
+            "INSERT INTO counters (name, value) VALUES ('evictions', ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            (len(victims),),
+        )
+
+    def get(self, model: str, params: Dict[str, object], text: str):
+        """Return the cached value for one text, or None."""
+        return self.get_many(model, params, [text]).get(0)
+
+    def put(self, model: str, params: Dict[str, object], text: str, value):
+        """Store the value for one text."""
+        self.put_many(model, params, [(text, value)])
+
+    def clear(self):
+        """Remove every entry and reset the counters."""
+        conn = self._connection()
+        conn.execute("DELETE FROM entries")
+        conn.execute("DELETE FROM counters")
+        with self._stats_lock:
+            self.hits = self.misses = 0
+
+    def stats(self) -> Dict[str, object]:
+        """Return hit-rate statistics for this process and across every process sharing the file."""
+        conn = self._connection()
+        entries, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        totals = dict(conn.execute("SELECT name, value FROM counters").fetchall())
+        lookups = self.hits + self.misses
+        total_lookups = totals.get("hits", 0) + totals.get("misses", 0)
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "total_hits": totals.get("hits", 0),
+            "total_misses": totals.get("misses", 0),
+            "total_hit_rate": totals.get("hits", 0) / total_lookups if total_lookups else 0.0,
+            "evictions": totals.get("evictions", 0),
+            "entries": entries,
+            "size_mb": size / 2**20,
+        }
+
+
+_default_cache: Optional[InferenceCache] = None
+_default_lock = threading.Lock()
+
+
+def get_default_cache() -> Optional[InferenceCache]:
+    """Return the shared on-disk cache, or None when AUTODECK_INFERENCE_CACHE disables it."""
+    global _default_cache
+    if not CACHE_ENABLED:
+        return None
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = InferenceCache()
+        return _default_cache
+
+
+def set_default_cache(cache: Optional[InferenceCache]):
+    """Replace the shared cache, e.g. to point it at another path."""
+    global _default_cache
+    with _default_lock:
+        _default_cache = cache
+
+
+def cached_map(
+    model: str,
+    params: Dict[str, object],
+    texts: List[str],
+    compute: Callable[[List[str]], List[object]],
+    cache: Optional[InferenceCache] = None,
+) -> List[object]:
+    """
+    Return compute(texts) but only call compute on texts missing from the cache.
+    Duplicate texts are computed once. The default cache is used when cache is None.
+    """
+    cache = cache or get_default_cache()
+    if cache is None or not texts:
+        return compute(texts) if texts else []
+
+    results: Dict[int, object] = cache.get_many(model, params, texts)
+    missing = list(dict.fromkeys(text for i, text in enumerate(texts) if i not in results))
+    if missing:
+        computed = dict(zip(missing, compute(missing)))
+        cache.put_many(model, params, computed.items())
+        for i, text in enumerate(texts):
+            if i not in results:
+                results[i] = computed[text]
+    return [results[i] for i in range(len(texts))]
@@ -0,0 +1,227 @@
+"""
+Client for remote text-generation endpoints (Hugging Face Inference API format).
+Requests share one pooled keep-alive session and run concurrently on a bounded
+thread pool; identical prompts already in flight are coalesced into a single
+request. Transient failures are retried with jittered exponential backoff, and
+a circuit breaker stops calling an endpoint whose recent failure rate stays
+high, routing prompts to a local fallback until a trial request succeeds.
+"""
+
+import asyncio
+import json
+import logging
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF_S = 0.5
+MAX_BACKOFF_S = 8.0
+RETRYABLE_STATUS = (408, 429, 500, 502, 503, 504)
+
+logger = logging.getLogger(__name__)
+
+class InferenceError(RuntimeError):
+    """Raised when the endpoint fails a request that cannot be retried or has exhausted its retries."""
+
+class CircuitOpenError(InferenceError):
+    """Raised when the circuit breaker is open and no fallback is configured."""
+
+class CircuitBreaker:
+    """
+    Failure-rate circuit breaker over a sliding window of recent calls.
+    Opens when at least min_calls of the last window calls were made and the failure
+    rate reaches failure_rate; after reset_timeout one trial call is let through
+    (half-open) and its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, window: int = 20, failure_rate: float = 0.5, min_calls: int = 5, reset_timeout: float = 30.0):
+        self.window = window
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self._outcomes = deque(maxlen=window)
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Return whether a call may go to the endpoint now."""
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = "half_open"
+            if self.state == "half_open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record(self, success: bool):
+        with self._lock:
+            if self.state == "half_open":
+                self._trial_in_flight = False
+                if success:
+                    self.state = "closed"
+                    self._outcomes.clear()
+                else:
+                    self._open()
+                return
+            self._outcomes.append(success)
+            failures = self._outcomes.count(False)
+            if len(self._outcomes) >= self.min_calls and failures / len(self._outcomes) >= self.failure_rate:
+                self._open()
+
+    def _open(self):
+        if self.state != "open":
+            logger.warning("Inference endpoint circuit opened; routing to the local fallback")
+        self.state = "open"
+        self._opened_at = time.monotonic()
+
+def parse_generated_text(result) -> str:
+    """Extract the text from a Hugging Face text-generation response."""
+    if isinstance(result, list) and result and isinstance(result[0], dict) and "generated_text" in result[0]:
+        return result[0]["generated_text"].strip()
+    raise InferenceError("Unexpected response format from AI API.")
+
+class InferenceClient:
+    """
+    Pooled, concurrent client for one text-generation endpoint.
+    fallback, if given, produces the text for a prompt locally while the circuit is open.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        token: str = "",
+        timeout: float = DEFAULT_TIMEOUT,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        retries: int = DEFAULT_RETRIES,
+        backoff: float = DEFAULT_BACKOFF_S,
+        breaker: Optional[CircuitBreaker] = None,
+        fallback: Optional[Callable[[str], str]] = None,
+        parse: Callable[[object], str] = parse_generated_text,
+    ):
+        self.url = url
+        self.token = token
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.breaker = breaker or CircuitBreaker()
+        self.fallback = fallback
+        self.parse = parse
+        self._session = None
+        self._executor = ThreadPoolExecutor(max_concurrency, thread_name_prefix="autodeck-inference")
+        self._in_flight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.counters = {"requests": 0, "retries": 0, "coalesced": 0, "failures": 0, "fallbacks": 0}
+
+    @property
+    def session(self):
+        """The shared keep-alive session, with one pooled connection per concurrent request."""
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_concurrency, max_retries=0)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            if self.token:
+                session.headers["Authorization"] = f"Bearer {self.token}"
+            self._session = session
+        return self._session
+
+    def _count(self, name: str, n: int = 1):
+        with self._lock:
+            self.counters[name] += n
+
+    def _post(self, prompt: str, parameters: Dict[str, object]) -> str:
+        import requests
+        last_error = None
+        for attempt in range(self.retries + 1):
+            if attempt:
+                self._count("retries")
+                # Full jitter keeps many clients from retrying in lockstep
+                time.sleep(random.uniform(0, min(MAX_BACKOFF_S, self.backoff * 2 ** (attempt - 1))))
+            self._count("requests")
+            try:
+                response = self.session.post(self.url, json={"inputs": prompt, "parameters": parameters}, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                last_error = e
+                continue
+            except requests.RequestException as e:
+                raise InferenceError(f"AI API request failed: {e}") from e
+            if response.status_code in RETRYABLE_STATUS:
+                last_error = InferenceError(f"AI API returned {response.status_code}")
+                continue
+            if response.status_code >= 400:
+                raise InferenceError(f"AI API returned {response.status_code}: {response.text[:200]}")
+            try:
+                result = response.json()
+            except ValueError as e:
+                raise InferenceError(f"AI API returned invalid JSON: {response.text[:200]}") from e
+            return self.parse(result)
+        raise InferenceError(f"AI API call failed after {self.retries + 1} attempts: {last_error}")
+
+    def _generate(self, prompt: str, parameters: Dict[str, object]) -> str:
+        if not self.breaker.allow():
+            if self.fallback is None:
+                raise CircuitOpenError("AI API circuit is open")
+            self._count("fallbacks")
+            return self.fallback(prompt)
+        success = False
+        try:
+            text = self._post(prompt, parameters)
+            success = True
+            return text
+        finally:
+            # Any exception counts as a failure, so a half-open trial always settles the circuit
+            if not success:
+                self._count("failures")
+            self.breaker.record(success)
+
+    def submit(self, prompt: str, parameters: Optional[Dict[str, object]] = None) -> Future:
+        """Start generating text for prompt, sharing the request with an identical one already in flight."""
+        parameters = parameters or {}
+        key = json.dumps([prompt, parameters], sort_keys=True, default=str)
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.counters["coalesced"] += 1
+                return future
+            future = self._executor.submit(self._generate, prompt, parameters)
+            self._in_flight[key] = future
+
+        def forget(_):
+            with self._lock:
+                self._in_flight.pop(key, None)
+        future.add_done_callback(forget)
+        return future
+
+    def generate(self, prompt: str, parameters: Optional[Dict[str, object]] = None) -> str:
+        return self.submit(prompt, parameters).result()
+
+    def generate_batch(self, prompts: List[str], parameters: Optional[Dict[str, object]] = None) -> List[str]:
+        """Generate text for every prompt concurrently, at most max_concurrency requests at a time."""
+        futures = [self.submit(prompt, parameters) for prompt in prompts]
+        return [future.result() for future in futures]
+
+    async def generate_many(self, prompts: List[str], parameters: Optional[Dict[str, object]] = None) -> List[str]:
+        """Async variant of generate_batch for callers running an event loop."""
+        return await asyncio.gather(*(asyncio.wrap_future(self.submit(prompt, parameters)) for prompt in prompts))
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {**self.counters, "circuit": self.breaker.state}
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+        if self._session is not None:
+            self._session.close()
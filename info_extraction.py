@@ -5,6 +5,12 @@ Module for extracting structured insights from segmented transcript text.
 from typing import Dict, List, Optional
 import re
 
+from incremental import fingerprint
+from stage_scheduler import StageGraph
+from summarization import summarize_batch, summarize_long
+from tracing import traced
+
+@traced()
 def extract_client_name(introductions: List[str]) -> Optional[str]:
     """
     Extract client name from introductions segment using simple heuristics.
@@ -18,26 +24,33 @@ def extract_client_name(introductions: List[str]) -> Optional[str]:
             return match.group(1).strip()
     return None
 
+@traced()
 def extract_objectives(client_goals: List[str]) -> str:
     """
     Combine client goals into a concise objective statement.
     """
     return " ".join(client_goals).strip()
 
-def extract_pain_points(pain_points: List[str]) -> List[str]:
+@traced()
+def extract_pain_points(pain_points: List[str], summaries: Optional[Dict[str, str]] = None) -> List[str]:
     """
     Extract key pain points as bullet points.
+    summaries, if given, maps pain point fingerprints to summaries from an earlier run; only the
+    other pain points are summarized, and summaries is left holding exactly this call's results.
     """
-    from transformers import pipeline
-    summarizer = pipeline("summarization", model="facebook/bart-large-cnn")
+    if summaries is None:
+        # Summarize each pain point text to a concise bullet, batched across all pain points
+        return summarize_batch(pain_points, max_length=50, min_length=10)
 
-    points = []
-    for text in pain_points:
-        # Summarize each pain point text to a concise bullet
-        summary = summarizer(text, max_length=50, min_length=10, do_sample=False)[0]['summary_text']
-        points.append(summary.strip())
-    return points
+    keys = [fingerprint(text) for text in pain_points]
+    missing = [text for text, key in zip(pain_points, keys) if key not in summaries]
+    known = dict(summaries)
+    known.update(zip(map(fingerprint, missing), summarize_batch(missing, max_length=50, min_length=10)))
+    summaries.clear()
+    summaries.update({key: known[key] for key in keys})
+    return [known[key] for key in keys]
 
+@traced()
 def extract_phases(suggested_next_steps: List[str]) -> List[Dict[str, str]]:
     """
     Extract proposed solution phases with optional descriptions.
@@ -56,34 +69,48 @@ def extract_phases(suggested_next_steps: List[str]) -> List[Dict[str, str]]:
     # Limit to 3-6 phases
     return phases[:6]
 
+@traced()
 def extract_expected_outcomes(outcomes: List[str]) -> str:
     """
     Combine expected outcomes into a concise statement.
     """
-    from transformers import pipeline
-    summarizer = pipeline("summarization", model="facebook/bart-large-cnn")
-
     combined_text = " ".join(outcomes).strip()
     if not combined_text:
         return ""
 
-    summary = summarizer(combined_text, max_length=100, min_length=20, do_sample=False)[0]['summary_text']
-    return summary.strip()
+    # Map-reduce so outcomes beyond the model's input length are not truncated away
+    return summarize_long(combined_text, max_length=100, min_length=20)["summary"]
 
-def extract_structured_insights(segmented_text: Dict[str, List[str]]) -> Dict[str, object]:
+def add_insight_stages(
+    graph: StageGraph, source: str = "segmented", group: Optional[str] = None, summaries: Optional[Dict[str, str]] = None
+) -> StageGraph:
     """
-    Extract all structured insights from segmented transcript.
+    Declare the extraction stages on graph plus an "insights" stage assembling their results.
+    Each extraction stage reads only its category of the segmented transcript named source,
+    through a "<source>:<category>" stage, so a stage's inputs change only when its category does.
+    The stages are independent of each other, so the two summarization stages can run concurrently.
+    summaries is passed to extract_pain_points.
     """
-    client_name = extract_client_name(segmented_text.get("Introductions", []))
-    objectives = extract_objectives(segmented_text.get("Client Goals", []))
-    pain_points = extract_pain_points(segmented_text.get("Pain Points", []))
-    phases = extract_phases(segmented_text.get("Suggested Next Steps", []))
-    outcomes = extract_expected_outcomes(segmented_text.get("Suggested Next Steps", []))
-
-    return {
+    for category in ("Introductions", "Client Goals", "Pain Points", "Suggested Next Steps"):
+        graph.add(f"{source}:{category}", lambda segmented, _category=category: segmented.get(_category, []), [source], group=group)
+    graph.add("client_name", extract_client_name, [f"{source}:Introductions"], group=group)
+    graph.add("objectives", extract_objectives, [f"{source}:Client Goals"], group=group)
+    graph.add("pain_points", lambda pain_points: extract_pain_points(pain_points, summaries), [f"{source}:Pain Points"],
+              model=True, group=group)
+    graph.add("phases", extract_phases, [f"{source}:Suggested Next Steps"], group=group)
+    graph.add("expected_outcomes", extract_expected_outcomes, [f"{source}:Suggested Next Steps"], model=True, group=group)
+    graph.add("insights", lambda client_name, objectives, pain_points, phases, outcomes: {
         "client_name": client_name or "Client",
         "objectives": objectives,
         "pain_points": pain_points,
         "phases": phases,
         "expected_outcomes": outcomes
-    }
+    }, ["client_name", "objectives", "pain_points", "phases", "expected_outcomes"], group=group)
+    return graph
+
+@traced()
+def extract_structured_insights(segmented_text: Dict[str, List[str]]) -> Dict[str, object]:
+    """
+    Extract all structured insights from segmented transcript.
+    """
+    return add_insight_stages(StageGraph()).run({"segmented": segmented_text})["insights"]
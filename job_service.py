@@ -0,0 +1,423 @@
+"""
+Local HTTP job service for deck generation.
+Transcripts are submitted to a bounded queue and run through deck_pipeline by a
+pool of worker threads off the event loop, so a slow deck never blocks other
+clients. Each job records per-stage timings and a stream of progress events.
+
+Endpoints (one request per connection):
+  POST /jobs?filename=meeting.docx  transcript bytes as the body; 202, or 429 when the queue is full
+  GET  /jobs                        every known job
+  GET  /jobs/<id>                   job status and stage timings
+  GET  /jobs/<id>/events            progress events as server-sent events, until the job ends
+  GET  /jobs/<id>/result            the generated .pptx
+  GET  /health                      queue depth and worker count
+
+Usage: python job_service.py --port 8765 --workers 2 --max-queue 16
+JobClient talks to a running service.
+"""
+
+import argparse
+import asyncio
+import functools
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_URL = os.environ.get("AUTODECK_JOB_SERVICE_URL", f"http://{DEFAULT_HOST}:{DEFAULT_PORT}")
+DEFAULT_WORKERS = 2
+DEFAULT_MAX_QUEUE = 16
+DEFAULT_MAX_JOBS = 256
+MAX_UPLOAD_BYTES = 50 * 2**20
+RETRY_AFTER_SECONDS = 5
+SUPPORTED_EXTENSIONS = (".txt", ".docx")
+TERMINAL_STATUSES = ("done", "failed")
+# The event stream sends an SSE comment after this many idle seconds, so clients can keep a
+# read timeout on the stream however long a stage or queue wait runs without events
+KEEPALIVE_SECONDS = 15.0
+# Read timeout on the event stream: a few missed keepalives means the service is gone
+STREAM_TIMEOUT = 4 * KEEPALIVE_SECONDS
+PPTX_MIME = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+
+STATUS_TEXT = {
+    200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    409: "Conflict", 413: "Payload Too Large", 429: "Too Many Requests", 500: "Internal Server Error",
+}
+
+logger = logging.getLogger(__name__)
+
+class QueueFullError(RuntimeError):
+    """Raised when a job is submitted while the job queue is full."""
+
+def _default_runner(transcript_path: str, output_path: str, progress=None) -> Dict[str, object]:
+    from deck_pipeline import generate_deck
+    return generate_deck(transcript_path, output_path, progress=progress)
+
+def job_view(job: Dict[str, object]) -> Dict[str, object]:
+    """Return the client-facing fields of a job."""
+    keys = ("id", "filename", "status", "created", "started", "finished", "timings", "error")
+    return {key: job[key] for key in keys}
+
+class JobService:
+    """
+    Bounded job queue drained by worker coroutines that run the pipeline in a thread pool.
+    Every method except start_background must be called on the service's event loop.
+    """
+
+    def __init__(
+        self,
+        workers: int = DEFAULT_WORKERS,
+        max_queue: int = DEFAULT_MAX_QUEUE,
+        work_dir: Optional[str] = None,
+        max_jobs: int = DEFAULT_MAX_JOBS,
+        runner: Optional[Callable] = None,
+        keepalive: float = KEEPALIVE_SECONDS,
+    ):
+        self.workers = workers
+        self.keepalive = keepalive
+        self.max_queue = max_queue
+        self.work_dir = work_dir or tempfile.mkdtemp(prefix="autodeck-jobs-")
+        self.max_jobs = max_jobs
+        self._runner = runner or _default_runner
+        self.jobs: "OrderedDict[str, Dict[str, object]]" = OrderedDict()
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="autodeck-job")
+        self._loop = None
+        self._queue = None
+        self._changed = None
+        self._tasks = []
+        os.makedirs(self.work_dir, exist_ok=True)
+
+    async def start(self):
+        """Create the queue and worker coroutines on the running loop."""
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(self.max_queue)
+        self._changed = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        """Cancel the workers; jobs still running in the thread pool finish in the background."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._executor.shutdown(wait=False)
+
+    def submit(self, filename: str, data: bytes) -> Dict[str, object]:
+        """Queue a transcript for deck generation, raising QueueFullError when the queue is full."""
+        ext = os.path.splitext(filename)[1].lower()
+        if ext not in SUPPORTED_EXTENSIONS:
+            raise ValueError(f"Unsupported transcript file type: {ext}")
+        if self._queue.full():
+            raise QueueFullError(f"Job queue is full ({self.max_queue} jobs waiting)")
+
+        job_id = uuid.uuid4().hex
+        job_dir = os.path.join(self.work_dir, job_id)
+        os.makedirs(job_dir)
+        input_path = os.path.join(job_dir, "transcript" + ext)
+        with open(input_path, 'wb') as f:
+            f.write(data)
+        job = {
+            "id": job_id, "filename": filename, "status": "queued",
+            "created": time.time(), "started": None, "finished": None,
+            "timings": {}, "error": None, "events": [],
+            "input": input_path, "output": os.path.join(job_dir, "deck.pptx"),
+        }
+        self.jobs[job_id] = job
+        self._queue.put_nowait(job_id)
+        self._emit(job, "queued")
+        self._prune()
+        return job
+
+    def _prune(self):
+        # Forget the oldest finished jobs, and their files, beyond max_jobs
+        finished = [job_id for job_id, job in self.jobs.items() if job["status"] in TERMINAL_STATUSES]
+        for job_id in finished[:max(0, len(self.jobs) - self.max_jobs)]:
+            job = self.jobs.pop(job_id)
+            shutil.rmtree(os.path.dirname(job["input"]), ignore_errors=True)
+
+    def _emit(self, job: Dict[str, object], event: str, **fields):
+        job["events"].append({"event": event, "time": time.time(), **fields})
+        # Wake every waiting event stream; later waiters get a fresh event
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def _stage_event(self, job: Dict[str, object], stage: str, state: str, seconds: float):
+        if state == "finished":
+            job["timings"][stage] = seconds
+            self._emit(job, "stage_finished", stage=stage, seconds=seconds)
+        else:
+            self._emit(job, "stage_started", stage=stage)
+
+    async def _worker(self):
+        while True:
+            job_id = await self._queue.get()
+            try:
+                if job_id in self.jobs:
+                    await self._run(self.jobs[job_id])
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Dict[str, object]):
+        job["status"] = "running"
+        job["started"] = time.time()
+        self._emit(job, "running")
+
+        def progress(stage, state, seconds):
+            # Called from the worker thread
+            self._loop.call_soon_threadsafe(self._stage_event, job, stage, state, seconds)
+
+        try:
+            run = functools.partial(self._runner, job["input"], job["output"], progress=progress)
+            await self._loop.run_in_executor(self._executor, run)
+            job["status"] = "done"
+        except Exception as e:
+            logger.warning(f"Job {job['id']} ({job['filename']}) failed: {type(e).__name__}: {e}")
+            job["status"] = "failed"
+            job["error"] = f"{type(e).__name__}: {e}"
+        job["finished"] = time.time()
+        self._emit(job, job["status"])
+
+    async def events(self, job_id: str, since: int = 0, keepalive: Optional[float] = None):
+        """
+        Yield the job's progress events from index since, waiting for new ones until the job ends.
+        With keepalive, None is yielded whenever that many seconds pass without an event.
+        """
+        job = self.jobs[job_id]
+        index = since
+        while True:
+            changed = self._changed
+            while index < len(job["events"]):
+                yield job["events"][index]
+                index += 1
+            if job["status"] in TERMINAL_STATUSES:
+                return
+            try:
+                await asyncio.wait_for(changed.wait(), keepalive)
+            except asyncio.TimeoutError:
+                yield None
+
+    def health(self) -> Dict[str, object]:
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "queued": self._queue.qsize(),
+            "running": sum(job["status"] == "running" for job in self.jobs.values()),
+            "jobs": len(self.jobs),
+        }
+
+    async def _send(self, writer, status: int, body: bytes = b"", content_type: str = "application/json", headers: Optional[Dict[str, str]] = None):
+        head = [f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}", f"Content-Type: {content_type}",
+                f"Content-Length: {len(body)}", "Connection: close"]
+        head += [f"{name}: {value}" for name, value in (headers or {}).items()]
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+    async def _send_json(self, writer, status: int, payload, headers: Optional[Dict[str, str]] = None):
+        await self._send(writer, status, json.dumps(payload).encode("utf-8"), headers=headers)
+
+    async def _stream_events(self, writer, job_id: str, since: int):
+        head = ["HTTP/1.1 200 OK", "Content-Type: text/event-stream", "Cache-Control: no-cache", "Connection: close"]
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1"))
+        async for event in self.events(job_id, since, keepalive=self.keepalive):
+            if event is None:
+                writer.write(b": ping\n\n")
+            else:
+                writer.write(f"event: {event['event']}\ndata: {json.dumps(event)}\n\n".encode("utf-8"))
+            await writer.drain()
+
+    async def handle(self, reader, writer):
+        """Serve one HTTP request on an asyncio stream."""
+        try:
+            request_line = await reader.readline()
+            method, target, _ = request_line.decode("latin-1").split(" ", 2)
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            length = int(headers.get("content-length", 0))
+            if length > MAX_UPLOAD_BYTES:
+                await self._send_json(writer, 413, {"error": f"Upload exceeds {MAX_UPLOAD_BYTES} bytes"})
+                return
+            body = await reader.readexactly(length) if length else b""
+            await self._route(writer, method, urllib.parse.urlsplit(target), body)
+        except (ValueError, asyncio.IncompleteReadError) as e:
+            await self._send_json(writer, 400, {"error": str(e)})
+        except ConnectionError:
+            pass
+        except Exception as e:
+            logger.exception("Job service request failed")
+            await self._send_json(writer, 500, {"error": f"{type(e).__name__}: {e}"})
+        finally:
+            writer.close()
+
+    async def _route(self, writer, method: str, url, body: bytes):
+        parts = [part for part in url.path.split("/") if part]
+        query = urllib.parse.parse_qs(url.query)
+        if parts == ["health"]:
+            await self._send_json(writer, 200, self.health())
+        elif parts == ["jobs"] and method == "POST":
+            filename = query.get("filename", [""])[0]
+            try:
+                job = self.submit(filename, body)
+            except QueueFullError as e:
+                await self._send_json(writer, 429, {"error": str(e)}, headers={"Retry-After": str(RETRY_AFTER_SECONDS)})
+                return
+            await self._send_json(writer, 202, job_view(job), headers={"Location": f"/jobs/{job['id']}"})
+        elif parts == ["jobs"]:
+            await self._send_json(writer, 200, [job_view(job) for job in self.jobs.values()])
+        elif len(parts) in (2, 3) and parts[0] == "jobs":
+            job = self.jobs.get(parts[1])
+            if job is None:
+                await self._send_json(writer, 404, {"error": f"Unknown job {parts[1]}"})
+            elif len(parts) == 2:
+                await self._send_json(writer, 200, job_view(job))
+            elif parts[2] == "events":
+                await self._stream_events(writer, job["id"], int(query.get("since", ["0"])[0]))
+            elif parts[2] == "result" and job["status"] == "done":
+                with open(job["output"], 'rb') as f:
+                    data = f.read()
+                await self._send(writer, 200, data, content_type=PPTX_MIME)
+            elif parts[2] == "result":
+                await self._send_json(writer, 409, {"error": f"Job is {job['status']}", "detail": job["error"]})
+            else:
+                await self._send_json(writer, 404, {"error": f"Unknown resource {url.path}"})
+        else:
+            await self._send_json(writer, 404 if method == "GET" else 405, {"error": f"Unknown resource {url.path}"})
+
+    async def serve(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, ready: Optional[Callable[[int], None]] = None):
+        """Serve HTTP on host:port until cancelled; ready is called with the bound port."""
+        await self.start()
+        server = await asyncio.start_server(self.handle, host, port)
+        if ready:
+            ready(server.sockets[0].getsockname()[1])
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.stop()
+
+    def start_background(self, host: str = DEFAULT_HOST, port: int = 0) -> str:
+        """Run the service on its own event loop in a daemon thread and return its base URL."""
+        bound = {}
+        started = threading.Event()
+
+        def ready(actual_port):
+            bound["port"] = actual_port
+            started.set()
+
+        thread = threading.Thread(target=asyncio.run, args=(self.serve(host, port, ready),), daemon=True, name="autodeck-job-service")
+        thread.start()
+        started.wait()
+        return f"http://{host}:{bound['port']}"
+
+class JobClient:
+    """Minimal client for a running JobService."""
+
+    def __init__(self, base_url: str = DEFAULT_URL, timeout: float = 30):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def _open(self, path: str, data: Optional[bytes] = None, timeout: Optional[float] = None):
+        request = urllib.request.Request(self.base_url + path, data=data, method="POST" if data is not None else "GET")
+        try:
+            return urllib.request.urlopen(request, timeout=timeout or self.timeout)
+        except urllib.error.HTTPError as e:
+            detail = e.read().decode("utf-8", "replace")
+            if e.code == 429:
+                raise QueueFullError(detail) from e
+            raise RuntimeError(f"Job service returned {e.code}: {detail}") from e
+
+    def _json(self, path: str, data: Optional[bytes] = None):
+        with self._open(path, data) as response:
+            return json.load(response)
+
+    def submit_bytes(self, filename: str, data: bytes) -> Dict[str, object]:
+        """Submit transcript contents and return the queued job."""
+        return self._json("/jobs?" + urllib.parse.urlencode({"filename": filename}), data)
+
+    def submit(self, transcript_path: str) -> Dict[str, object]:
+        """Submit a transcript file and return the queued job."""
+        with open(transcript_path, 'rb') as f:
+            return self.submit_bytes(os.path.basename(transcript_path), f.read())
+
+    def status(self, job_id: str) -> Dict[str, object]:
+        return self._json(f"/jobs/{job_id}")
+
+    def jobs(self) -> List[Dict[str, object]]:
+        return self._json("/jobs")
+
+    def health(self) -> Dict[str, object]:
+        return self._json("/health")
+
+    def events(self, job_id: str, since: int = 0, timeout: Optional[float] = None) -> Iterator[Dict[str, object]]:
+        """
+        Yield the job's progress events until it finishes. timeout applies to each read of the
+        stream and defaults to STREAM_TIMEOUT, not the request timeout, since the service only
+        writes keepalives while a stage runs.
+        """
+        with self._open(f"/jobs/{job_id}/events?since={since}", timeout=timeout or max(self.timeout, STREAM_TIMEOUT)) as response:
+            for line in response:
+                if line.startswith(b"data: "):
+                    yield json.loads(line[len(b"data: "):])
+
+    def result(self, job_id: str) -> bytes:
+        """Return a finished job's deck as .pptx bytes."""
+        with self._open(f"/jobs/{job_id}/result") as response:
+            return response.read()
+
+    def download(self, job_id: str, output_path: str) -> str:
+        """Save a finished job's deck to output_path."""
+        with self._open(f"/jobs/{job_id}/result") as response, open(output_path, 'wb') as f:
+            shutil.copyfileobj(response, f)
+        return output_path
+
+    def generate(self, transcript_path: str, output_path: str, on_event: Optional[Callable[[Dict[str, object]], None]] = None) -> Dict[str, object]:
+        """Submit a transcript, follow its progress, download the deck and return the final job status."""
+        job = self.submit(transcript_path)
+        for event in self.events(job["id"]):
+            if on_event:
+                on_event(event)
+        job = self.status(job["id"])
+        if job["status"] != "done":
+            raise RuntimeError(f"Deck generation failed: {job['error']}")
+        self.download(job["id"], output_path)
+        return job
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Run the local deck generation job service.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Jobs run concurrently")
+    parser.add_argument("--max-queue", type=int, default=DEFAULT_MAX_QUEUE, help="Jobs waiting before submissions are rejected")
+    parser.add_argument("--work-dir", help="Directory for uploaded transcripts and generated decks")
+    parser.add_argument("--no-warm-up", action="store_true", help="Load dependencies and models on the first job instead of at startup")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    if not args.no_warm_up:
+        # Accept jobs right away; the first ones wait only for what is still loading
+        from preloader import start_preloader
+        start_preloader()
+    service = JobService(workers=args.workers, max_queue=args.max_queue, work_dir=args.work_dir)
+    logger.info(f"Serving deck jobs on http://{args.host}:{args.port}")
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -2,18 +2,49 @@
 Main script to run the automated slide deck generator.
 """
 
+import os
+
 from data_ingestion import read_excel, read_csv, read_sql_file, read_database_table
 from data_processing import summarize_data
 from ai_integration import generate_slide_content_summary
-from slide_generation import create_presentation, add_title_slide, add_content_slide, save_presentation
+from slide_generation import (
+    create_presentation,
+    add_title_slide,
+    add_content_slide,
+    add_text_slides,
+    add_dataframe_chart_slides,
+    save_presentation,
+)
+
+# When set, transcript decks are generated by a running job_service instead of in this process
+JOB_SERVICE_URL = os.environ.get("AUTODECK_JOB_SERVICE_URL")
+
+def generate_transcript_deck(transcript_path):
+    """Generate a client deck for a transcript, through the job service when JOB_SERVICE_URL is set (see job_service.py)."""
+    output_file = os.path.splitext(transcript_path)[0] + ".pptx"
+    if JOB_SERVICE_URL:
+        from job_service import JobClient
+        job = JobClient(JOB_SERVICE_URL).generate(
+            transcript_path, output_file, on_event=lambda event: print(event["event"], event.get("stage", ""))
+        )
+    else:
+        from deck_pipeline import generate_deck
+        job = generate_deck(transcript_path, output_file, progress=lambda stage, state, seconds: print(f"stage_{state}", stage))
+    print(f"Presentation saved to {output_file} ({sum(job['timings'].values()):.1f}s)")
 
 def main():
+    import sys
+    if len(sys.argv) > 1:
+        # python main.py meeting.docx
+        generate_transcript_deck(sys.argv[1])
+        return
+
     # Example usage with a CSV file
     data_file = 'sample_data.csv'  # Replace with actual data file path
-    import os
     data_file = os.path.join(os.path.dirname(__file__), 'CALE 2010 SH 042417.xls')
     if os.path.exists(data_file):
-        df = read_excel(data_file)
+        # Legacy .xls parsing is slow, so later runs read a memory-mapped Arrow copy
+        df = read_excel(data_file, use_cache=True)
     else:
         print(f"Data file not found: {data_file}")
         return
@@ -27,7 +58,8 @@ def main():
     # Create presentation
     prs = create_presentation()
     add_title_slide(prs, "Automated Slide Deck", "Generated from Data")
-    add_content_slide(prs, "Data Summary", summary.split("\\n"))
+    add_text_slides(prs, "Data Summary", summary.split("\\n"))
+    add_dataframe_chart_slides(prs, df)
     add_content_slide(prs, "AI Generated Insights", [slide_content])
 
     # Save presentation
@@ -0,0 +1,243 @@
+"""
+Process-wide registry for Hugging Face pipelines.
+Models are loaded lazily on first use, shared by every module, and evicted in
+least-recently-used order when the configured memory budget is exceeded.
+Fast tokenizers are not thread-safe, so code sharing a pipeline across threads
+holds pipeline_lock() while tokenizing or calling it.
+"""
+
+import logging
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+SUMMARIZATION_MODEL = "facebook/bart-large-cnn"
+ZERO_SHOT_MODEL = "facebook/bart-large-mnli"
+
+# Memory budget for resident models in megabytes; 0 disables eviction.
+DEFAULT_MEMORY_BUDGET_MB = float(os.environ.get("AUTODECK_MODEL_MEMORY_MB", "4096"))
+
+# Inference backend for the BART models when no dtype is given: fp32, int8 or onnx (see inference_backend)
+DEFAULT_BACKEND = os.environ.get("AUTODECK_INFERENCE_BACKEND") or None
+BACKEND_DTYPES = ("int8", "onnx")
+
+DEFAULT_MODELS = [
+    ("summarization", SUMMARIZATION_MODEL),
+    ("zero-shot-classification", ZERO_SHOT_MODEL),
+]
+
+logger = logging.getLogger(__name__)
+
+RegistryKey = Tuple[str, str, str, str]
+
+
+_pipeline_locks: "weakref.WeakKeyDictionary[object, threading.RLock]" = weakref.WeakKeyDictionary()
+_pipeline_locks_guard = threading.Lock()
+
+
+def pipeline_lock(pipe_or_tokenizer) -> threading.RLock:
+    """
+    Return the lock serializing use of a pipeline's tokenizer, given the pipeline or the tokenizer.
+    Pipelines sharing a tokenizer (e.g. a quantized copy) share the lock.
+    """
+    key = getattr(pipe_or_tokenizer, "tokenizer", None)
+    if key is None:
+        key = pipe_or_tokenizer
+    with _pipeline_locks_guard:
+        lock = _pipeline_locks.get(key)
+        if lock is None:
+            lock = _pipeline_locks[key] = threading.RLock()
+        return lock
+
+
+def _normalize_device(device) -> str:
+    if device is None or device == -1 or device == "cpu":
+        return "cpu"
+    return str(device)
+
+
+def _default_loader(task: str, model: str, device: str, dtype: Optional[str]):
+    """Build a transformers pipeline for the given key; dtype may also name an inference backend."""
+    if os.environ.get("AUTODECK_INTRA_OP_THREADS") or os.environ.get("AUTODECK_INTER_OP_THREADS"):
+        from inference_backend import configure_threads
+        configure_threads()
+    if dtype in BACKEND_DTYPES:
+        from inference_backend import load_pipeline
+        return load_pipeline(task, model, dtype)
+    from transformers import pipeline
+    kwargs = {"device": -1 if device == "cpu" else device}
+    if dtype is not None:
+        import torch
+        kwargs["torch_dtype"] = getattr(torch, dtype)
+    return pipeline(task, model=model, **kwargs)
+
+
+def estimate_model_bytes(pipe) -> int:
+    """Estimate the resident size of a pipeline from its parameters and buffers."""
+    model = getattr(pipe, "model", None)
+    if model is None or not hasattr(model, "parameters"):
+        return 0
+    size = sum(p.numel() * p.element_size() for p in model.parameters())
+    if hasattr(model, "buffers"):
+        size += sum(b.numel() * b.element_size() for b in model.buffers())
+    return size
+
+
+class ModelRegistry:
+    """
+    Thread-safe LRU cache of loaded pipelines keyed by (task, model, device, dtype).
+    """
+
+    def __init__(self, memory_budget_mb: Optional[float] = None, loader: Optional[Callable] = None):
+        self.memory_budget_mb = DEFAULT_MEMORY_BUDGET_MB if memory_budget_mb is None else memory_budget_mb
+        self._loader = loader or _default_loader
+        self._entries: "OrderedDict[RegistryKey, object]" = OrderedDict()
+        self._sizes: Dict[RegistryKey, int] = {}
+        self._lock = threading.Lock()
+        self._key_locks: Dict[RegistryKey, threading.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.load_time = 0.0
+        self.load_times: Dict[RegistryKey, float] = {}
+
+    def _key(self, task: str, model: str, device=-1, dtype: Optional[str] = None) -> RegistryKey:
+        # fp32 is what transformers loads by default
+        return (task, model, _normalize_device(device), "default" if dtype in (None, "fp32") else dtype)
+
+    def get(self, task: str, model: str, device=-1, dtype: Optional[str] = None):
+        """Return the pipeline for the key, loading it on first use."""
+        key = self._key(task, model, device, dtype)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # Load outside the registry lock so other models stay available, but
+        # serialize loads of the same key so weights are only read once.
+        with key_lock:
+            with self._lock:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return self._entries[key]
+                self.misses += 1
+            start = time.perf_counter()
+            pipe = self._loader(task, model, key[2], None if key[3] == "default" else key[3])
+            elapsed = time.perf_counter() - start
+            size = estimate_model_bytes(pipe)
+            logger.debug(f"Loaded {task}/{model} on {key[2]} in {elapsed:.2f}s ({size / 2**20:.0f} MB)")
+            with self._lock:
+                self._entries[key] = pipe
+                self._sizes[key] = size
+                self.load_time += elapsed
+                self.load_times[key] = elapsed
+                self._evict_over_budget(keep=key)
+            return pipe
+
+    def register(self, task: str, model: str, pipe, device=-1, dtype: Optional[str] = None):
+        """Install an already-built pipeline under the key, e.g. a local or stand-in model."""
+        key = self._key(task, model, device, dtype)
+        with self._lock:
+            self._entries[key] = pipe
+            self._entries.move_to_end(key)
+            self._sizes[key] = estimate_model_bytes(pipe)
+            self._evict_over_budget(keep=key)
+
+    def _evict_over_budget(self, keep: RegistryKey):
+        if not self.memory_budget_mb:
+            return
+        budget = self.memory_budget_mb * 2**20
+        while sum(self._sizes.values()) > budget:
+            victim = next((k for k in self._entries if k != keep), None)
+            if victim is None:
+                logger.warning(f"Model {keep[1]} alone exceeds the memory budget of {self.memory_budget_mb} MB")
+                return
+            self._drop(victim)
+            self.evictions += 1
+
+    def _drop(self, key: RegistryKey):
+        self._entries.pop(key, None)
+        self._sizes.pop(key, None)
+        logger.debug(f"Evicted {key[0]}/{key[1]} from model registry")
+
+    def warm_up(self, specs: Optional[Iterable[Tuple[str, str]]] = None, device=-1, dtype: Optional[str] = None):
+        """Eagerly load the given (task, model) pairs, defaulting to every model the pipeline uses."""
+        for task, model in (specs or DEFAULT_MODELS):
+            self.get(task, model, device=device, dtype=dtype)
+
+    def set_memory_budget(self, memory_budget_mb: float):
+        """Change the memory budget and evict models that no longer fit."""
+        with self._lock:
+            self.memory_budget_mb = memory_budget_mb
+            if self._entries:
+                self._evict_over_budget(keep=next(reversed(self._entries)))
+
+    def evict(self, task: str, model: str, device=-1, dtype: Optional[str] = None):
+        """Remove a single pipeline from the registry."""
+        with self._lock:
+            self._drop(self._key(task, model, device, dtype))
+
+    def clear(self):
+        """Drop every loaded pipeline."""
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+
+    def __contains__(self, key) -> bool:
+        return self._key(*key) in self._entries
+
+    def stats(self) -> Dict[str, object]:
+        """Return hit/miss/eviction counters, cumulative load time and resident size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "load_time_s": self.load_time,
+                "resident_mb": sum(self._sizes.values()) / 2**20,
+                "models": ["/".join(k) for k in self._entries],
+            }
+
+
+_registry = ModelRegistry()
+
+
+def get_registry() -> ModelRegistry:
+    """Return the process-wide model registry."""
+    return _registry
+
+
+def get_pipeline(task: str, model: str, device=-1, dtype: Optional[str] = None):
+    """Return a shared pipeline from the process-wide registry."""
+    return _registry.get(task, model, device=device, dtype=dtype)
+
+
+def default_model_id(model: str) -> str:
+    """
+    Inference cache name of model as loaded by default, suffixed with DEFAULT_BACKEND when
+    it isn't fp32 like inference_cache.model_id does for a loaded pipeline.
+    """
+    return f"{model}@{DEFAULT_BACKEND}" if DEFAULT_BACKEND not in (None, "fp32") else model
+
+
+def get_summarizer(device=-1, dtype: Optional[str] = None):
+    """Return the shared BART summarization pipeline, using DEFAULT_BACKEND when dtype is None."""
+    return get_pipeline("summarization", SUMMARIZATION_MODEL, device=device, dtype=dtype or DEFAULT_BACKEND)
+
+
+def get_zero_shot_classifier(device=-1, dtype: Optional[str] = None):
+    """Return the shared BART zero-shot classification pipeline, using DEFAULT_BACKEND when dtype is None."""
+    return get_pipeline("zero-shot-classification", ZERO_SHOT_MODEL, device=device, dtype=dtype or DEFAULT_BACKEND)
+
+
+def warm_up(specs: Optional[Iterable[Tuple[str, str]]] = None, device=-1, dtype: Optional[str] = None):
+    """Load models ahead of the first request."""
+    _registry.warm_up(specs, device=device, dtype=dtype or DEFAULT_BACKEND)
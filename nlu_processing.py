@@ -3,9 +3,15 @@ Module for Natural Language Understanding (NLU) to parse and segment meeting tra
 Uses Hugging Face transformers for semantic segmentation and classification.
 """
 
-from typing import Dict, List
-from transformers import pipeline
-import torch
+from itertools import islice
+from typing import Dict, Iterable, List, Optional
+
+from incremental import fingerprint
+from inference_cache import InferenceCache, cached_map, model_id
+from model_registry import ZERO_SHOT_MODEL, get_zero_shot_classifier, pipeline_lock
+from segmentation import TokenBudgetSegmenter, split_units
+import tracing
+from tracing import traced
 
 # Define categories for segmentation
 CATEGORIES = [
@@ -16,24 +22,199 @@ CATEGORIES = [
     "Suggested Next Steps"
 ]
 
+# Same template the zero-shot pipeline uses to build NLI hypotheses
+HYPOTHESIS_TEMPLATE = "This example is {}."
+
+DEFAULT_BATCH_SIZE = 16
+
+# Number of streamed segments classified together by segment_stream
+DEFAULT_STREAM_CHUNK = 64
+
+# Segments also end after about 1 in this many paragraphs, chosen by content, so an edit to a
+# transcript only repacks nearby segments and the rest keep labels reusable by regenerate_deck
+DEFAULT_ANCHOR_UNITS = 8
+
+# Fast-classifier probability below which a segment is escalated to the NLI model
+DEFAULT_CONFIDENCE_THRESHOLD = 0.8
+
 class TranscriptNLU:
-    def __init__(self):
-        # Use zero-shot-classification pipeline for flexible category assignment
-        self.classifier = pipeline("zero-shot-classification", model="facebook/bart-large-mnli")
+    def __init__(
+        self,
+        classifier=None,
+        batch_size: Optional[int] = DEFAULT_BATCH_SIZE,
+        cache: Optional[InferenceCache] = None,
+        max_tokens: Optional[int] = None,
+        fast_classifier=None,
+        confidence_threshold: float = DEFAULT_CONFIDENCE_THRESHOLD,
+        anchor_units: Optional[int] = DEFAULT_ANCHOR_UNITS,
+    ):
+        # Use zero-shot-classification pipeline for flexible category assignment;
+        # the pipeline is shared through the model registry across instances
+        self.classifier = classifier or get_zero_shot_classifier()
+        # Number of (segment, label) pairs per forward pass; None or 0 classifies one segment at a time
+        self.batch_size = batch_size
+        # Labels are looked up in the on-disk inference cache first (the default cache when None)
+        self.cache = cache
+        # Segments are packed up to the classifier's input length (less the hypothesis) unless a smaller budget is given
+        self.max_tokens = max_tokens or self._max_premise_tokens()
+        self.segmentation_stats: Dict[str, int] = {}
+        # See TokenBudgetSegmenter; None packs segments purely by token budget
+        self.anchor_units = anchor_units
+        # Optional cheap first stage (see fast_classifier); only low-confidence segments reach the NLI model
+        self.fast_classifier = fast_classifier
+        self.confidence_threshold = confidence_threshold
+        self.cascade_stats: Dict[str, float] = {}
+        self.reset_cascade_stats()
+
+    def reset_cascade_stats(self):
+        self.cascade_stats = {"segments": 0, "escalated": 0, "escalation_rate": 0.0}
+
+    def _max_premise_tokens(self) -> Optional[int]:
+        tokenizer = getattr(self.classifier, "tokenizer", None)
+        if tokenizer is None or not tokenizer.model_max_length or tokenizer.model_max_length > 100000:
+            return None
+        with pipeline_lock(tokenizer):
+            hypothesis_tokens = max(
+                len(tokenizer(HYPOTHESIS_TEMPLATE.format(label), add_special_tokens=False)["input_ids"])
+                for label in CATEGORIES
+            )
+        return tokenizer.model_max_length - hypothesis_tokens - tokenizer.num_special_tokens_to_add(pair=True)
 
-    def segment_transcript(self, transcript: str) -> Dict[str, List[str]]:
+    def classify_segments(self, segments: List[str]) -> List[str]:
+        """
+        Return the top category for each segment.
+        With a fast classifier, segments it labels below confidence_threshold are escalated to NLI.
+        """
+        if self.fast_classifier is None:
+            return self.classify_nli(segments)
+
+        labels, confidences = self.fast_classifier.predict(segments)
+        escalated = [i for i, confidence in enumerate(confidences) if confidence < self.confidence_threshold]
+        for i, label in zip(escalated, self.classify_nli([segments[i] for i in escalated])):
+            labels[i] = label
+
+        stats = self.cascade_stats
+        stats["segments"] += len(segments)
+        stats["escalated"] += len(escalated)
+        stats["escalation_rate"] = stats["escalated"] / stats["segments"] if stats["segments"] else 0.0
+        return labels
+
+    def evaluate_cascade(self, segments: List[str]) -> Dict[str, float]:
+        """
+        Compare cascade labels with NLI-only labels for the given segments.
+        """
+        nli_labels = self.classify_nli(segments)
+        before = dict(self.cascade_stats)
+        self.reset_cascade_stats()
+        cascade_labels = self.classify_segments(segments)
+        report = {
+            "segments": len(segments),
+            "escalation_rate": self.cascade_stats["escalation_rate"],
+            "agreement": sum(a == b for a, b in zip(cascade_labels, nli_labels)) / len(segments) if segments else 1.0,
+        }
+        self.cascade_stats = before
+        return report
+
+    def classify_nli(self, segments: List[str]) -> List[str]:
+        """
+        Return the zero-shot NLI label for each segment, reusing cached labels where available.
+        """
+        params = {
+            "task": "zero-shot-classification",
+            "candidate_labels": CATEGORIES,
+            "hypothesis_template": HYPOTHESIS_TEMPLATE,
+        }
+        return cached_map(
+            model_id(self.classifier, ZERO_SHOT_MODEL), params, segments, self._classify_uncached, self.cache
+        )
+
+    def _classify_uncached(self, segments: List[str]) -> List[str]:
+        if not segments:
+            return []
+        with tracing.span("zero_shot_classification", "model", segments=len(segments)):
+            if self.batch_size and hasattr(self.classifier, "model") and hasattr(self.classifier, "tokenizer"):
+                return self._classify_batched(segments)
+            tracing.record(model_calls=len(segments))
+            with pipeline_lock(self.classifier):
+                return [self.classifier(segment, candidate_labels=CATEGORIES)['labels'][0] for segment in segments]
+
+    def _classify_batched(self, segments: List[str]) -> List[str]:
+        """
+        Run every segment x label NLI pair through the model in length-sorted batches.
+        Scores are combined exactly like the zero-shot pipeline, so labels match the per-segment path.
+        """
+        import torch
+        tokenizer = self.classifier.tokenizer
+        model = self.classifier.model
+        hypotheses = [HYPOTHESIS_TEMPLATE.format(label) for label in CATEGORIES]
+        premises = [segment for segment in segments for _ in hypotheses]
+        # The shared fast tokenizer is not thread-safe; the model forward passes are
+        lock = pipeline_lock(tokenizer)
+        with lock:
+            encodings = tokenizer(premises, hypotheses * len(segments), truncation="only_first")
+
+        # Sorting by length keeps similarly sized pairs together so each batch pads very little
+        order = sorted(range(len(premises)), key=lambda i: len(encodings["input_ids"][i]))
+        entailment_id = self.classifier.entailment_id
+        entail_logits = torch.empty(len(premises))
+        with torch.no_grad():
+            for start in range(0, len(order), self.batch_size):
+                batch_ids = order[start:start + self.batch_size]
+                with lock:
+                    batch = tokenizer.pad(
+                        {key: [encodings[key][i] for i in batch_ids] for key in ("input_ids", "attention_mask")},
+                        return_tensors="pt",
+                    )
+                batch = {key: value.to(model.device) for key, value in batch.items()}
+                logits = model(**batch).logits
+                entail_logits[batch_ids] = logits[:, entailment_id].float().cpu()
+                tracing.record(model_calls=1, tokens_in=int(batch["attention_mask"].sum()))
+
+        scores = entail_logits.view(len(segments), len(CATEGORIES)).softmax(-1).numpy()
+        # The pipeline ranks labels with a reversed argsort; take its first entry
+        return [CATEGORIES[row.argsort()[-1]] for row in scores]
+
+    @traced()
+    def segment_transcript(self, transcript: str, labels: Optional[Dict[str, str]] = None) -> Dict[str, List[str]]:
         """
         Segment the transcript into logical categories.
         Returns a dictionary mapping category to list of text segments.
         """
-        segments = transcript.split("\\n\\n")  # naive paragraph split
-        categorized_segments = {cat: [] for cat in CATEGORIES}
+        return self.segment_stream(split_units(transcript), labels=labels)
 
-        for segment in segments:
-            if not segment.strip():
-                continue
-            result = self.classifier(segment, candidate_labels=CATEGORIES)
-            top_label = result['labels'][0]
-            categorized_segments[top_label].append(segment.strip())
+    def segment_stream(
+        self, units: Iterable[str], chunk_size: int = DEFAULT_STREAM_CHUNK, labels: Optional[Dict[str, str]] = None
+    ) -> Dict[str, List[str]]:
+        """
+        Categorize paragraphs or speaker turns from any iterable, e.g. transcript_ingestion.iter_transcript.
+        Units are packed into segments that fit the classifier, which are classified chunk_size at a time;
+        per-transcript packing and cascade statistics are left in self.segmentation_stats and self.cascade_stats.
+        labels, if given, maps segment fingerprints (see incremental) to labels from an earlier run: those
+        segments are not classified again, and labels is left holding exactly this run's labels. Segments
+        end at content anchors (see anchor_units), so editing a paragraph only changes the segments near it.
+        """
+        categorized_segments = {cat: [] for cat in CATEGORIES}
+        segmenter = TokenBudgetSegmenter(getattr(self.classifier, "tokenizer", None), self.max_tokens, anchor_every=self.anchor_units)
+        self.segmentation_stats = segmenter.stats
+        self.segmentation_stats["labels_reused"] = 0
+        self.reset_cascade_stats()
+        known = dict(labels) if labels is not None else {}
+        used: Dict[str, str] = {}
+        segments = segmenter.segment(units)
+        while True:
+            chunk = list(islice(segments, chunk_size))
+            if not chunk:
+                break
+            keys = [fingerprint(segment) for segment in chunk]
+            missing = [segment for segment, key in zip(chunk, keys) if key not in known]
+            self.segmentation_stats["labels_reused"] += len(chunk) - len(missing)
+            for segment, top_label in zip(missing, self.classify_segments(missing) if missing else []):
+                known[fingerprint(segment)] = top_label
+            for segment, key in zip(chunk, keys):
+                used[key] = known[key]
+                categorized_segments[used[key]].append(segment)
 
+        if labels is not None:
+            labels.clear()
+            labels.update(used)
         return categorized_segments
@@ -1,38 +1,100 @@
 """
 Module for dynamic phase planning using semantic analysis and clustering.
+Phase texts are embedded as sparse TF-IDF vectors and grouped with mini-batch
+k-means; the number of phases can be chosen automatically with a sampled
+silhouette score, titles come from the top centroid terms and descriptions
+from the items closest to each centroid.
 """
 
-from typing import List, Dict
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.cluster import KMeans
+from typing import Dict, List, Optional, Tuple
 
-def plan_phases(phase_texts: List[str], num_phases: int = 4) -> List[Dict[str, str]]:
+from tracing import traced
+
+DEFAULT_K_RANGE = (2, 8)
+SILHOUETTE_SAMPLE = 1000
+DESCRIPTION_CHARS = 200
+
+def _cluster(X, k: int, seed: int):
+    from sklearn.cluster import MiniBatchKMeans
+    kmeans = MiniBatchKMeans(
+        n_clusters=k, random_state=seed, n_init=3, batch_size=min(1024, X.shape[0]), max_iter=200
+    )
+    return kmeans.fit(X)
+
+def choose_num_phases(X, k_range: Tuple[int, int], seed: int, sample_size: int = SILHOUETTE_SAMPLE):
+    """
+    Fit k-means for every k in k_range and keep the fit (a MiniBatchKMeans) with the best sampled cosine silhouette.
     """
-    Cluster phase texts into num_phases clusters and generate high-level phase titles and descriptions.
+    import numpy as np
+    from sklearn.metrics import silhouette_score
+    n = X.shape[0]
+    best, best_score = None, -np.inf
+    for k in range(max(2, k_range[0]), min(k_range[1], n - 1) + 1):
+        kmeans = _cluster(X, k, seed)
+        if len(set(kmeans.labels_)) < 2:
+            continue
+        score = silhouette_score(X, kmeans.labels_, metric='cosine', sample_size=min(sample_size, n), random_state=seed)
+        if score > best_score:
+            best, best_score = kmeans, score
+    return best
+
+@traced()
+def plan_phases(
+    phase_texts: List[str],
+    num_phases: Optional[int] = None,
+    k_range: Tuple[int, int] = DEFAULT_K_RANGE,
+    seed: int = 42,
+    title_terms: int = 2,
+) -> List[Dict[str, object]]:
+    """
+    Cluster phase texts into phases and generate phase titles, descriptions and activities.
+    num_phases fixes the number of clusters; when None it is chosen within k_range.
+    Phases are ordered by where their items first appear in phase_texts.
     """
     if not phase_texts:
         return []
 
-    # Vectorize texts
-    vectorizer = TfidfVectorizer(stop_words='english')
-    # Concatenate title and description for clustering
-    combined_texts = [text for text in phase_texts]
-    X = vectorizer.fit_transform(combined_texts)
+    import numpy as np
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    vectorizer = TfidfVectorizer(stop_words='english', sublinear_tf=True)
+    try:
+        X = vectorizer.fit_transform(phase_texts)
+    except ValueError:
+        # Nothing but stop words: keep the texts as a single phase
+        return [{"title": "Phase 1", "description": phase_texts[0][:DESCRIPTION_CHARS], "activities": list(phase_texts)}]
+    terms = vectorizer.get_feature_names_out()
 
-    # Cluster
-    n_clusters = min(num_phases, len(phase_texts))
-    kmeans = KMeans(n_clusters=n_clusters, random_state=42)
-    kmeans.fit(X)
+    n = len(phase_texts)
+    if num_phases is not None:
+        kmeans = _cluster(X, min(num_phases, n), seed)
+    else:
+        kmeans = choose_num_phases(X, k_range, seed) if n > 2 else None
+        kmeans = kmeans or _cluster(X, min(n, max(1, k_range[0])), seed)
 
-    clusters = {i: [] for i in range(n_clusters)}
-    for idx, label in enumerate(kmeans.labels_):
-        clusters[label].append(phase_texts[idx])
+    labels = kmeans.labels_
+    centroids = kmeans.cluster_centers_
+    # TF-IDF rows are L2-normalized, so the dot product ranks items by closeness to the centroid
+    closeness = np.asarray(X.multiply(centroids[labels]).sum(axis=1)).ravel()
+
+    clusters = [np.flatnonzero(labels == c) for c in range(len(centroids))]
+    clusters = sorted((members for members in clusters if len(members)), key=lambda members: members.min())
 
-    # Generate phase summaries (simple concatenation or first item)
     phases = []
-    for i in range(n_clusters):
-        title = f"Phase {i+1}"
-        description = " ".join(clusters[i])[:200]  # limit description length
-        phases.append({"title": title, "description": description})
+    used_terms = set()
+    for i, members in enumerate(clusters):
+        centroid = centroids[labels[members[0]]]
+        ranked_terms = [terms[t] for t in np.argsort(-centroid) if centroid[t] > 0]
+        fresh_terms = [term for term in ranked_terms if term not in used_terms] or ranked_terms
+        top_terms = fresh_terms[:title_terms]
+        used_terms.update(top_terms)
+        title = f"Phase {i+1}: " + " & ".join(term.title() for term in top_terms) if top_terms else f"Phase {i+1}"
+
+        representatives = [phase_texts[j] for j in sorted(members, key=lambda j: (-closeness[j], j))]
+        description = representatives[0]
+        for text in representatives[1:]:
+            if len(description) + len(text) + 2 > DESCRIPTION_CHARS:
+                break
+            description = f"{description}; {text}"
+        phases.append({"title": title, "description": description, "activities": representatives})
 
     return phases
@@ -0,0 +1,67 @@
+"""
+Background preloading for server mode.
+Entry points and pipeline modules import heavy dependencies (torch,
+transformers, sklearn, pptx, pandas, sqlalchemy) only inside the stages that
+need them, so command-line tools and data-only paths start quickly. A
+long-running server can instead start the preloader at startup: it imports
+those dependencies and loads the models in a daemon thread while the server is
+already accepting requests, and the first request waits only for whatever is
+still loading.
+"""
+
+import importlib
+import logging
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+HEAVY_MODULES = (
+    "torch",
+    "transformers",
+    "pandas",
+    "sqlalchemy",
+    "sklearn.cluster",
+    "sklearn.feature_extraction.text",
+    "sklearn.metrics",
+    "pptx",
+)
+
+logger = logging.getLogger(__name__)
+
+# Seconds spent per module (and "models") by the most recent preload
+preload_timings: Dict[str, float] = {}
+
+def preload(modules: Iterable[str] = HEAVY_MODULES, warm_models: bool = True) -> Dict[str, float]:
+    """Import the modules and optionally load the pipeline's models; returns seconds per step."""
+    timings = {}
+    for name in modules:
+        start = time.perf_counter()
+        try:
+            importlib.import_module(name)
+        except ImportError as e:
+            logger.warning(f"Preloading {name} failed: {e}")
+            continue
+        timings[name] = time.perf_counter() - start
+    if warm_models:
+        from model_registry import warm_up
+        start = time.perf_counter()
+        try:
+            warm_up()
+        except Exception as e:
+            logger.warning(f"Preloading models failed: {type(e).__name__}: {e}")
+        else:
+            timings["models"] = time.perf_counter() - start
+    preload_timings.clear()
+    preload_timings.update(timings)
+    logger.info(f"Preloaded {', '.join(timings)} in {sum(timings.values()):.1f}s")
+    return timings
+
+_preloader: Optional[threading.Thread] = None
+
+def start_preloader(modules: Iterable[str] = HEAVY_MODULES, warm_models: bool = True) -> threading.Thread:
+    """Run preload in a daemon thread, once per process, and return the thread."""
+    global _preloader
+    if _preloader is None:
+        _preloader = threading.Thread(target=preload, args=(tuple(modules), warm_models), daemon=True, name="autodeck-preloader")
+        _preloader.start()
+    return _preloader
@@ -0,0 +1,147 @@
+"""
+Module for splitting transcripts into segments that fit a model's input length.
+Paragraphs and speaker turns are packed greedily into token-budgeted windows;
+units longer than the budget are split on sentence and then token boundaries,
+so no text is dropped or silently truncated by the model.
+"""
+
+import re
+import zlib
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from model_registry import pipeline_lock
+from transcript_ingestion import group_speaker_turns
+
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+")
+SEGMENT_SEPARATOR = "\n\n"
+
+# Word budget used when no tokenizer is available
+DEFAULT_MAX_TOKENS = 400
+
+def split_units(text: str) -> List[str]:
+    """
+    Split a transcript into paragraphs and speaker turns on real line breaks.
+    """
+    return list(group_speaker_turns(text.splitlines()))
+
+class TokenBudgetSegmenter:
+    """
+    Greedy packer of text units into segments of at most max_tokens tokens.
+    With anchor_every, a unit also closes its segment when its content hash falls on
+    1 in anchor_every, so segment boundaries depend on nearby text only: inserting or
+    editing a unit repacks the segments up to the next anchor and leaves the rest unchanged.
+    """
+
+    def __init__(
+        self, tokenizer=None, max_tokens: Optional[int] = None, separator: str = SEGMENT_SEPARATOR,
+        anchor_every: Optional[int] = None,
+    ):
+        self.tokenizer = tokenizer
+        self.max_tokens = max_tokens or DEFAULT_MAX_TOKENS
+        self.separator = separator
+        self.anchor_every = anchor_every
+        self.count: Callable[[str], int] = self._count_tokens if tokenizer is not None else self._count_words
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.stats: Dict[str, int] = {
+            "units": 0,
+            "split_units": 0,
+            "segments": 0,
+            "tokens": 0,
+            "tokens_truncated": 0,
+        }
+
+    def _count_tokens(self, text: str) -> int:
+        with pipeline_lock(self.tokenizer):
+            return len(self.tokenizer(text, add_special_tokens=False)["input_ids"])
+
+    def count_joined(self, text: str) -> int:
+        """
+        Tokens text adds when appended after the separator. Counted in context because a
+        byte-level BPE tokenizer folds the separator's whitespace into the following tokens,
+        so the joined text isn't the sum of its parts.
+        """
+        if self.tokenizer is None:
+            return self.count(text)
+        return self.count(self.separator + text)
+
+    @staticmethod
+    def _count_words(text: str) -> int:
+        return len(text.split())
+
+    def is_anchor(self, unit: str) -> bool:
+        return bool(self.anchor_every) and zlib.crc32(unit.encode("utf-8")) % self.anchor_every == 0
+
+    def segment(self, units: Iterable[str]) -> Iterator[str]:
+        """
+        Yield packed segments for a stream of units, updating self.stats as it goes.
+        """
+        window: List[str] = []
+        window_tokens = 0
+        for unit in units:
+            unit = unit.strip()
+            if not unit:
+                continue
+            self.stats["units"] += 1
+            tokens = self.count(unit)
+            pieces = [(unit, tokens)]
+            if tokens > self.max_tokens:
+                self.stats["split_units"] += 1
+                pieces = [(piece, self.count(piece)) for piece in self._split_oversized(unit)]
+            for piece, piece_tokens in pieces:
+                needed = self.count_joined(piece) if window else piece_tokens
+                if window and window_tokens + needed > self.max_tokens:
+                    yield self._emit(window)
+                    window, window_tokens, needed = [], 0, piece_tokens
+                window.append(piece)
+                window_tokens += needed
+            if self.is_anchor(unit):
+                yield self._emit(window)
+                window, window_tokens = [], 0
+        if window:
+            yield self._emit(window)
+
+    def _emit(self, window: List[str]) -> str:
+        segment = self.separator.join(window)
+        tokens = self.count(segment)
+        self.stats["segments"] += 1
+        self.stats["tokens"] += tokens
+        self.stats["tokens_truncated"] += max(0, tokens - self.max_tokens)
+        return segment
+
+    def _split_oversized(self, unit: str) -> List[str]:
+        """Split a unit on sentence boundaries, cutting sentences that alone exceed the budget."""
+        pieces: List[str] = []
+        current = ""
+        for sentence in SENTENCE_BOUNDARY.split(unit):
+            if self.count(sentence) > self.max_tokens:
+                if current:
+                    pieces.append(current)
+                    current = ""
+                pieces.extend(self.split_tokens(sentence))
+                continue
+            candidate = f"{current} {sentence}" if current else sentence
+            if current and self.count(candidate) > self.max_tokens:
+                pieces.append(current)
+                candidate = sentence
+            current = candidate
+        if current:
+            pieces.append(current)
+        return pieces
+
+    def split_tokens(self, text: str) -> List[str]:
+        """Cut text into windows of max_tokens tokens at token (or word) boundaries."""
+        if self.tokenizer is None or not getattr(self.tokenizer, "is_fast", False):
+            words = text.split()
+            return [" ".join(words[i:i + self.max_tokens]) for i in range(0, len(words), self.max_tokens)]
+        with pipeline_lock(self.tokenizer):
+            offsets = self.tokenizer(text, add_special_tokens=False, return_offsets_mapping=True)["offset_mapping"]
+        pieces = []
+        for start in range(0, len(offsets), self.max_tokens):
+            window = offsets[start:start + self.max_tokens]
+            end = offsets[start + self.max_tokens][0] if start + self.max_tokens < len(offsets) else len(text)
+            piece = text[window[0][0]:end].strip()
+            if piece:
+                pieces.append(piece)
+        return pieces
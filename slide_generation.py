@@ -3,15 +3,41 @@ Functions to create and manipulate PowerPoint presentations using python-pptx.
 Extended to implement strict slide template with placeholders for logos and visuals.
 """
 
-from pptx import Presentation
-from pptx.util import Inches, Pt
-from pptx.enum.text import PP_ALIGN
-from pptx.dml.color import RGBColor
+import io
+
+from tracing import traced
+
+# python-pptx is imported on first use so importing this module stays cheap
 
 def create_presentation():
+    from pptx import Presentation
     prs = Presentation()
     return prs
 
+def open_presentation(path):
+    from pptx import Presentation
+    return Presentation(path)
+
+def delete_slide(prs, index):
+    """Remove the slide at index; its part is dropped from the package on save."""
+    slide_ids = prs.slides._sldIdLst
+    slide_id = slide_ids[index]
+    prs.part.drop_rel(slide_id.rId)
+    slide_ids.remove(slide_id)
+
+def move_slide(prs, old_index, new_index):
+    slide_ids = prs.slides._sldIdLst
+    slide_id = slide_ids[old_index]
+    slide_ids.remove(slide_id)
+    slide_ids.insert(new_index, slide_id)
+
+def renumber_slides(prs):
+    """Name slide parts after their position, as a freshly built presentation does."""
+    from pptx.opc.packuri import PackURI
+    for number, slide in enumerate(prs.slides, start=1):
+        slide.part.partname = PackURI(f"/ppt/slides/slide{number}.xml")
+
+@traced()
 def add_cover_slide(prs, client_name, project_name="Proposal"):
     slide_layout = prs.slide_layouts[0]
     slide = prs.slides.add_slide(slide_layout)
@@ -19,12 +45,14 @@ def add_cover_slide(prs, client_name, project_name="Proposal"):
     slide.placeholders[1].text = f"Proposal for {project_name}"
     # Placeholder for logo can be added here
 
+@traced()
 def add_title_slide(prs, title, subtitle):
     slide_layout = prs.slide_layouts[0]
     slide = prs.slides.add_slide(slide_layout)
     slide.shapes.title.text = title
     slide.placeholders[1].text = subtitle
 
+@traced()
 def add_content_slide(prs, title, bullet_points):
     slide_layout = prs.slide_layouts[1]
     slide = prs.slides.add_slide(slide_layout)
@@ -36,6 +64,7 @@ def add_content_slide(prs, title, bullet_points):
         p.text = point
         p.level = 0
 
+@traced()
 def add_horizontal_roadmap_slide(prs, title, phases):
     """
     Add a slide with a horizontal roadmap layout showing phases with titles and descriptions.
@@ -44,6 +73,7 @@ def add_horizontal_roadmap_slide(prs, title, phases):
     slide = prs.slides.add_slide(slide_layout)
     slide.shapes.title.text = title
 
+    from pptx.util import Inches
     shapes = slide.shapes
     left = Inches(0.5)
     top = Inches(1.5)
@@ -60,5 +90,138 @@ def add_horizontal_roadmap_slide(prs, title, phases):
         p.text = f"{title}: {desc}"
         p.level = 0
 
+# Chart frame below the title on a 10 x 7.5 inch slide, in inches (left, top, width, height)
+CHART_FRAME = (0.5, 1.5, 9.0, 5.5)
+TEXT_FONT_SIZE = 18
+# Inset of the body text from its placeholder edges and the bullet indent, in points
+TEXT_INSET_PT = 36
+
+def _add_chart_slide(prs, title, chart_type, chart_data):
+    from pptx.util import Inches
+    slide = prs.slides.add_slide(prs.slide_layouts[5])  # Title Only
+    slide.shapes.title.text = title
+    left, top, width, height = (Inches(v) for v in CHART_FRAME)
+    return slide.shapes.add_chart(chart_type, left, top, width, height, chart_data).chart
+
+def _add_category_chart_slide(prs, title, series_name, labels, values, number_format="General"):
+    from pptx.chart.data import CategoryChartData
+    from pptx.enum.chart import XL_CHART_TYPE
+    chart_data = CategoryChartData(number_format=number_format)
+    chart_data.categories = labels
+    chart_data.add_series(series_name, values)
+    chart = _add_chart_slide(prs, title, XL_CHART_TYPE.COLUMN_CLUSTERED, chart_data)
+    chart.has_legend = False
+    return chart
+
+@traced()
+def add_line_chart_slide(prs, title, df, x=None, columns=None, max_points=None):
+    """
+    Add a line chart of the numeric columns of df (default: all of them) against column x,
+    or the index when x is None. Each series is downsampled to at most max_points points
+    with LTTB, so the chart stays small however many rows df has.
+    """
+    from pptx.chart.data import XyChartData
+    from pptx.enum.chart import XL_CHART_TYPE
+    from chart_data import MAX_CHART_POINTS, downsample_series, numeric_axis
+
+    x_values = df.index.to_series() if x is None else df[x]
+    xs, is_date = numeric_axis(x_values)
+    columns = columns or [c for c in df.select_dtypes("number").columns if c != x]
+    chart_data = XyChartData()
+    for column in columns:
+        series = chart_data.add_series(str(column))
+        for px, py in zip(*downsample_series(xs, df[column].reset_index(drop=True), max_points or MAX_CHART_POINTS)):
+            series.add_data_point(px, py)
+    chart = _add_chart_slide(prs, title, XL_CHART_TYPE.XY_SCATTER_LINES_NO_MARKERS, chart_data)
+    chart.has_legend = len(columns) > 1
+    if is_date:
+        chart.category_axis.tick_labels.number_format = "yyyy-mm-dd"
+        chart.category_axis.tick_labels.number_format_is_linked = False
+    return chart
+
+@traced()
+def add_bar_chart_slide(prs, title, df, category, value, top_n=None):
+    """Add a bar chart of value summed per category, showing the top_n categories and "Other"."""
+    from chart_data import DEFAULT_TOP_N, top_values
+    labels, totals = top_values(df, category, value, top_n or DEFAULT_TOP_N)
+    return _add_category_chart_slide(prs, title, str(value), labels, totals)
+
+@traced()
+def add_histogram_slide(prs, title, values, bins=None):
+    """Add a histogram of a numeric column, binned with NumPy."""
+    from chart_data import DEFAULT_BINS, histogram
+    labels, counts = histogram(values, bins or DEFAULT_BINS)
+    return _add_category_chart_slide(prs, title, str(values.name or "count"), labels, counts, number_format="0")
+
+@traced()
+def add_top_categories_slide(prs, title, values, top_n=None):
+    """Add a bar chart of the most frequent values of a column, with the rest counted as "Other"."""
+    from chart_data import DEFAULT_TOP_N, top_categories
+    labels, counts = top_categories(values, top_n or DEFAULT_TOP_N)
+    return _add_category_chart_slide(prs, title, str(values.name or "count"), labels, counts, number_format="0")
+
+@traced()
+def add_dataframe_chart_slides(prs, df, max_charts=6):
+    """
+    Add one chart per column of df, up to max_charts: a line chart of numeric columns over the
+    first datetime column if there is one, a histogram per numeric column and a top-N bar chart
+    per text or categorical column. Returns the number of slides added.
+    """
+    import pandas as pd
+    added = 0
+    dates = [c for c in df.columns if pd.api.types.is_datetime64_any_dtype(df[c])]
+    numeric = [c for c in df.select_dtypes("number").columns if not pd.api.types.is_bool_dtype(df[c])]
+    if dates and numeric:
+        add_line_chart_slide(prs, f"{', '.join(map(str, numeric[:3]))} over {dates[0]}", df, x=dates[0], columns=numeric[:3])
+        added += 1
+    for column in df.columns:
+        if added >= max_charts:
+            break
+        if column in numeric:
+            add_histogram_slide(prs, f"Distribution of {column}", df[column])
+        elif column not in dates and df[column].notna().any():
+            add_top_categories_slide(prs, f"Most common {column}", df[column])
+        else:
+            continue
+        added += 1
+    return added
+
+def _text_box_points(prs):
+    # Body placeholder of the Title and Content layout, less insets and the bullet indent
+    body = prs.slide_layouts[1].placeholders[1]
+    return body.width / 12700 - TEXT_INSET_PT, body.height / 12700 - TEXT_INSET_PT / 2
+
+@traced()
+def add_text_slides(prs, title, paragraphs, font_size=TEXT_FONT_SIZE):
+    """
+    Add bullet paragraphs across as many content slides as they need at font_size, using
+    measured text widths to decide where each slide is full. Continuation slides are
+    titled "<title> (cont.)". Returns the number of slides added.
+    """
+    from pptx.util import Pt
+    from text_layout import paginate
+    width, height = _text_box_points(prs)
+    pages = paginate([p for p in paragraphs if p.strip()], width, height, font_size) or [[]]
+    for number, page in enumerate(pages):
+        slide = prs.slides.add_slide(prs.slide_layouts[1])
+        slide.shapes.title.text = title if number == 0 else f"{title} (cont.)"
+        text_frame = slide.placeholders[1].text_frame
+        text_frame.clear()
+        for i, paragraph in enumerate(page):
+            # clear() leaves one empty paragraph; use it rather than leave a blank first line
+            p = text_frame.paragraphs[0] if i == 0 else text_frame.add_paragraph()
+            p.text = paragraph
+            p.level = 0
+            p.font.size = Pt(font_size)
+    return len(pages)
+
+@traced()
 def save_presentation(prs, file_path):
     prs.save(file_path)
+
+@traced()
+def presentation_bytes(prs) -> bytes:
+    """Serialize the presentation to .pptx bytes without touching the filesystem."""
+    buffer = io.BytesIO()
+    prs.save(buffer)
+    return buffer.getvalue()
@@ -0,0 +1,270 @@
+"""
+Dependency-aware stage scheduler.
+A StageGraph declares pipeline stages and the named results they consume; run()
+starts every stage as soon as its inputs are ready, so independent stages run
+concurrently on a thread pool (torch releases the GIL during inference). The
+CPU thread budget is divided between the model stages that can run at once:
+each reserves its share from a process-wide budget and runs with torch's
+intra-op threads set to that share, so parallel model calls don't oversubscribe
+cores. After a run, report() gives per-stage timings
+and the critical path.
+"""
+
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional
+
+# CPU threads shared by every running model stage in the process
+DEFAULT_THREAD_BUDGET = int(os.environ.get("AUTODECK_THREAD_BUDGET", "0")) or os.cpu_count() or 1
+
+# Called with (group, "started" or "finished", seconds so far in the group), like deck_pipeline's ProgressCallback
+ProgressCallback = Callable[[str, str, float], None]
+
+class ThreadBudget:
+    """Counting budget of CPU threads; reserve() blocks until enough threads are free."""
+
+    def __init__(self, total: int):
+        self.total = max(1, total)
+        self.in_use = 0
+        self._cond = threading.Condition()
+
+    @contextmanager
+    def reserve(self, threads: int):
+        with self._cond:
+            # A stage wanting more than the whole budget gets the whole budget, not a deadlock
+            threads = min(threads, self.total)
+            self._cond.wait_for(lambda: self.in_use + threads <= self.total)
+            self.in_use += threads
+        try:
+            yield
+        finally:
+            with self._cond:
+                self.in_use -= threads
+                self._cond.notify_all()
+
+    def resize(self, total: int):
+        with self._cond:
+            self.total = max(1, total)
+            self._cond.notify_all()
+
+_budget = ThreadBudget(DEFAULT_THREAD_BUDGET)
+
+def get_thread_budget() -> ThreadBudget:
+    """Return the process-wide thread budget."""
+    return _budget
+
+def set_thread_budget(total: int):
+    """Change the number of CPU threads model stages may use at once across the process."""
+    _budget.resize(total)
+
+def _torch():
+    try:
+        import torch
+    except ImportError:
+        return None
+    return torch
+
+# torch's intra-op thread count is process-wide, so overlapping runs share one setting:
+# the smallest share any of them asked for, and the original count once none is left
+_model_threads_lock = threading.Lock()
+_model_thread_shares: List[int] = []
+_saved_model_threads: Optional[int] = None
+
+@contextmanager
+def model_threads(threads: int):
+    """
+    Cap torch's intra-op threads at threads while the block runs, however many threads
+    enter it at once; the count from before the first entry is restored when the last leaves.
+    """
+    global _saved_model_threads
+    torch = _torch()
+    if torch is None:
+        yield
+        return
+    with _model_threads_lock:
+        if not _model_thread_shares:
+            _saved_model_threads = torch.get_num_threads()
+        _model_thread_shares.append(threads)
+        torch.set_num_threads(min(_model_thread_shares))
+    try:
+        yield
+    finally:
+        with _model_threads_lock:
+            _model_thread_shares.remove(threads)
+            torch.set_num_threads(min(_model_thread_shares) if _model_thread_shares else _saved_model_threads)
+
+class StageGraph:
+    """
+    A DAG of named stages. Each stage is called with the results of its inputs, in order;
+    inputs may name other stages or values passed to run().
+    """
+
+    def __init__(self, budget: Optional[ThreadBudget] = None):
+        self.budget = budget
+        self.stages: Dict[str, Dict[str, object]] = {}
+        self._timings: Dict[str, Dict[str, object]] = {}
+        self._groups: Dict[str, Dict[str, float]] = {}
+        self._wall = 0.0
+
+    def add(self, name: str, fn: Callable, inputs: Iterable[str] = (), model: bool = False, group: Optional[str] = None) -> "StageGraph":
+        """
+        Declare a stage. model stages reserve their share of the thread budget while running.
+        group names a coarser stage for progress and timings, e.g. "extract".
+        """
+        if name in self.stages:
+            raise ValueError(f"Duplicate stage: {name}")
+        self.stages[name] = {"fn": fn, "inputs": tuple(inputs), "model": model, "group": group}
+        return self
+
+    def model_width(self, workers: int) -> int:
+        """The most model stages that can run at once: model stages per dependency level, at most workers."""
+        depth: Dict[str, int] = {}
+
+        def level(name):
+            if name not in depth:
+                depth[name] = 1 + max((level(i) for i in self.stages[name]["inputs"] if i in self.stages), default=-1)
+            return depth[name]
+
+        per_level: Dict[int, int] = {}
+        for name, stage in self.stages.items():
+            if stage["model"]:
+                per_level[level(name)] = per_level.get(level(name), 0) + 1
+        return max(1, min(workers, max(per_level.values(), default=1)))
+
+    def _call(self, name: str, results: Dict[str, object], budget: ThreadBudget, ready_at: float, share: int):
+        stage = self.stages[name]
+        args = [results[i] for i in stage["inputs"]]
+        with budget.reserve(share if stage["model"] else 0):
+            start = time.perf_counter()
+            value = stage["fn"](*args)
+            end = time.perf_counter()
+        self._timings[name] = {"ready": ready_at, "start": start, "end": end, "group": stage["group"]}
+        return value
+
+    def run(self, initial: Optional[Dict[str, object]] = None, workers: Optional[int] = None,
+            progress: Optional[ProgressCallback] = None) -> Dict[str, object]:
+        """
+        Run every stage and return all results keyed by name, including initial.
+        workers defaults to the thread budget; with one worker stages run inline in order.
+        Model stages get an equal share of the budget each, so that model_width() of them
+        fit at once, and torch's intra-op threads are capped at the share during the run
+        (see model_threads).
+        """
+        budget = self.budget or _budget
+        results = dict(initial or {})
+        for name, stage in self.stages.items():
+            missing = [i for i in stage["inputs"] if i not in self.stages and i not in results]
+            if missing:
+                raise ValueError(f"Stage {name} has unknown inputs: {missing}")
+        self._timings, self._groups = {}, {}
+        group_pending: Dict[str, int] = {}
+        for stage in self.stages.values():
+            if stage["group"]:
+                group_pending[stage["group"]] = group_pending.get(stage["group"], 0) + 1
+
+        def started(name):
+            group = self.stages[name]["group"]
+            if group and group not in self._groups:
+                self._groups[group] = {"start": time.perf_counter()}
+                if progress:
+                    progress(group, "started", 0.0)
+
+        def finished(name):
+            group = self.stages[name]["group"]
+            if group:
+                group_pending[group] -= 1
+                if not group_pending[group]:
+                    entry = self._groups[group]
+                    entry["seconds"] = time.perf_counter() - entry["start"]
+                    if progress:
+                        progress(group, "finished", entry["seconds"])
+
+        workers = workers or budget.total
+        share = max(1, budget.total // self.model_width(workers))
+        if any(stage["model"] for stage in self.stages.values()):
+            with model_threads(share):
+                self._run(results, budget, workers, share, started, finished)
+        else:
+            self._run(results, budget, workers, share, started, finished)
+        return results
+
+    def _run(self, results: Dict[str, object], budget: ThreadBudget, workers: int, share: int,
+             started: Callable[[str], None], finished: Callable[[str], None]):
+        remaining = [name for name in self.stages]
+        run_start = time.perf_counter()
+        if workers <= 1:
+            while remaining:
+                name = next((n for n in remaining if all(i in results for i in self.stages[n]["inputs"])), None)
+                if name is None:
+                    raise ValueError(f"Stages form a cycle: {remaining}")
+                remaining.remove(name)
+                started(name)
+                results[name] = self._call(name, results, budget, time.perf_counter(), share)
+                finished(name)
+        else:
+            with ThreadPoolExecutor(min(workers, len(self.stages) or 1), thread_name_prefix="autodeck-stage") as executor:
+                running = {}
+                try:
+                    while remaining or running:
+                        for name in [n for n in remaining if all(i in results for i in self.stages[n]["inputs"])]:
+                            remaining.remove(name)
+                            started(name)
+                            # Copy the context so tracing spans nest under the caller's span
+                            ctx = contextvars.copy_context()
+                            running[executor.submit(ctx.run, self._call, name, results, budget, time.perf_counter(), share)] = name
+                        if not running:
+                            raise ValueError(f"Stages form a cycle: {remaining}")
+                        done, _ = wait(running, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            name = running.pop(future)
+                            results[name] = future.result()
+                            finished(name)
+                except BaseException:
+                    executor.shutdown(wait=True, cancel_futures=True)
+                    raise
+        self._wall = time.perf_counter() - run_start
+
+    def critical_path(self) -> List[str]:
+        """The chain of dependent stages with the longest total run time in the last run."""
+        longest: Dict[str, float] = {}
+        previous: Dict[str, Optional[str]] = {}
+        for name in sorted(self._timings, key=lambda n: self._timings[n]["end"]):
+            deps = [i for i in self.stages[name]["inputs"] if i in longest]
+            best = max(deps, key=lambda d: longest[d], default=None)
+            timing = self._timings[name]
+            longest[name] = timing["end"] - timing["start"] + (longest[best] if best else 0.0)
+            previous[name] = best
+        node = max(longest, key=longest.get, default=None)
+        path = []
+        while node:
+            path.append(node)
+            node = previous[node]
+        return path[::-1]
+
+    def report(self) -> Dict[str, object]:
+        """Per-stage start offset, run and budget-wait seconds, per-group seconds, and the critical path."""
+        origin = min((t["ready"] for t in self._timings.values()), default=0.0)
+        stages = {
+            name: {
+                "start_s": t["start"] - origin,
+                "seconds": t["end"] - t["start"],
+                "wait_s": t["start"] - t["ready"],
+                "group": t["group"],
+            }
+            for name, t in self._timings.items()
+        }
+        path = self.critical_path()
+        serial = sum(s["seconds"] for s in stages.values())
+        return {
+            "wall_s": self._wall,
+            "serial_s": serial,
+            "parallelism": serial / self._wall if self._wall else 1.0,
+            "critical_path": path,
+            "critical_path_s": sum(stages[name]["seconds"] for name in path),
+            "groups": {group: entry.get("seconds", 0.0) for group, entry in self._groups.items()},
+            "stages": stages,
+        }
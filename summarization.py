@@ -0,0 +1,168 @@
+"""
+Module for batched summarization with the shared BART summarizer.
+"""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from inference_cache import InferenceCache, cached_map, model_id
+from model_registry import SUMMARIZATION_MODEL, default_model_id, get_summarizer, pipeline_lock
+from segmentation import SENTENCE_BOUNDARY, TokenBudgetSegmenter
+import tracing
+
+DEFAULT_BATCH_SIZE = 8
+DEFAULT_NUM_THREADS = 1
+
+# Map-reduce defaults: summaries combined per reduce chunk and maximum number of reduce levels
+DEFAULT_FAN_OUT = 8
+DEFAULT_MAX_DEPTH = 3
+DEFAULT_REDUCE_THREADS = 4
+
+logger = logging.getLogger(__name__)
+
+def token_lengths(summarizer, texts: List[str]) -> List[int]:
+    """
+    Return the token count of each text, falling back to word counts without a tokenizer.
+    """
+    tokenizer = getattr(summarizer, "tokenizer", None)
+    if tokenizer is None:
+        return [len(text.split()) for text in texts]
+    with pipeline_lock(tokenizer):
+        return [len(ids) for ids in tokenizer(texts)["input_ids"]]
+
+def summarize_batch(
+    texts: List[str],
+    max_length: int,
+    min_length: int,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    num_threads: int = DEFAULT_NUM_THREADS,
+    summarizer=None,
+    cache: Optional[InferenceCache] = None,
+) -> List[str]:
+    """
+    Summarize every text with greedy decoding and return the summaries in input order.
+    Texts are sorted by token length and generated in padded batches of batch_size,
+    with up to num_threads batches in flight at once. Summaries already in the
+    inference cache (the default cache when cache is None) are not regenerated.
+    """
+    if not texts:
+        return []
+    params = {"task": "summarization", "max_length": max_length, "min_length": min_length, "do_sample": False}
+
+    def compute(missing: List[str]) -> List[str]:
+        # The shared summarizer is only loaded when something actually misses the cache
+        return _summarize_uncached(missing, max_length, min_length, batch_size, num_threads, summarizer or get_summarizer())
+
+    model = model_id(summarizer, SUMMARIZATION_MODEL) if summarizer is not None else default_model_id(SUMMARIZATION_MODEL)
+    return cached_map(model, params, texts, compute, cache)
+
+def _summarize_uncached(
+    texts: List[str], max_length: int, min_length: int, batch_size: int, num_threads: int, summarizer
+) -> List[str]:
+    lengths = token_lengths(summarizer, texts)
+    order = sorted(range(len(texts)), key=lambda i: lengths[i])
+    batches = [order[start:start + batch_size] for start in range(0, len(order), batch_size)]
+
+    def run(batch_ids: List[int]) -> List[str]:
+        # The pipeline tokenizes inside the call, so concurrent calls on a shared summarizer are serialized
+        with pipeline_lock(summarizer):
+            outputs = summarizer(
+                [texts[i] for i in batch_ids],
+                max_length=max_length,
+                min_length=min_length,
+                do_sample=False,
+                batch_size=len(batch_ids),
+            )
+        return [output['summary_text'].strip() for output in outputs]
+
+    with tracing.span("summarization", "model", texts=len(texts)):
+        if num_threads > 1 and len(batches) > 1:
+            with ThreadPoolExecutor(max_workers=num_threads) as pool:
+                batch_summaries = list(pool.map(run, batches))
+        else:
+            batch_summaries = [run(batch_ids) for batch_ids in batches]
+
+        summaries: List[Optional[str]] = [None] * len(texts)
+        for batch_ids, batch in zip(batches, batch_summaries):
+            for i, summary in zip(batch_ids, batch):
+                summaries[i] = summary
+        if tracing.enabled():
+            tracing.record(model_calls=len(batches), tokens_in=sum(lengths), tokens_out=sum(token_lengths(summarizer, summaries)))
+    return summaries
+
+def input_token_budget(summarizer) -> Optional[int]:
+    """
+    Return how many text tokens fit into the summarizer's encoder, or None if unknown.
+    """
+    tokenizer = getattr(summarizer, "tokenizer", None)
+    if tokenizer is None or not tokenizer.model_max_length or tokenizer.model_max_length > 100000:
+        return None
+    return tokenizer.model_max_length - tokenizer.num_special_tokens_to_add(pair=False)
+
+def summarize_long(
+    text: str,
+    max_length: int,
+    min_length: int,
+    summarizer=None,
+    chunk_tokens: Optional[int] = None,
+    fan_out: int = DEFAULT_FAN_OUT,
+    max_depth: int = DEFAULT_MAX_DEPTH,
+    num_threads: int = DEFAULT_REDUCE_THREADS,
+    cache: Optional[InferenceCache] = None,
+) -> Dict[str, object]:
+    """
+    Summarize text of any length with map-reduce.
+    Input over the model's token budget is chunked on sentence boundaries, the chunks are
+    summarized concurrently, and groups of up to fan_out summaries are summarized again
+    until the combined text fits one call. Returns the summary and per-level timings.
+    """
+    summarizer = summarizer or get_summarizer()
+    chunk_tokens = chunk_tokens or input_token_budget(summarizer)
+    segmenter = TokenBudgetSegmenter(getattr(summarizer, "tokenizer", None), chunk_tokens, separator=" ")
+    chunk_tokens = segmenter.max_tokens
+    levels: List[Dict[str, object]] = []
+
+    def record(level: int, inputs: List[str], start: float):
+        levels.append({"level": level, "inputs": len(inputs), "seconds": time.perf_counter() - start})
+        logger.debug(f"Summarization level {level}: {len(inputs)} inputs in {levels[-1]['seconds']:.2f}s")
+
+    parts = [text.strip()]
+    depth = 0
+    while True:
+        combined = " ".join(parts)
+        if segmenter.count(combined) <= chunk_tokens or depth == max_depth:
+            if depth == max_depth and segmenter.count(combined) > chunk_tokens:
+                logger.warning(f"Summary input still exceeds {chunk_tokens} tokens after {max_depth} levels; truncating")
+                combined = segmenter.split_tokens(combined)[0]
+            start = time.perf_counter()
+            summary = summarize_batch([combined], max_length, min_length, summarizer=summarizer, cache=cache)[0]
+            record(depth, [combined], start)
+            return {"summary": summary, "levels": levels}
+
+        start = time.perf_counter()
+        if depth == 0:
+            # Map: pack sentences into chunks that fill the model's input
+            chunks = list(segmenter.segment(SENTENCE_BOUNDARY.split(combined)))
+        else:
+            # Reduce: combine up to fan_out neighbouring summaries per chunk
+            chunks = _group_parts(parts, segmenter, fan_out)
+        parts = summarize_batch(
+            chunks, max_length, min_length, num_threads=num_threads, summarizer=summarizer, cache=cache
+        )
+        record(depth, chunks, start)
+        depth += 1
+
+def _group_parts(parts: List[str], segmenter: TokenBudgetSegmenter, fan_out: int) -> List[str]:
+    groups: List[List[str]] = [[]]
+    group_tokens = 0
+    for part in parts:
+        tokens = segmenter.count_joined(part) if groups[-1] else segmenter.count(part)
+        if groups[-1] and (len(groups[-1]) >= fan_out or group_tokens + tokens > segmenter.max_tokens):
+            groups.append([])
+            group_tokens = 0
+            tokens = segmenter.count(part)
+        groups[-1].append(part)
+        group_tokens += tokens
+    return [" ".join(group) for group in groups]
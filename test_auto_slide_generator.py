@@ -10,6 +10,27 @@ import data_ingestion
 import data_processing
 import ai_integration
 import slide_generation
+import model_registry
+import nlu_processing
+import summarization
+import inference_cache
+import transcript_ingestion
+import segmentation
+import fast_classifier
+import data_profiling
+import phase_planning
+import tiny_models
+
+@pytest.fixture(autouse=True)
+def no_default_inference_cache(monkeypatch):
+    # Keep tests from reading or writing the user's on-disk inference cache
+    monkeypatch.setattr(inference_cache, "CACHE_ENABLED", False)
+
+@pytest.fixture
+def tiny_registered_models():
+    # Stand in for the BART checkpoints so the full pipeline runs offline
+    yield tiny_models.register_tiny_models()
+    tiny_models.unregister_tiny_models()
 
 def test_read_csv():
     # Create a sample CSV file
@@ -37,7 +58,7 @@ def test_summarize_data():
     assert 'Columns' in summary
     assert 'Number of rows' in summary
 
-def test_generate_slide_content_summary():
+def test_generate_slide_content_summary(tiny_registered_models):
     summary = {'columns': ['A', 'B'], 'num_rows': 2}
     content = ai_integration.generate_slide_content_summary(summary)
     assert isinstance(content, str)
@@ -50,3 +71,955 @@ def test_slide_generation():
     slide_generation.save_presentation(prs, output_file)
     assert os.path.exists(output_file)
     os.remove(output_file)
+
+def test_model_registry_shares_and_evicts():
+    import torch
+
+    loads = []
+
+    def loader(task, model, device, dtype):
+        loads.append(model)
+        pipe = lambda text: text
+        pipe.model = torch.nn.Linear(512, 512, bias=False)  # 1 MB of fp32 weights
+        return pipe
+
+    registry = model_registry.ModelRegistry(memory_budget_mb=2.5, loader=loader)
+    first = registry.get("summarization", "a")
+    assert registry.get("summarization", "a", device="cpu") is first
+    registry.get("summarization", "b")
+    registry.get("summarization", "c")
+
+    stats = registry.stats()
+    assert loads == ["a", "b", "c"]
+    assert stats["hits"] == 1 and stats["misses"] == 3
+    assert stats["evictions"] == 1
+    assert ("summarization", "a") not in registry
+    assert ("summarization", "c") in registry
+
+
+def test_batched_classification_matches_per_segment():
+    classifier = tiny_models.build_tiny_pipeline("zero-shot-classification")
+    segments = [
+        "Hi my name is Dana.",
+        "We want to grow revenue and our reports are slow.",
+        "The database cannot scale, the legacy system must stay on premise.",
+        "Next steps: plan a pilot, then roll out and train staff.",
+        "Slow reports.",
+    ]
+    serial = nlu_processing.TranscriptNLU(classifier=classifier, batch_size=None)
+    batched = nlu_processing.TranscriptNLU(classifier=classifier, batch_size=3)
+    assert batched.classify_segments(segments) == serial.classify_segments(segments)
+
+
+def test_summarize_batch_matches_serial():
+    summarizer = tiny_models.build_tiny_pipeline("summarization")
+    texts = [
+        "Our reports are slow.",
+        "The database cannot scale and the legacy system must stay on premise, so reports are slow.",
+        "We want to grow revenue.",
+        "Train staff.",
+        "Plan a pilot then roll out to the client and train staff on the new reports.",
+    ]
+    serial = [
+        summarizer(text, max_length=12, min_length=2, do_sample=False)[0]['summary_text'].strip()
+        for text in texts
+    ]
+    batched = summarization.summarize_batch(
+        texts, max_length=12, min_length=2, batch_size=2, num_threads=2, summarizer=summarizer
+    )
+    assert batched == serial
+
+
+def test_inference_cache_hits_and_evicts(tmp_path):
+    cache = inference_cache.InferenceCache(str(tmp_path / "cache.sqlite"), max_mb=0.001)
+    params = {"max_length": 50, "min_length": 10}
+    calls = []
+
+    def compute(texts):
+        calls.append(list(texts))
+        return [text.upper() for text in texts]
+
+    assert inference_cache.cached_map("m", params, ["a", "b", "a"], compute, cache) == ["A", "B", "A"]
+    assert inference_cache.cached_map("m", params, ["b", "c"], compute, cache) == ["B", "C"]
+    assert calls == [["a", "b"], ["c"]]
+    # A different parameter set is a different cache entry
+    inference_cache.cached_map("m", {"max_length": 20}, ["a"], compute, cache)
+    assert calls[-1] == ["a"]
+
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 5
+    assert stats["total_hits"] == 1
+
+    cache.put_many("m", params, [(str(i), "x" * 200) for i in range(20)])
+    assert cache.stats()["size_mb"] * 2**20 <= cache.max_bytes
+    assert cache.stats()["evictions"] > 0
+
+
+def test_streaming_transcript_ingestion(tmp_path):
+    from docx import Document
+
+    lines = ["Alice: Hi, my name is Alice.", "I run the data team.", "", "Bob: Our reports are slow.",
+             "Alice: We want to grow revenue.", "", "", "Next steps: plan a pilot."]
+    txt_path = tmp_path / "meeting.txt"
+    txt_path.write_text("\n".join(lines), encoding="utf-8")
+    docx_path = tmp_path / "meeting.docx"
+    doc = Document()
+    for line in lines:
+        doc.add_paragraph(line)
+    doc.save(docx_path)
+
+    for path in (txt_path, docx_path):
+        assert "\n".join(transcript_ingestion.iter_transcript_lines(str(path))) == \
+            transcript_ingestion.ingest_transcript(str(path))
+        assert list(transcript_ingestion.iter_transcript(str(path))) == [
+            "Alice: Hi, my name is Alice.\nI run the data team.",
+            "Bob: Our reports are slow.\nAlice: We want to grow revenue.",
+            "Next steps: plan a pilot.",
+        ]
+        assert list(transcript_ingestion.iter_transcript(str(path), unit="turn")) == [
+            "Alice: Hi, my name is Alice.\nI run the data team.",
+            "Bob: Our reports are slow.",
+            "Alice: We want to grow revenue.",
+            "Next steps: plan a pilot.",
+        ]
+
+
+def test_token_budget_segmenter_packs_without_dropping_text():
+    classifier = tiny_models.build_tiny_pipeline("zero-shot-classification", max_positions=64)
+    paragraphs = [
+        "Alice: Hi my name is Alice.",
+        "Bob: We want to grow revenue. " * 30,
+        "Alice: Our reports are slow.\nThe database cannot scale.",
+        "Bob: Next steps: plan a pilot then roll out and train staff.",
+    ]
+    transcript = "\n\n".join(paragraphs)
+
+    nlu = nlu_processing.TranscriptNLU(classifier=classifier)
+    segmented = nlu.segment_transcript(transcript)
+    segments = [segment for texts in segmented.values() for segment in texts]
+    stats = nlu.segmentation_stats
+
+    segmenter = segmentation.TokenBudgetSegmenter(classifier.tokenizer, nlu.max_tokens)
+    assert all(segmenter.count(segment) <= nlu.max_tokens for segment in segments)
+    assert stats["tokens_truncated"] == 0
+    assert stats["units"] == 4 and stats["split_units"] == 1
+    assert stats["segments"] == len(segments) > 1
+    assert sorted(" ".join(segments).split()) == sorted(transcript.split())
+    # Close to minimal: the packed segments need at most one window more than the raw token count
+    assert stats["segments"] <= stats["tokens"] // nlu.max_tokens + 2
+
+
+def test_segment_labels_survive_inserted_short_paragraphs():
+    classifier = tiny_models.build_tiny_pipeline("zero-shot-classification")
+    words = tiny_models.TINY_VOCAB
+    paragraphs = [" ".join(words[(i * 7 + j) % len(words)] for j in range(5 + i % 7)) + "." for i in range(60)]
+    nlu = nlu_processing.TranscriptNLU(classifier=classifier)
+    labels = {}
+    nlu.segment_transcript("\n\n".join(paragraphs), labels=labels)
+    assert nlu.segmentation_stats["segments"] > 5
+
+    # Short and long insertions near the top only repack the segment they land in
+    for inserted in ("our reports are slow.", " ".join(words[:36])):
+        rerun = dict(labels)
+        nlu.segment_transcript("\n\n".join(paragraphs[:3] + [inserted] + paragraphs[3:]), labels=rerun)
+        stats = nlu.segmentation_stats
+        assert stats["labels_reused"] >= stats["segments"] - 2
+
+
+def test_summarize_long_map_reduces_over_budget_input():
+    inputs = []
+
+    def summarizer(texts, max_length, min_length, do_sample, batch_size):
+        inputs.extend(texts)
+        # Keep the first five words of each input as its "summary"
+        return [{"summary_text": " ".join(text.split()[:5])} for text in texts]
+
+    sentences = [f"Sentence number {i} talks about reports and revenue." for i in range(40)]
+    result = summarization.summarize_long(
+        " ".join(sentences), max_length=20, min_length=5, summarizer=summarizer, chunk_tokens=24, fan_out=3
+    )
+
+    assert all(len(text.split()) <= 24 for text in inputs)
+    assert [level["inputs"] for level in result["levels"]] == [14, 5, 2, 1]
+    assert all(level["seconds"] >= 0 for level in result["levels"])
+    assert result["summary"] == "Sentence number 0 talks about"
+
+
+def test_summarize_long_chunks_fit_budget_once_joined():
+    # Every character is a token, so each joining space costs one, as whitespace does under byte-level BPE
+    class CharTokenizer:
+        is_fast = False
+
+        def __call__(self, text, add_special_tokens=True):
+            return {"input_ids": [list(t) for t in text] if isinstance(text, list) else list(text)}
+
+    class Summarizer:
+        tokenizer = CharTokenizer()
+        inputs = []
+
+        def __call__(self, texts, max_length, min_length, do_sample, batch_size):
+            self.inputs.extend(texts)
+            return [{"summary_text": text[:12]} for text in texts]
+
+    summarizer = Summarizer()
+    sentences = [f"Sentence {i:02d} is about revenue." for i in range(40)]
+    summarization.summarize_long(" ".join(sentences), max_length=20, min_length=5, summarizer=summarizer, chunk_tokens=88)
+    assert summarizer.inputs and all(len(text) <= 88 for text in summarizer.inputs)
+
+def test_cascade_escalates_only_uncertain_segments():
+    keywords = {
+        "Introductions": "name",
+        "Pain Points": "slow",
+        "Suggested Next Steps": "pilot",
+    }
+    nli_calls = []
+
+    def nli(segment, candidate_labels):
+        nli_calls.append(segment)
+        label = next((label for label, word in keywords.items() if word in segment), "Client Goals")
+        return {"labels": [label] + [c for c in candidate_labels if c != label]}
+
+    training = [f"Hi, my name is {name} and I lead {team}." for name in ("Dana", "Lee", "Sam")
+                for team in ("sales", "data", "ops")]
+    training += [f"Our {thing} is slow and {issue}." for thing in ("reporting", "dashboard", "export")
+                 for issue in ("breaks weekly", "frustrates staff", "costs hours")]
+    training += [f"Next step is a {size} pilot with the {team} team." for size in ("small", "quick", "paid")
+                 for team in ("sales", "data", "ops")]
+    nlu = nlu_processing.TranscriptNLU(classifier=nli, batch_size=None, confidence_threshold=0.5)
+    nlu.fast_classifier = fast_classifier.train_from_nli(nlu, training)
+    nli_calls.clear()
+
+    segments = ["Hi, my name is Kim and I lead finance.", "Our billing is slow and breaks weekly.",
+                "Next step is a quick pilot with the finance team.", "Revenue growth matters most this year."]
+    report = nlu.evaluate_cascade(segments)
+
+    assert 0 < report["escalation_rate"] < 1
+    assert report["agreement"] == 1.0
+    assert nlu.cascade_stats["segments"] == 0
+
+
+def test_profiler_exact_on_small_and_approximate_on_large_frames():
+    import numpy as np
+
+    small = pd.DataFrame({'A': [1, 2, 3, None], 'B': ['x', 'y', 'x', None]})
+    stats = data_profiling.profile_dataframe(small)["stats"]
+    expected = small['A'].describe()
+    for name in ('count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max'):
+        assert stats['A'][name] == pytest.approx(expected[name])
+    assert stats['A']['nulls'] == 1
+    assert (stats['B']['unique'], stats['B']['top'], stats['B']['freq']) == (2, 'x', 2)
+    # Rows without columns are counted once, and columns without rows are still listed
+    assert data_profiling.profile_dataframe(pd.DataFrame(index=range(5)))['num_rows'] == 5
+    assert data_profiling.profile_dataframe(small.iloc[:0])['columns'] == ['A', 'B']
+
+    rng = np.random.default_rng(0)
+    large = pd.DataFrame({'x': rng.normal(size=200_000), 'k': rng.integers(0, 20_000, 200_000)})
+    chunks = (large.iloc[start:start + 30_000] for start in range(0, len(large), 30_000))
+    profile = data_profiling.profile_chunks(chunks)
+    assert profile['num_rows'] == len(large)
+    assert profile['stats']['x']['mean'] == pytest.approx(large['x'].mean())
+    assert profile['stats']['x']['std'] == pytest.approx(large['x'].std())
+    for q, name in ((0.25, '25%'), (0.5, '50%'), (0.75, '75%')):
+        # Rank error of the sketch should stay well under one percent
+        rank = (large['x'] < profile['stats']['x'][name]).mean()
+        assert abs(rank - q) < 0.01
+    assert profile['stats']['k']['unique'] == pytest.approx(large['k'].nunique(), rel=0.03)
+
+    sampled = data_profiling.profile_dataframe(large, sample_fraction=0.1)
+    assert sampled['sampled'] and sampled['num_rows'] == len(large)
+    assert sampled['sampled_rows'] == pytest.approx(20_000, rel=0.01)
+
+
+def test_chunked_readers_and_pooled_engines(tmp_path):
+    import sqlite3
+
+    db_path = tmp_path / "sales.db"
+    db_url = f"sqlite:///{db_path}"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("CREATE TABLE sales (region TEXT, amount REAL, note TEXT)")
+        conn.executemany("INSERT INTO sales VALUES (?, ?, ?)", [(f"r{i % 3}", float(i), "x") for i in range(25)])
+    sql_file = tmp_path / "query.sql"
+    sql_file.write_text("SELECT * FROM sales WHERE amount >= 5;")
+    csv_file = tmp_path / "sales.csv"
+    data_ingestion.read_database_table("sales", db_url).to_csv(csv_file, index=False)
+
+    assert data_ingestion.get_engine(db_url) is data_ingestion.get_engine(db_url)
+
+    chunks = list(data_ingestion.iter_database_table("sales", db_url, chunksize=10, columns=["region", "amount"]))
+    assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+    assert list(chunks[0].columns) == ["region", "amount"]
+
+    chunks = list(data_ingestion.iter_sql_file(str(sql_file), db_url, chunksize=8, columns=["amount"]))
+    assert [len(chunk) for chunk in chunks] == [8, 8, 4]
+    assert list(chunks[0].columns) == ["amount"]
+    assert data_ingestion.read_sql_file(str(sql_file), db_url, columns=["amount"])["amount"].min() == 5
+
+    chunks = list(data_ingestion.iter_csv(str(csv_file), chunksize=10, columns=["amount"]))
+    assert pd.concat(chunks)["amount"].tolist() == [float(i) for i in range(25)]
+    assert data_profiling.profile_chunks(chunks)["stats"]["amount"]["max"] == 24.0
+
+    data_ingestion.dispose_engines()
+    assert not data_ingestion._engines
+
+
+def test_columnar_cache_projection_filters_and_invalidation(tmp_path):
+    pytest.importorskip("pyarrow")
+    import columnar_cache
+
+    source = tmp_path / "sales.csv"
+    pd.DataFrame({'region': ['n', 's', 'n'], 'amount': [1.0, 2.0, 3.0]}).to_csv(source, index=False)
+    cache = columnar_cache.ColumnarCache(str(tmp_path / "cache"), max_mb=10)
+
+    df = cache.read(str(source), columns=['amount'], filters=[('region', '==', 'n')])
+    assert df['amount'].tolist() == [1.0, 3.0] and list(df.columns) == ['amount']
+    assert cache.read(str(source))['region'].tolist() == ['n', 's', 'n']
+    assert (cache.stats()['hits'], cache.stats()['misses'], cache.stats()['entries']) == (1, 1, 1)
+
+    # Rewriting the source changes its size and mtime, which replaces the cached copy
+    pd.DataFrame({'region': ['e'], 'amount': [9.0]}).to_csv(source, index=False)
+    assert cache.read(str(source))['amount'].tolist() == [9.0]
+    assert cache.stats()['entries'] == 1
+
+    excel_file = os.path.join(os.path.dirname(__file__), 'CALE 2010 SH 042417.xls')
+    if os.path.exists(excel_file):
+        sheets = cache.read_all(excel_file)
+        expected = pd.read_excel(excel_file, sheet_name=None)
+        assert [len(df) for df in sheets.values()] == [len(df) for df in expected.values()]
+        assert cache.stats()['entries'] == 2
+
+    cache.invalidate()
+    assert cache.stats()['entries'] == 0
+
+
+def test_columnar_cache_keeps_mixed_type_columns(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    import columnar_cache
+
+    # Stand in for an .xls sheet whose columns mix numbers, text and blanks
+    frame = pd.DataFrame({
+        'code': [101, 'A7', 3.5, None, True, pd.Timestamp("2024-01-02 03:04:05")],
+        'label': ['x', 'y', 'z', 'w', 'v', 'u'],
+        'amount': [1.0, 2.0, float('nan'), 4.0, 5.0, 6.0],
+    })
+    monkeypatch.setattr(pd, "read_excel", lambda path, sheet_name=0, usecols=None: (
+        {"Sheet1": frame.copy()} if sheet_name is None else frame.copy()
+    ))
+    source = tmp_path / "mixed.xls"
+    source.write_bytes(b"stand-in")
+    monkeypatch.setattr(columnar_cache, "_default_cache", columnar_cache.ColumnarCache(str(tmp_path / "cache")))
+
+    uncached = data_ingestion.read_excel(str(source))
+    for _ in range(2):  # conversion, then a cache hit
+        cached = data_ingestion.read_excel(str(source), use_cache=True)
+        pd.testing.assert_frame_equal(cached, uncached)
+        assert [type(v) for v in cached['code']] == [int, str, float, type(None), bool, pd.Timestamp]
+    projected = data_ingestion.read_cached(str(source), columns=['label', 'code'])
+    assert list(projected.columns) == ['label', 'code'] and projected['code'].tolist()[:3] == [101, 'A7', 3.5]
+    # Stored as typed text columns, never as pickled objects that a shared cache directory could tamper with
+    import pyarrow as pa
+    arrow_file = next((tmp_path / "cache").rglob("*.arrow"))
+    schema = pa.ipc.open_file(pa.memory_map(str(arrow_file))).schema
+    assert schema.field('code').type == pa.string()
+    with pytest.raises(ValueError):
+        data_ingestion.read_cached(str(source), filters=[('code', '==', 101)])
+
+def test_read_directory_in_parallel_reports_failures(tmp_path):
+    import shutil
+
+    for name, values in (("a.csv", [1, 2]), ("b.csv", [3])):
+        pd.DataFrame({'A': values}).to_csv(tmp_path / name, index=False)
+    (tmp_path / "broken.xls").write_bytes(b"not a workbook")
+    excel_file = os.path.join(os.path.dirname(__file__), 'CALE 2010 SH 042417.xls')
+    if os.path.exists(excel_file):
+        shutil.copy(excel_file, tmp_path / "cale.xls")
+
+    report = data_ingestion.read_directory(str(tmp_path), max_workers=2)
+
+    assert list(report["failures"]) == [str(tmp_path / "broken.xls")]
+    assert set(report["timings"]) == {str(path) for path in tmp_path.iterdir()}
+    keys = list(report["frames"])
+    assert keys[:2] == [(str(tmp_path / "a.csv"), "0"), (str(tmp_path / "b.csv"), "0")]
+    if os.path.exists(excel_file):
+        assert {sheet for path, sheet in keys if path.endswith("cale.xls")} == {"Read Me", "Data"}
+
+    combined = data_ingestion.combine_frames({k: v for k, v in report["frames"].items() if k[0].endswith(".csv")})
+    assert combined["A"].tolist() == [1, 2, 3]
+    assert combined["source_file"].tolist() == ["a.csv", "a.csv", "b.csv"]
+    summary = data_processing.summarize_frames(report["frames"])
+    assert "Source: a.csv / sheet 0" in summary and "Number of rows" in summary
+
+
+def test_plan_phases_picks_k_and_titles_from_centroids():
+    texts = [
+        "Migrate the data warehouse to the cloud",
+        "Train staff on the new dashboard",
+        "Migrate legacy data pipelines to the cloud warehouse",
+        "Run dashboard training workshops for staff",
+        "Set up security audit and access review",
+        "Cloud warehouse data migration testing",
+        "Staff dashboard training materials",
+        "Security access audit for all accounts",
+    ]
+    phases = phase_planning.plan_phases(texts, k_range=(2, 5), seed=7)
+
+    assert len(phases) == 3
+    assert phase_planning.plan_phases(texts, k_range=(2, 5), seed=7) == phases
+    assert phases[0]["activities"][0].startswith(("Migrate", "Cloud"))
+    assert all(phase["title"].startswith(f"Phase {i + 1}: ") for i, phase in enumerate(phases))
+    assert sorted(a for phase in phases for a in phase["activities"]) == sorted(texts)
+    assert any("Security" in phase["title"] or "Audit" in phase["title"] for phase in phases)
+
+    assert len(phase_planning.plan_phases(texts, num_phases=2)) == 2
+    assert phase_planning.plan_phases(["Kickoff"])[0]["description"] == "Kickoff"
+
+
+def test_batch_generate_forks_workers_and_records_failures(tmp_path, tiny_registered_models):
+    import batch_generate
+
+    input_dir = tmp_path / "transcripts"
+    input_dir.mkdir()
+    for name in ("alpha", "beta"):
+        (input_dir / f"{name}.txt").write_text(
+            "Hi my name is Dana.\n\nWe want to grow revenue.\n\nOur reports are slow.\n\n"
+            "Next steps: plan a pilot, then roll out and train staff.\n"
+        )
+    paths = batch_generate.find_transcripts(str(input_dir)) + [str(input_dir / "missing.txt")]
+
+    manifest = batch_generate.run_batch(paths, str(tmp_path / "decks"), workers=2, torch_threads=1)
+    assert manifest["succeeded"] == 2 and manifest["failed"] == 1
+    ok = [r for r in manifest["results"] if r["status"] == "ok"]
+    assert all(os.path.exists(r["output"]) for r in ok)
+    assert {"ingest", "segment", "extract", "plan", "render", "save"} <= set(ok[0]["timings"])
+    assert manifest["results"][-1]["error"].startswith("FileNotFoundError")
+    assert all(r["pid"] != os.getpid() for r in manifest["results"])
+
+
+def test_job_service_queues_streams_progress_and_rejects_when_full(tmp_path):
+    import threading
+    import job_service
+
+    release = threading.Event()
+
+    def runner(transcript_path, output_path, progress=None):
+        release.wait(10)
+        for stage in ("ingest", "render"):
+            progress(stage, "started", 0.0)
+            progress(stage, "finished", 0.01)
+        if "bad" in open(transcript_path).read():
+            raise ValueError("bad transcript")
+        with open(output_path, 'wb') as f:
+            f.write(b"deck")
+
+    service = job_service.JobService(workers=1, max_queue=1, work_dir=str(tmp_path), runner=runner)
+    client = job_service.JobClient(service.start_background())
+
+    running = client.submit_bytes("a.txt", b"good")
+    queued = client.submit_bytes("b.txt", b"bad")
+    with pytest.raises(job_service.QueueFullError):
+        client.submit_bytes("c.txt", b"good")
+    with pytest.raises(RuntimeError):
+        client.submit_bytes("d.pdf", b"good")
+    release.set()
+
+    events = [event["event"] for event in client.events(running["id"])]
+    assert events == ["queued", "running", "stage_started", "stage_finished", "stage_started", "stage_finished", "done"]
+    assert set(client.status(running["id"])["timings"]) == {"ingest", "render"}
+    client.download(running["id"], str(tmp_path / "deck.pptx"))
+    assert (tmp_path / "deck.pptx").read_bytes() == b"deck"
+
+    assert list(client.events(queued["id"]))[-1]["event"] == "failed"
+    assert client.status(queued["id"])["error"] == "ValueError: bad transcript"
+    assert client.health()["queued"] == 0
+
+
+def test_job_event_stream_survives_silent_stages(tmp_path):
+    import time
+    import job_service
+
+    def runner(transcript_path, output_path, progress=None):
+        progress("extract", "started", 0.0)
+        time.sleep(1.0)  # A stage far longer than the client's read timeout, with no events
+        progress("extract", "finished", 1.0)
+        with open(output_path, 'wb') as f:
+            f.write(b"deck")
+
+    service = job_service.JobService(workers=1, work_dir=str(tmp_path), runner=runner, keepalive=0.1)
+    client = job_service.JobClient(service.start_background(), timeout=0.3)
+    transcript = tmp_path / "meeting.txt"
+    transcript.write_text("hello")
+
+    # Keepalives keep an explicit short read timeout alive, and the default stream timeout ignores the request timeout
+    job = client.submit(str(transcript))
+    assert [event["event"] for event in client.events(job["id"], timeout=0.3)][-1] == "done"
+    assert client.generate(str(transcript), str(tmp_path / "deck.pptx"))["status"] == "done"
+
+def test_job_service_runs_real_pipelines_concurrently(tmp_path, tiny_registered_models):
+    import job_service
+
+    # Concurrent jobs share the registry's pipelines and their fast tokenizers
+    service = job_service.JobService(workers=2, max_queue=8, work_dir=str(tmp_path))
+    client = job_service.JobClient(service.start_background())
+    text = ("Hi my name is Dana. We want to grow revenue.\n\nOur reports are slow. The database cannot scale.\n\n"
+            "Next steps: plan a pilot then roll out and train staff.\n\n") * 6
+    jobs = [client.submit_bytes(f"meeting{i}.txt", text.encode()) for i in range(4)]
+    for job in jobs:
+        assert list(client.events(job["id"]))[-1]["event"] == "done", client.status(job["id"])["error"]
+        assert client.result(job["id"])[:2] == b"PK"
+
+def test_cli_generates_transcript_decks_with_or_without_job_service(tmp_path, monkeypatch, capsys, tiny_registered_models):
+    import job_service
+    import main
+
+    transcript = tmp_path / "meeting.txt"
+    transcript.write_text("Hi my name is Dana.\n\nNext steps: plan a pilot.")
+    deck = tmp_path / "meeting.pptx"
+
+    # Standalone by default: no service needs to be running
+    monkeypatch.setattr(main, "JOB_SERVICE_URL", None)
+    main.generate_transcript_deck(str(transcript))
+    assert deck.read_bytes()[:2] == b"PK" and "Presentation saved" in capsys.readouterr().out
+
+    def runner(transcript_path, output_path, progress=None):
+        with open(output_path, 'wb') as f:
+            f.write(b"from service")
+
+    service = job_service.JobService(workers=1, work_dir=str(tmp_path / "jobs"), runner=runner)
+    monkeypatch.setattr(main, "JOB_SERVICE_URL", service.start_background())
+    main.generate_transcript_deck(str(transcript))
+    assert deck.read_bytes() == b"from service"
+
+def test_generate_deck_bytes_in_memory(tmp_path, monkeypatch, tiny_registered_models):
+    import io
+    import zipfile
+    from docx import Document
+    import deck_pipeline
+
+    doc = Document()
+    for text in ("Hi my name is Dana.", "We want to grow revenue.", "Next steps: plan a pilot."):
+        doc.add_paragraph(text)
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    data = buffer.getvalue()
+    assert transcript_ingestion.ingest_transcript_bytes(data, "meeting.docx").splitlines()[0] == "Hi my name is Dana."
+    assert transcript_ingestion.ingest_transcript_bytes(b"Hi", "meeting.txt") == "Hi"
+
+    monkeypatch.chdir(tmp_path)
+    result = deck_pipeline.generate_deck_bytes(data, "meeting.docx")
+    assert list(tmp_path.iterdir()) == []
+    assert "ppt/presentation.xml" in zipfile.ZipFile(io.BytesIO(result["deck"])).namelist()
+    assert set(result["timings"]) == set(deck_pipeline.STAGES)
+
+    # Demo sessions build decks from their own threads on the shared pipelines
+    from concurrent.futures import ThreadPoolExecutor
+    from nlu_processing import TranscriptNLU
+    with ThreadPoolExecutor(4) as pool:
+        decks = list(pool.map(lambda _: deck_pipeline.generate_deck_bytes(data, "meeting.docx", nlu=TranscriptNLU()), range(4)))
+    assert all(deck["deck"][:2] == b"PK" for deck in decks)
+
+
+def test_tracing_records_stages_and_exports(tmp_path, tiny_registered_models):
+    import json
+    import deck_pipeline
+    import tracing
+
+    data = b"Hi my name is Dana.\n\nWe want to grow revenue.\n\nOur reports are slow.\n\nNext steps: plan a pilot."
+    deck_pipeline.generate_deck_bytes(data, "meeting.txt")
+    assert tracing.get_tracer() is None
+
+    tracer = tracing.start_tracing()
+    try:
+        deck_pipeline.generate_deck_bytes(data, "meeting.txt")
+    finally:
+        assert tracing.stop_tracing() is tracer
+
+    summary = tracer.summary()
+    for name in ("ingest_transcript_bytes", "segment_transcript", "extract_objectives",
+                 "extract_pain_points", "plan_phases", "add_cover_slide", "add_content_slide", "presentation_bytes"):
+        assert summary[name]["calls"] >= 1, name
+    # Model counters roll up from the classification span into the pipeline stage
+    assert summary["segment"]["model_calls"] == summary["zero_shot_classification"]["model_calls"] > 0
+    assert summary["segment"]["tokens_in"] > 0
+
+    tracer.to_chrome_trace(str(tmp_path / "trace.json"))
+    tracer.to_json(str(tmp_path / "spans.json"))
+    events = json.loads((tmp_path / "trace.json").read_text())["traceEvents"]
+    assert {event["ph"] for event in events} == {"X"}
+    spans = json.loads((tmp_path / "spans.json").read_text())["spans"]
+    assert next(s for s in spans if s["name"] == "segment_transcript")["parent"] == "segment"
+
+
+def test_tracing_attributes_cpu_and_counters_per_thread():
+    import contextvars
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+    import tracing
+
+    def child(calls):
+        with tracing.span("child"):
+            for _ in range(calls):
+                tracing.record(model_calls=1, tokens_in=2)
+
+    def busy(seconds):
+        end = time.perf_counter() + seconds
+        while time.perf_counter() < end:
+            pass
+
+    tracer = tracing.start_tracing()
+    try:
+        with tracing.span("parent") as parent:
+            with ThreadPoolExecutor(8) as executor:
+                burner = executor.submit(busy, 0.3)
+                for future in [executor.submit(contextvars.copy_context().run, child, 500) for _ in range(8)]:
+                    future.result()
+                with tracing.span("idle") as idle:
+                    time.sleep(0.2)
+                burner.result()
+    finally:
+        tracing.stop_tracing()
+
+    assert tracer.summary()["child"]["calls"] == 8
+    assert parent.model_calls == 8 * 500 and parent.tokens_in == 8 * 1000
+    # CPU burnt on another thread is not charged to a span that only sleeps
+    assert idle.cpu_s < 0.1
+
+
+def test_benchmark_runs_offline_and_flags_regressions(tmp_path):
+    import copy
+    import benchmark
+
+    assert benchmark.parse_size("10KB") == 10_000 and benchmark.parse_size("10M") == 10_000_000
+    assert len(benchmark.synthetic_transcript(5000)) >= 5000
+    assert benchmark.synthetic_transcript(2000, seed=1) == benchmark.synthetic_transcript(2000, seed=1)
+
+    report = benchmark.run_benchmarks(["2KB"], ["500"], repeat=2)
+    assert {"ingest@2KB", "segment@2KB", "end_to_end@2KB", "profile@500"} <= set(report["results"])
+    assert model_registry.ZERO_SHOT_MODEL not in str(model_registry.get_registry().stats()["models"])
+    benchmark.save_report(report, str(tmp_path / "baseline.json"))
+    baseline = benchmark.load_report(str(tmp_path / "baseline.json"))
+    assert benchmark.compare(report, baseline) == []
+
+    faster = copy.deepcopy(baseline)
+    faster["results"]["end_to_end@2KB"]["latency_s"]["p50"] /= 10
+    assert [r["benchmark"] for r in benchmark.compare(report, faster, threshold=0.25)] == ["end_to_end@2KB"]
+
+
+# Cold-start import of every entry point must stay within this many seconds
+IMPORT_BUDGET_S = float(os.environ.get("AUTODECK_IMPORT_BUDGET_S", "1.5"))
+
+
+def test_entry_points_import_within_budget_without_heavy_dependencies():
+    import json
+    import subprocess
+    import preloader
+
+    code = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        "import main, deck_pipeline, batch_generate, job_service, data_processing\n"
+        "seconds = time.perf_counter() - start\n"
+        f"heavy = [m for m in {preloader.HEAVY_MODULES!r} + ('numpy', 'requests') if m.split('.')[0] in sys.modules]\n"
+        "print(json.dumps({'seconds': seconds, 'heavy': heavy}))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True, text=True, check=True,
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    assert result["heavy"] == []
+    assert result["seconds"] < IMPORT_BUDGET_S
+
+
+def test_preload_times_imports_and_skips_missing_modules():
+    import preloader
+
+    timings = preloader.preload(["json", "missing_module_for_test"], warm_models=False)
+    assert set(timings) == {"json"} and preloader.preload_timings == timings
+
+
+def test_int8_backend_report_against_fp32():
+    import inference_backend
+
+    classifier = tiny_models.build_tiny_pipeline("zero-shot-classification")
+    summarizer = tiny_models.build_tiny_pipeline("summarization")
+    quantized = inference_backend.quantize_int8(classifier)
+    assert type(quantized.model.model.encoder.layers[0].fc1).__name__ == "Linear"
+    assert "quantized" in type(quantized.model.model.encoder.layers[0].fc1).__module__
+    assert "quantized" not in type(classifier.model.model.encoder.layers[0].fc1).__module__
+    assert inference_cache.model_id(quantized, "bart") == "bart@int8"
+
+    report = inference_backend.accuracy_report(
+        classifier, summarizer, ["int8"], corpus=inference_backend.FIXED_CORPUS[:4], repeat=1, max_length=12, min_length=2
+    )
+    assert report["fp32"]["label_agreement"] == report["fp32"]["summary_exact_match"] == 1.0
+    assert 0.0 <= report["int8"]["label_agreement"] <= 1.0
+    assert 0.0 <= report["int8"]["summary_rouge1_f1"] <= 1.0
+    assert report["int8"]["classify_speedup"] > 0
+    assert model_registry.ModelRegistry()._key("summarization", "m", dtype="fp32") == ("summarization", "m", "cpu", "default")
+
+
+def test_default_summarizer_cache_key_follows_backend(monkeypatch):
+    import summarization
+
+    keys = []
+    monkeypatch.setattr(summarization, "cached_map", lambda model, params, texts, compute, cache: keys.append(model) or texts)
+    for backend in (None, "fp32", "int8", "onnx"):
+        # AUTODECK_INFERENCE_BACKEND is read into DEFAULT_BACKEND at import
+        monkeypatch.setattr(model_registry, "DEFAULT_BACKEND", backend)
+        summarization.summarize_batch(["text"], max_length=10, min_length=2)
+    assert keys == [model_registry.SUMMARIZATION_MODEL] * 2 + [
+        model_registry.SUMMARIZATION_MODEL + "@int8", model_registry.SUMMARIZATION_MODEL + "@onnx"]
+
+def test_inference_client_pools_coalesces_retries_and_breaks(monkeypatch):
+    import asyncio
+    import json
+    import threading
+    import time
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    import inference_client
+
+    state = {"active": 0, "peak": 0, "posts": 0, "flaky": 2}
+    lock = threading.Lock()
+
+    class StandIn(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            prompt = json.loads(self.rfile.read(int(self.headers["Content-Length"])))["inputs"]
+            with lock:
+                state["posts"] += 1
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+                flaky = self.path == "/flaky" and state["flaky"] > 0
+                state["flaky"] -= flaky
+            time.sleep(0.05)
+            with lock:
+                state["active"] -= 1
+            status = 503 if self.path == "/down" or flaky else 200
+            body = b"<html>busy</html>" if self.path == "/garbage" else json.dumps([{"generated_text": f"slide for {prompt}"}]).encode()
+            self.send_response(status)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandIn)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}"
+    try:
+        client = inference_client.InferenceClient(url + "/ok", max_concurrency=3, backoff=0.01)
+        prompts = ["a", "b", "a", "c", "d", "a"]
+        assert client.generate_batch(prompts) == [f"slide for {p}" for p in prompts]
+        assert client.stats()["coalesced"] == 2 and state["posts"] == 4
+        assert 1 < state["peak"] <= 3
+        assert asyncio.run(client.generate_many(["e", "f"])) == ["slide for e", "slide for f"]
+
+        flaky = inference_client.InferenceClient(url + "/flaky", backoff=0.01)
+        assert flaky.generate("g") == "slide for g" and flaky.stats()["retries"] == 2
+
+        breaker = inference_client.CircuitBreaker(window=4, failure_rate=0.5, min_calls=2, reset_timeout=60)
+        down = inference_client.InferenceClient(url + "/down", retries=0, breaker=breaker, fallback=lambda p: "local " + p)
+        for _ in range(2):
+            with pytest.raises(inference_client.InferenceError):
+                down.generate("h")
+        assert down.generate("h") == "local h"
+        stats = down.stats()
+        assert (stats["failures"], stats["fallbacks"], stats["circuit"]) == (2, 1, "open")
+
+        # A malformed response fails the half-open trial instead of leaving it in flight forever
+        trial = inference_client.CircuitBreaker(min_calls=1, reset_timeout=0)
+        garbage = inference_client.InferenceClient(url + "/garbage", retries=0, breaker=trial)
+        trial.record(False)
+        with pytest.raises(inference_client.InferenceError, match="invalid JSON"):
+            garbage.generate("i")
+        assert trial.state == "open" and trial.allow()
+
+        monkeypatch.setenv("AUTODECK_INFERENCE_URL", url + "/ok")
+        monkeypatch.setattr(ai_integration, "_client", client)
+        assert ai_integration.generate_slide_content_summaries(["x"]) == ["slide for " + ai_integration.PROMPT_TEMPLATE.format("x")]
+
+        # A failure before the circuit opens is reported on its own slide; the local summarizer isn't run per call
+        monkeypatch.setattr(ai_integration, "_client", inference_client.InferenceClient(url + "/down", retries=0))
+        monkeypatch.setattr(ai_integration, "_local_summary", lambda data_summary: pytest.fail("summarized locally"))
+        summaries = ai_integration.generate_slide_content_summaries(["y", "z"])
+        assert all(summary.startswith("Error: AI API call failed") for summary in summaries)
+    finally:
+        server.shutdown()
+
+
+def test_stage_graph_overlaps_independent_stages_within_thread_budget(tiny_registered_models):
+    import time
+    import torch
+    import deck_pipeline
+    import stage_scheduler
+
+    intra_op = []
+
+    def model_stage(fn):
+        def run(x):
+            intra_op.append(torch.get_num_threads())
+            time.sleep(0.2)
+            return fn(x)
+        return run
+
+    def graph(budget):
+        g = stage_scheduler.StageGraph(budget=stage_scheduler.ThreadBudget(budget))
+        g.add("a", model_stage(lambda x: x + 1), ["x"], model=True, group="extract")
+        g.add("b", model_stage(lambda x: x * 2), ["x"], model=True, group="extract")
+        g.add("c", lambda a, b: time.sleep(0.05) or a + b, ["a", "b"], group="plan")
+        return g
+
+    torch_threads = torch.get_num_threads()
+    events = []
+    parallel = graph(4)
+    assert parallel.model_width(workers=4) == 2 and parallel.model_width(workers=1) == 1
+    assert parallel.run({"x": 3}, workers=4, progress=lambda *e: events.append(e[:2]))["c"] == 10
+    report = parallel.report()
+    assert report["wall_s"] < report["serial_s"] and report["parallelism"] > 1.3
+    assert report["critical_path"][-1] == "c" and len(report["critical_path"]) == 2
+    assert events[0] == ("extract", "started") and events[-1] == ("plan", "finished")
+    assert set(report["groups"]) == {"extract", "plan"}
+    # The two model stages split the budget and run with torch limited to their share
+    assert intra_op == [2, 2] and torch.get_num_threads() == torch_threads
+
+    serial = graph(1)
+    serial.run({"x": 3}, workers=4)
+    assert serial.report()["wall_s"] >= 0.4
+    assert max(stage["wait_s"] for stage in serial.report()["stages"].values()) >= 0.15
+
+    with pytest.raises(ValueError):
+        stage_scheduler.StageGraph().add("a", lambda b: b, ["b"]).add("b", lambda a: a, ["a"]).run(workers=2)
+
+    data = b"Hi my name is Dana.\n\nWe want to grow revenue.\n\nOur reports are slow.\n\nNext steps: plan a pilot."
+    result = deck_pipeline.generate_deck_bytes(data, "meeting.txt")
+    assert {"extract", "plan"} <= set(result["timings"])
+    assert result["schedule"]["critical_path"][-1] in ("insights", "planned_phases")
+
+
+def test_overlapping_graph_runs_restore_torch_threads(tmp_path, tiny_registered_models):
+    import threading
+    import time
+    import torch
+    import batch_generate
+    import stage_scheduler
+
+    original = torch.get_num_threads()
+    torch.set_num_threads(6)
+    try:
+        def graph(model_stages, seconds):
+            g = stage_scheduler.StageGraph(budget=stage_scheduler.ThreadBudget(6))
+            for i in range(model_stages):
+                g.add(f"m{i}", lambda x: time.sleep(seconds) or torch.get_num_threads(), ["x"], model=True)
+            return g
+
+        # Runs with different shares start and end out of order, as with concurrent jobs
+        seen = {}
+        runs = [threading.Thread(target=lambda n=n, s=s: seen.update({n: graph(n, s).run({"x": 0}, workers=n)}))
+                for n, s in ((1, 0.3), (2, 0.1), (3, 0.2))]
+        for run in runs:
+            run.start()
+            time.sleep(0.02)
+        for run in runs:
+            run.join()
+        assert seen[3]["m0"] == 2 and torch.get_num_threads() == 6
+
+        # A single-process batch leaves the caller's torch threads and thread budget alone
+        budget = stage_scheduler.get_thread_budget().total
+        transcript = tmp_path / "meeting.txt"
+        transcript.write_text("Hi my name is Dana.\n\nNext steps: plan a pilot.")
+        assert batch_generate.run_batch([str(transcript)], str(tmp_path / "decks"), workers=1, torch_threads=1)["succeeded"] == 1
+        assert torch.get_num_threads() == 6 and stage_scheduler.get_thread_budget().total == budget
+    finally:
+        torch.set_num_threads(original)
+
+def test_regenerate_deck_reuses_unchanged_work_and_matches_full_build(tmp_path, tiny_registered_models):
+    import deck_pipeline
+    import incremental
+
+    filler = " ".join(f"word{i}" for i in range(120))
+    paragraphs = [
+        "Hi my name is Dana. " + filler,
+        "We want to grow revenue. " + filler,
+        "Our reports are slow. " + filler,
+        "Next steps: plan a pilot; train staff - two weeks. " + filler,
+    ]
+    transcript = tmp_path / "meeting.txt"
+    deck = str(tmp_path / "meeting.pptx")
+    transcript.write_text("\n\n".join(paragraphs))
+    first = deck_pipeline.regenerate_deck(str(transcript), deck)["reuse"]
+    assert first["segments_reused"] == 0 and first["slides_rendered"] == first["slides"]
+
+    paragraphs[0] = "Hi my name is Robin. " + filler
+    paragraphs.append("Next steps: hire an analyst. " + filler)
+    transcript.write_text("\n\n".join(paragraphs))
+    second = deck_pipeline.regenerate_deck(str(transcript), deck)["reuse"]
+    assert second["segments_reused"] >= 2 and second["slides_rendered"] < second["slides"]
+
+    fresh = str(tmp_path / "fresh.pptx")
+    deck_pipeline.generate_deck(str(transcript), fresh)
+    patched = incremental.slide_contents(slide_generation.open_presentation(deck))
+    assert patched == incremental.slide_contents(slide_generation.open_presentation(fresh))
+
+    third = deck_pipeline.regenerate_deck(str(transcript), deck)["reuse"]
+    assert third["segments_reused"] == third["segments"] and third["slides_rendered"] == 0
+    assert len(third["stages_reused"]) == third["stages"]
+
+    # A deck edited outside the pipeline is rebuilt rather than patched
+    with open(deck, 'ab') as f:
+        f.write(b"\0")
+    assert deck_pipeline.regenerate_deck(str(transcript), deck)["reuse"]["slides_rendered"] == third["slides"]
+
+    # Each extraction stage is keyed on its own category, so only the changed one reruns
+    import info_extraction
+    import stage_scheduler
+    segmented = {"Introductions": ["Hi my name is Dana."], "Pain Points": ["Our reports are slow."],
+                 "Suggested Next Steps": ["Next steps: plan a pilot."]}
+    memo = {}
+    incremental.memoize_stages(info_extraction.add_insight_stages(stage_scheduler.StageGraph()), memo, []).run({"segmented": segmented})
+    reused = []
+    graph = incremental.memoize_stages(info_extraction.add_insight_stages(stage_scheduler.StageGraph()), memo, reused)
+    graph.run({"segmented": {**segmented, "Pain Points": ["Our reports are slow and wrong."]}})
+    assert {"client_name", "objectives", "phases", "expected_outcomes"} <= set(reused)
+    assert "pain_points" not in reused
+
+def test_chart_slides_downsample_and_text_slides_split(tmp_path):
+    import numpy as np
+    import chart_data
+
+    x = np.arange(200_000, dtype=float)
+    y = np.sin(x / 10_000)
+    y[123_457] = 50.0
+    keep = chart_data.lttb(x, y, 300)
+    assert len(keep) == 300 and keep[0] == 0 and keep[-1] == len(x) - 1
+    assert 123_457 in keep and (np.diff(keep) > 0).all()
+
+    rows = 100_000
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "when": pd.date_range("2024-01-01", periods=rows, freq="min"),
+        "revenue": rng.normal(100, 15, rows).cumsum(),
+        "region": rng.choice([f"r{i}" for i in range(30)], rows),
+    })
+    labels, counts = chart_data.histogram(df["revenue"], bins=25)
+    assert len(labels) == 25 and sum(counts) == rows
+    labels, counts = chart_data.top_categories(df["region"], n=5)
+    assert labels[-1] == chart_data.OTHER_LABEL and sum(counts) == rows
+
+    prs = slide_generation.create_presentation()
+    assert slide_generation.add_dataframe_chart_slides(prs, df) == 3
+    line = prs.slides[0].shapes[1].chart
+    assert len(line.plots[0].series[0].values) <= chart_data.MAX_CHART_POINTS
+    slide_generation.add_bar_chart_slide(prs, "Revenue by region", df, "region", "revenue", top_n=5)
+    assert len(prs.slides[-1].shapes[1].chart.plots[0].categories) == 6
+
+    paragraphs = [f"Column {i}: a fairly long description of what this column holds and how it was profiled" for i in range(60)]
+    pages = slide_generation.add_text_slides(prs, "Data Summary", paragraphs)
+    assert pages > 1 and len(prs.slides) == 4 + pages
+    assert prs.slides[-1].shapes.title.text == "Data Summary (cont.)"
+    texts = [p.text for slide in list(prs.slides)[4:] for p in slide.placeholders[1].text_frame.paragraphs]
+    assert texts == paragraphs
+
+    path = tmp_path / "charts.pptx"
+    slide_generation.save_presentation(prs, str(path))
+    assert path.stat().st_size < 500_000
@@ -0,0 +1,91 @@
+"""
+Estimates how much text fits in a slide's text box, so long bullet lists can be
+split across slides instead of overflowing one. Character widths come from a
+TrueType font through Pillow when it is installed, falling back to a coarse
+width table, and are cached per character.
+"""
+
+import functools
+import os
+from typing import List
+
+# Font used for measuring; the default pptx template's body font is a sans serif of similar widths
+METRICS_FONT = os.environ.get("AUTODECK_METRICS_FONT", "DejaVuSans.ttf")
+LINE_SPACING = 1.2
+# Space before each paragraph, as a fraction of the font size
+PARAGRAPH_SPACING = 0.2
+# Widths are measured at this size (in points) and scaled
+_MEASURE_SIZE = 100
+
+# Fallback widths in em for fonts that can't be loaded
+_NARROW = set("ijlI.,;:'!|()[] ")
+_WIDE = set("mwMW@%")
+
+@functools.lru_cache(maxsize=1)
+def _font():
+    try:
+        from PIL import ImageFont
+    except ImportError:
+        return None
+    try:
+        return ImageFont.truetype(METRICS_FONT, _MEASURE_SIZE)
+    except OSError:
+        try:
+            return ImageFont.load_default(size=_MEASURE_SIZE)
+        except (OSError, TypeError):
+            # Pillow < 10.1 has no scalable default font
+            return None
+
+@functools.lru_cache(maxsize=4096)
+def char_width(char: str) -> float:
+    """Advance width of a character in em."""
+    font = _font()
+    if font is not None:
+        return font.getlength(char) / _MEASURE_SIZE
+    if char in _NARROW:
+        return 0.28
+    if char in _WIDE:
+        return 0.85
+    return 0.62 if char.isupper() or char.isdigit() else 0.52
+
+def text_width(text: str, font_size: float) -> float:
+    """Width of text in points at font_size."""
+    return sum(char_width(char) for char in text) * font_size
+
+def line_count(text: str, width: float, font_size: float) -> int:
+    """Number of lines text wraps to, word by word, in a box width points wide."""
+    space = char_width(" ") * font_size
+    lines, current = 1, 0.0
+    for word in text.split():
+        word_width = text_width(word, font_size)
+        needed = word_width if current == 0 else current + space + word_width
+        if current and needed > width:
+            lines += 1
+            current = word_width
+        else:
+            current = needed
+        # A single word wider than the box breaks across lines
+        if current > width:
+            lines += int(current // width)
+            current = current % width
+    return lines
+
+def paginate(paragraphs: List[str], width: float, height: float, font_size: float) -> List[List[str]]:
+    """
+    Split paragraphs into pages that each fit a width x height point box at font_size.
+    A paragraph taller than a whole page gets a page of its own.
+    """
+    line_height = font_size * LINE_SPACING
+    pages: List[List[str]] = []
+    page: List[str] = []
+    used = 0.0
+    for paragraph in paragraphs:
+        needed = line_count(paragraph, width, font_size) * line_height + font_size * PARAGRAPH_SPACING
+        if page and used + needed > height:
+            pages.append(page)
+            page, used = [], 0.0
+        page.append(paragraph)
+        used += needed
+    if page:
+        pages.append(page)
+    return pages
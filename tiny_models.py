@@ -0,0 +1,72 @@
+"""
+Small randomly initialized BART pipelines that stand in for the real checkpoints.
+They build in well under a second without network access, so tests and the
+benchmark suite can exercise every model-backed stage offline. Their outputs
+are deterministic but meaningless.
+"""
+
+from typing import Optional
+
+from model_registry import DEFAULT_MODELS, ModelRegistry, get_registry
+
+# Every word the synthetic transcripts use; anything else maps to <unk>
+TINY_VOCAB = (
+    "this example is introductions client goals pain points technical constraints suggested next steps "
+    "hi my name we want to grow revenue our reports are slow the database cannot scale "
+    "plan a pilot then roll out and train staff legacy system must stay on premise"
+).split()
+
+# Room for the longest summary the pipeline asks for (max_length=150)
+REGISTERED_MAX_POSITIONS = 256
+
+def build_tiny_pipeline(task: str, max_positions: int = 128, seed: int = 0):
+    """Build a tiny BART summarization or zero-shot-classification pipeline."""
+    import torch
+    from tokenizers import Tokenizer, models, normalizers, pre_tokenizers, processors
+    from transformers import BartConfig, BartForConditionalGeneration, BartForSequenceClassification
+    from transformers import PreTrainedTokenizerFast, pipeline
+
+    vocab = {"<s>": 0, "<pad>": 1, "</s>": 2, "<unk>": 3}
+    for word in TINY_VOCAB + [".", ","]:
+        vocab.setdefault(word, len(vocab))
+    tokenizer = Tokenizer(models.WordLevel(vocab, unk_token="<unk>"))
+    tokenizer.normalizer = normalizers.Lowercase()
+    tokenizer.pre_tokenizer = pre_tokenizers.Whitespace()
+    tokenizer.post_processor = processors.TemplateProcessing(
+        single="<s> $A </s>", pair="<s> $A </s> </s> $B </s>", special_tokens=[("<s>", 0), ("</s>", 2)]
+    )
+    fast_tokenizer = PreTrainedTokenizerFast(
+        tokenizer_object=tokenizer, bos_token="<s>", eos_token="</s>", pad_token="<pad>", unk_token="<unk>",
+        model_max_length=max_positions, model_input_names=["input_ids", "attention_mask"],
+    )
+    config = BartConfig(
+        vocab_size=len(vocab), d_model=16, encoder_layers=1, decoder_layers=1,
+        encoder_attention_heads=2, decoder_attention_heads=2, encoder_ffn_dim=32, decoder_ffn_dim=32,
+        max_position_embeddings=max_positions, pad_token_id=1, bos_token_id=0, eos_token_id=2,
+        decoder_start_token_id=2, forced_bos_token_id=None,
+        id2label={0: "contradiction", 1: "neutral", 2: "entailment"},
+        label2id={"contradiction": 0, "neutral": 1, "entailment": 2},
+    )
+    torch.manual_seed(seed)
+    if task == "zero-shot-classification":
+        model = BartForSequenceClassification(config).eval()
+    else:
+        model = BartForConditionalGeneration(config).eval()
+    pipe = pipeline(task, model=model, tokenizer=fast_tokenizer, device=-1)
+    if task == "summarization":
+        # The pipeline defaults to 256 new tokens, more than the tiny model has positions for
+        pipe.generation_config.max_new_tokens = None
+    return pipe
+
+def register_tiny_models(registry: Optional[ModelRegistry] = None, max_positions: int = REGISTERED_MAX_POSITIONS) -> ModelRegistry:
+    """Install tiny pipelines under the real model ids so the whole pipeline runs offline."""
+    registry = registry or get_registry()
+    for task, model in DEFAULT_MODELS:
+        registry.register(task, model, build_tiny_pipeline(task, max_positions))
+    return registry
+
+def unregister_tiny_models(registry: Optional[ModelRegistry] = None):
+    """Remove the pipelines installed by register_tiny_models."""
+    registry = registry or get_registry()
+    for task, model in DEFAULT_MODELS:
+        registry.evict(task, model)
@@ -0,0 +1,205 @@
+"""
+Stage-level tracing for the deck pipeline.
+Functions decorated with traced (and blocks wrapped in span) record wall time,
+CPU time of the thread that ran them, the growth of peak RSS, model calls and tokens in and out.
+Counters recorded inside a span roll up into its parents. Traces export as
+JSON or Chrome trace format (chrome://tracing, Perfetto).
+
+Tracing is off by default; while it is off a traced call costs one global
+lookup. Turn it on with start_tracing() or AUTODECK_TRACE=1.
+"""
+
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_tracer: Optional["Tracer"] = None
+_current = contextvars.ContextVar("autodeck_span", default=None)
+
+COUNTERS = ("model_calls", "tokens_in", "tokens_out")
+# Spans on concurrent stage threads add their counters to a shared parent
+_counter_lock = threading.Lock()
+
+def _peak_rss_kb() -> int:
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource else 0
+
+class Span:
+    """One timed stage; use tracing.span or tracing.traced rather than creating spans directly."""
+
+    __slots__ = ("tracer", "name", "category", "attrs", "parent", "start", "wall_s", "cpu_s",
+                 "peak_rss_delta_kb", "model_calls", "tokens_in", "tokens_out", "thread", "error",
+                 "_cpu_start", "_rss_start", "_token")
+
+    def __init__(self, tracer: "Tracer", name: str, category: str, attrs: Dict[str, object]):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.attrs = attrs
+        self.parent = None
+        self.model_calls = 0
+        self.tokens_in = 0
+        self.tokens_out = 0
+        self.error = None
+
+    def __enter__(self):
+        self.parent = _current.get()
+        self._token = _current.set(self)
+        self.thread = threading.get_ident()
+        self._rss_start = _peak_rss_kb()
+        self._cpu_start = time.thread_time()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.wall_s = time.perf_counter() - self.start
+        self.cpu_s = time.thread_time() - self._cpu_start
+        self.peak_rss_delta_kb = _peak_rss_kb() - self._rss_start
+        _current.reset(self._token)
+        if exc_type is not None:
+            self.error = f"{exc_type.__name__}: {exc}"
+        if self.parent is not None:
+            with _counter_lock:
+                for counter in COUNTERS:
+                    setattr(self.parent, counter, getattr(self.parent, counter) + getattr(self, counter))
+        self.tracer._finish(self)
+        return False
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "name": self.name,
+            "category": self.category,
+            "parent": self.parent.name if self.parent is not None else None,
+            "start_s": self.start - self.tracer.origin,
+            "wall_s": self.wall_s,
+            "cpu_s": self.cpu_s,
+            "peak_rss_delta_kb": self.peak_rss_delta_kb,
+            "model_calls": self.model_calls,
+            "tokens_in": self.tokens_in,
+            "tokens_out": self.tokens_out,
+            "thread": self.thread,
+            "error": self.error,
+            "attrs": self.attrs,
+        }
+
+class _NullSpan:
+    def __enter__(self):
+        return None
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+class Tracer:
+    """Collects finished spans for one traced run."""
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.pid = os.getpid()
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def _finish(self, span: Span):
+        with self._lock:
+            self.spans.append(span)
+
+    def summary(self) -> Dict[str, Dict[str, object]]:
+        """Aggregate spans by name: call count, total wall and CPU seconds, and counters."""
+        summary = {}
+        for span in self.spans:
+            entry = summary.setdefault(span.name, {"calls": 0, "wall_s": 0.0, "cpu_s": 0.0, **{c: 0 for c in COUNTERS}})
+            entry["calls"] += 1
+            entry["wall_s"] += span.wall_s
+            entry["cpu_s"] += span.cpu_s
+            for counter in COUNTERS:
+                entry[counter] += getattr(span, counter)
+        return summary
+
+    def to_dict(self) -> Dict[str, object]:
+        spans = sorted(self.spans, key=lambda span: span.start)
+        return {"pid": self.pid, "spans": [span.to_dict() for span in spans], "summary": self.summary()}
+
+    def chrome_events(self) -> List[Dict[str, object]]:
+        """Return the spans as Chrome trace "complete" events with microsecond timestamps."""
+        events = []
+        for span in sorted(self.spans, key=lambda span: span.start):
+            record = span.to_dict()
+            args = {key: record[key] for key in ("cpu_s", "peak_rss_delta_kb", "error", *COUNTERS)}
+            args.update(span.attrs)
+            events.append({
+                "name": span.name, "cat": span.category, "ph": "X",
+                "ts": (span.start - self.origin) * 1e6, "dur": span.wall_s * 1e6,
+                "pid": self.pid, "tid": span.thread, "args": args,
+            })
+        return events
+
+    def to_json(self, path: str):
+        """Write the spans and per-stage summary as JSON."""
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2, default=str)
+
+    def to_chrome_trace(self, path: str):
+        """Write a trace loadable by chrome://tracing or Perfetto."""
+        with open(path, 'w') as f:
+            json.dump({"traceEvents": self.chrome_events(), "displayTimeUnit": "ms"}, f, default=str)
+
+def start_tracing() -> Tracer:
+    """Start recording spans into a new tracer and return it."""
+    global _tracer
+    _tracer = Tracer()
+    return _tracer
+
+def stop_tracing() -> Optional[Tracer]:
+    """Stop recording and return the tracer that was active, if any."""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer
+
+def get_tracer() -> Optional[Tracer]:
+    return _tracer
+
+def span(name: str, category: str = "stage", **attrs):
+    """Context manager timing a block as a span while tracing is on."""
+    if _tracer is None:
+        return _NULL_SPAN
+    return Span(_tracer, name, category, attrs)
+
+def traced(name: Optional[str] = None, category: str = "stage") -> Callable:
+    """Decorator recording every call of a function as a span while tracing is on."""
+    def decorator(fn: Callable) -> Callable:
+        span_name = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _tracer is None:
+                return fn(*args, **kwargs)
+            with Span(_tracer, span_name, category, {}):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def record(model_calls: int = 0, tokens_in: int = 0, tokens_out: int = 0):
+    """Add model call and token counts to the innermost open span."""
+    current = _current.get()
+    if current is None:
+        return
+    with _counter_lock:
+        current.model_calls += model_calls
+        current.tokens_in += tokens_in
+        current.tokens_out += tokens_out
+
+def enabled() -> bool:
+    return _tracer is not None
+
+if os.environ.get("AUTODECK_TRACE", "").lower() in ("1", "true", "yes"):
+    start_tracing()
@@ -1,17 +1,30 @@
 """
 Module for ingesting meeting transcripts from plain text and .docx files.
+Besides whole-file readers, it offers generators that stream lines, paragraphs
+or speaker turns so long transcripts can be processed with bounded memory.
 """
 
+import io
 import os
-from typing import Optional
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import Iterable, Iterator, List, Optional
+
+from tracing import traced
+
+WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+# "Jane Doe: ..." or "[00:01:02] Jane Doe: ..." at the start of a line opens a new speaker turn
+SPEAKER_PATTERN = re.compile(r"^\s*(?:\[[\d:.]+\]\s*)?([A-Z][\w.'\- ]{0,40}):\s")
 
 def read_txt(file_path: str) -> str:
     """Read plain text transcript from a .txt file."""
     with open(file_path, 'r', encoding='utf-8') as f:
         return f.read()
 
-def read_docx(file_path: str) -> str:
-    """Read transcript text from a .docx file."""
+def read_docx(file_path) -> str:
+    """Read transcript text from a .docx file path or binary file object."""
     from docx import Document
     doc = Document(file_path)
     full_text = []
@@ -19,6 +32,18 @@ def read_docx(file_path: str) -> str:
         full_text.append(para.text)
     return '\n'.join(full_text)
 
+@traced()
+def ingest_transcript_bytes(data: bytes, filename: str) -> str:
+    """Ingest a transcript held in memory, e.g. an upload; filename only selects the format."""
+    ext = os.path.splitext(filename)[1].lower()
+    if ext == '.txt':
+        return data.decode('utf-8')
+    elif ext == '.docx':
+        return read_docx(io.BytesIO(data))
+    else:
+        raise ValueError(f"Unsupported transcript file type: {ext}")
+
+@traced()
 def ingest_transcript(file_path: str) -> Optional[str]:
     """Ingest transcript from supported file types (.txt, .docx)."""
     if not os.path.exists(file_path):
@@ -30,3 +55,93 @@ def ingest_transcript(file_path: str) -> Optional[str]:
         return read_docx(file_path)
     else:
         raise ValueError(f"Unsupported transcript file type: {ext}")
+
+def iter_txt_lines(file_path: str) -> Iterator[str]:
+    """Yield the lines of a .txt transcript without line endings."""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            yield line.rstrip('\r\n')
+
+def iter_docx_lines(file_path: str) -> Iterator[str]:
+    """
+    Yield the text of each body paragraph of a .docx file, like read_docx, by
+    incrementally parsing word/document.xml instead of loading the whole document.
+    """
+    with zipfile.ZipFile(file_path) as archive, archive.open("word/document.xml") as xml_file:
+        stack: List[ET.Element] = []
+        for event, elem in ET.iterparse(xml_file, events=("start", "end")):
+            if event == "start":
+                stack.append(elem)
+                continue
+            stack.pop()
+            parent = stack[-1] if stack else None
+            if parent is None or parent.tag != WORD_NS + "body":
+                continue
+            if elem.tag == WORD_NS + "p":
+                yield _docx_paragraph_text(elem)
+            # Drop finished top-level blocks so memory stays bounded by one paragraph or table
+            parent.remove(elem)
+
+def _docx_paragraph_text(paragraph: ET.Element) -> str:
+    parts = []
+    for node in paragraph.iter():
+        if node.tag == WORD_NS + "t":
+            parts.append(node.text or "")
+        elif node.tag == WORD_NS + "tab":
+            parts.append("\t")
+        elif node.tag in (WORD_NS + "br", WORD_NS + "cr"):
+            parts.append("\n")
+    return "".join(parts)
+
+def iter_transcript_lines(file_path: str) -> Iterator[str]:
+    """Stream the lines of a supported transcript file (.txt, .docx)."""
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"Transcript file not found: {file_path}")
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext == '.txt':
+        return iter_txt_lines(file_path)
+    elif ext == '.docx':
+        return iter_docx_lines(file_path)
+    else:
+        raise ValueError(f"Unsupported transcript file type: {ext}")
+
+def group_paragraphs(lines: Iterable[str]) -> Iterator[str]:
+    """Group consecutive non-blank lines into paragraphs."""
+    paragraph: List[str] = []
+    for line in lines:
+        if line.strip():
+            paragraph.append(line.strip())
+        elif paragraph:
+            yield "\n".join(paragraph)
+            paragraph = []
+    if paragraph:
+        yield "\n".join(paragraph)
+
+def group_speaker_turns(lines: Iterable[str]) -> Iterator[str]:
+    """
+    Group lines into speaker turns. A line starting with a speaker label opens a turn
+    and unlabelled lines continue the current one; blank lines also close a turn.
+    """
+    turn: List[str] = []
+    for line in lines:
+        stripped = line.strip()
+        if not stripped or SPEAKER_PATTERN.match(line):
+            if turn:
+                yield "\n".join(turn)
+                turn = []
+        if stripped:
+            turn.append(stripped)
+    if turn:
+        yield "\n".join(turn)
+
+def iter_transcript(file_path: str, unit: str = "paragraph") -> Iterator[str]:
+    """
+    Stream a transcript as paragraphs (unit="paragraph") or speaker turns (unit="turn").
+    """
+    lines = iter_transcript_lines(file_path)
+    if unit == "paragraph":
+        return group_paragraphs(lines)
+    elif unit == "turn":
+        return group_speaker_turns(lines)
+    else:
+        raise ValueError(f"Unsupported transcript unit: {unit}")